@@ -0,0 +1,122 @@
+# benchmarks/bench_categorizer.py
+# 소재 분류 벤치마크: 기존 유형별 any() 체인 vs utils.categorizer (모드별 체인 엔진 / Aho-Corasick 엔진)
+# - 처리량과 함께 두 엔진의 분류 일치율(항상 100%여야 함, 아니면 AssertionError)과 기존 대비 변경 비율을 보고
+#
+# 실행 (프로젝트 루트에서):
+#   python -m benchmarks.bench_categorizer           # 기본 30,000건
+#   python -m benchmarks.bench_categorizer 100000    # 소재 수 지정
+import random
+import sys
+import time
+
+from utils.categorizer import CATEGORY_RULES, Categorizer
+
+SENTENCES = [
+    "처음 수술을 받으시는 분들은 정말 많이 긴장하세요.",
+    "검사 결과를 하나씩 설명해드리면 점점 안정되시더라고요.",
+    "대기시간을 줄이려고 예약 시스템을 바꿨어요.",
+    "신입 때 멘토 선생님께 배운 게 아직도 기억나요.",
+    "수술 후 언제부터 운동이 가능한지 자주 물어보세요.",
+    "회복하시고 다시 찾아오셨을 때 울컥했어요.",
+    "원무팀 분위기가 밝아서 환자분들도 편해하세요.",
+    "오늘은 특별한 일 없이 평범한 하루였어요.",
+]
+ROLES = ["검안사", "원무팀", "신입 간호사", "상담실장", ""]
+AUDIENCES = ["예비 환자", "보호자", "일반 독자", ""]
+
+
+def build_sample(n: int, seed: int = 7) -> list:
+    """아카이브 소재 형태의 합성 데이터 (제목 + 2~6문장 + 키워드)"""
+    rnd = random.Random(seed)
+    items = []
+    for i in range(n):
+        body = " ".join(rnd.choices(SENTENCES, k=rnd.randint(2, 6)))
+        items.append({
+            "title": f"소재 {i}: {rnd.choice(SENTENCES)[:12]}",
+            "content": body,
+            "keywords": rnd.sample(["수술", "검사", "예약", "멘토", "FAQ", "일상", "상담"], 3),
+            "staff_perspective": rnd.choice(ROLES),
+            "target_audience": rnd.choice(AUDIENCES),
+        })
+    return items
+
+
+def expand_rules(rules: dict, extra: int, seed: int = 11) -> dict:
+    """유형마다 합성 키워드 extra개를 더한 규칙 (규칙 수가 늘 때의 확장성 측정용)"""
+    rnd = random.Random(seed)
+    syllables = [chr(c) for c in range(ord("가"), ord("힣") + 1, 97)]
+    out = {**rules, "categories": {}}
+    for cat, rule in rules["categories"].items():
+        words = ["".join(rnd.choices(syllables, k=3)) for _ in range(extra)]
+        out["categories"][cat] = {**rule, "keywords": list(rule["keywords"]) + words}
+    return out
+
+
+def any_chain(rules: dict):
+    """기존 ai_analyzer._categorize_bgn_materials 방식: 유형 순서대로 any() 체인, 첫 매칭 유형"""
+    chain = [(cat, [k.lower() for k in r.get("keywords", [])], r.get("role_hints", []), r.get("audience_hints", []))
+             for cat, r in rules["categories"].items()]
+    default = rules["default"]
+
+    def categorize(it: dict) -> str:
+        text = f"{it.get('title','')} {it.get('content','')} {', '.join(it.get('keywords', []))}".lower()
+        role = (it.get("staff_perspective") or "").lower()
+        audience = (it.get("target_audience") or "")
+        for cat, keywords, roles, audiences in chain:
+            if any(k in text for k in keywords) or any(h in role for h in roles) or any(h in audience for h in audiences):
+                return cat
+        return default
+
+    return categorize
+
+
+def measure(fn, items: list, repeat: int = 3):
+    best, labels = float("inf"), []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        labels = [fn(it) for it in items]
+        best = min(best, time.perf_counter() - t0)
+    return best, labels
+
+
+def agreement(a: list, b: list) -> float:
+    return sum(x == y for x, y in zip(a, b)) / max(1, len(a))
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 30000
+    items = build_sample(n)
+    # 점수 방식 체인 엔진은 키워드마다 str.count를 하므로 큰 규칙에서 매우 느림 → 앞부분만 측정
+    sub = items[:min(n, 3000)]
+    chars = sum(len(it["title"]) + len(it["content"]) for it in items)
+    print(f"샘플: 소재 {n:,}건, 본문 {chars / 1_000_000:.1f}M자 (단위: 건/초, 점수 방식 체인은 앞 {len(sub):,}건)")
+    print(f"{'유형당 키워드':>12}{'패턴 수':>9}{'기존 any() 체인':>16}"
+          f"{'first_match 체인':>18}{'first_match 오토마톤':>21}{'scoring 체인':>14}{'scoring 오토마톤':>17}"
+          f"{'엔진 일치(fm/sc)':>18}{'기존 대비 변경':>14}")
+    for extra in (0, 50, 200, 1000, 2000):
+        rules = expand_rules(CATEGORY_RULES, extra)
+        first_match = {**rules, "mode": "first_match"}
+        scoring = {**rules, "mode": "scoring"}
+        per_type = max(len(r["keywords"]) for r in rules["categories"].values())
+        patterns = sum(len(r.get("keywords", [])) + len(r.get("role_hints", [])) + len(r.get("audience_hints", []))
+                       for r in rules["categories"].values())
+        legacy_sec, legacy_labels = measure(any_chain(rules), items)
+        fm_chain_sec, fm_chain_labels = measure(Categorizer(first_match, engine="chain").categorize, items)
+        fm_ac_sec, fm_ac_labels = measure(Categorizer(first_match, engine="automaton").categorize, items)
+        sc_chain_sec, sc_chain_labels = measure(Categorizer(scoring, engine="chain").categorize, sub, repeat=1)
+        sc_ac_sec, sc_ac_labels = measure(Categorizer(scoring, engine="automaton").categorize, items)
+        fm_agree = agreement(fm_chain_labels, fm_ac_labels)
+        sc_agree = agreement(sc_chain_labels, sc_ac_labels)
+        changed = 1 - agreement(legacy_labels, sc_ac_labels)
+        print(f"{per_type:>12,}{patterns:>9,}{n / legacy_sec:>16,.0f}"
+              f"{n / fm_chain_sec:>18,.0f}{n / fm_ac_sec:>21,.0f}{len(sub) / sc_chain_sec:>14,.0f}{n / sc_ac_sec:>17,.0f}"
+              f"{f'{fm_agree:.0%}/{sc_agree:.0%}':>18}{changed:>14.1%}")
+        assert fm_chain_labels == legacy_labels, "first_match 체인 엔진이 기존 any() 체인과 다르게 분류"
+        assert fm_agree == 1.0 and sc_agree == 1.0, "엔진에 따라 분류가 달라짐"
+    print("※ 엔진 일치: 같은 모드에서 체인/오토마톤 엔진의 분류가 같은 비율 (first_match / scoring).")
+    print("※ 기존 대비 변경: 기존 any() 체인(첫 매칭) 대비 scoring 모드에서 유형이 바뀐 소재 비율.")
+    print("※ 자동 선택: scoring은 오토마톤, first_match는 패턴 수가 CATEGORY_RULES['automaton_min_patterns'] 이상이면 오토마톤.")
+
+
+if __name__ == "__main__":
+    main()
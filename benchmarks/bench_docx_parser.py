@@ -0,0 +1,59 @@
+# benchmarks/bench_docx_parser.py
+# DOCX 추출 벤치마크: 스트리밍 파서(utils.docx_stream) vs python-docx 전체 DOM
+#
+# 실행 (프로젝트 루트에서):
+#   python -m benchmarks.bench_docx_parser              # 기본 3,000 단락 + 표 200행
+#   python -m benchmarks.bench_docx_parser 20000 1000   # 단락 수, 표 행 수 지정
+import io
+import sys
+import time
+import tracemalloc
+
+import docx
+
+from utils.extraction_engine import extract_docx_text, extract_docx_text_python_docx
+
+LINE = "A: 처음 수술을 받으시는 분들은 정말 많이 긴장하세요. 차근차근 설명해드리면 점점 안정되시더라고요."
+
+
+def build_sample(paragraphs: int, table_rows: int) -> bytes:
+    """인터뷰 형태의 샘플 DOCX (본문 단락 + Q/A 2열 표)"""
+    doc = docx.Document()
+    for i in range(paragraphs):
+        doc.add_paragraph(f"Q{i}: 오늘 기억에 남는 환자분이 계셨나요?" if i % 2 == 0 else LINE)
+    table = doc.add_table(rows=table_rows, cols=2)
+    for i, row in enumerate(table.rows):
+        row.cells[0].text = f"Q{i}. 상담할 때 어떤 점을 중요하게 생각하시나요?"
+        row.cells[1].text = LINE
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def measure(fn, data: bytes, repeat: int = 3):
+    best, peak, chars = float("inf"), 0, 0
+    for _ in range(repeat):
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        chars = len(fn(data))
+        best = min(best, time.perf_counter() - t0)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return best, peak, chars
+
+
+def main():
+    paragraphs = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    table_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    data = build_sample(paragraphs, table_rows)
+    print(f"샘플: 단락 {paragraphs:,}개 + 표 {table_rows:,}행, {len(data) / 1024:.0f} KB")
+    print(f"{'경로':<16}{'시간(ms)':>10}{'최대 메모리(MB)':>18}{'추출 글자수':>12}")
+    for label, fn in (("python-docx", extract_docx_text_python_docx), ("스트리밍", extract_docx_text)):
+        sec, peak, chars = measure(fn, data)
+        print(f"{label:<16}{sec * 1000:>10.1f}{peak / 1024 / 1024:>18.1f}{chars:>12,}")
+    print("※ python-docx 경로는 표 셀을 추출하지 않으므로 글자수가 더 적습니다.")
+    print("※ tracemalloc은 lxml(C) 할당을 추적하지 않아 python-docx 메모리는 실제보다 적게 표시됩니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# benchmarks/bench_near_duplicates.py
+# 유사 소재 탐지 벤치마크: 발행 소재 수만 건을 인덱싱한 뒤 새 소재 조회 시간 (utils.near_duplicates)
+#
+# 실행 (프로젝트 루트에서):
+#   python -m benchmarks.bench_near_duplicates          # 발행 소재 30,000건
+#   python -m benchmarks.bench_near_duplicates 100000   # 발행 소재 수 지정
+import random
+import sys
+import time
+
+from utils.near_duplicates import DEDUP_CONFIG, LSHIndex, MinHasher, material_text
+
+WORDS = ["수술", "회복", "검사", "환자분", "처음", "긴장", "설명", "안경", "라식", "라섹", "상담", "예약",
+         "대기", "시력", "렌즈", "불편", "일상", "변화", "웃음", "마음", "선생님", "신입", "멘토", "질문"]
+
+
+def build_sample(n: int, seed: int = 3) -> list:
+    rnd = random.Random(seed)
+    return [{"title": " ".join(rnd.choices(WORDS, k=5)), "content": " ".join(rnd.choices(WORDS, k=rnd.randint(40, 120)))}
+            for _ in range(n)]
+
+
+def near_copy(item: dict, rnd: random.Random) -> dict:
+    """단어 몇 개만 바꾼 사본 (재인터뷰에서 같은 일화를 조금 다르게 말한 경우)"""
+    words = item["content"].split()
+    for _ in range(max(1, len(words) // 20)):
+        words[rnd.randrange(len(words))] = rnd.choice(WORDS)
+    return {"title": item["title"], "content": " ".join(words)}
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 30000
+    hasher = MinHasher(DEDUP_CONFIG["num_perm"], DEDUP_CONFIG["shingle_size"])
+    index = LSHIndex(hasher.num_perm, DEDUP_CONFIG["bands"], DEDUP_CONFIG["threshold"])
+    published = build_sample(n)
+
+    t0 = time.perf_counter()
+    signatures = [hasher.signature(material_text(it)) for it in published]
+    sign_sec = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for i, sig in enumerate(signatures):
+        index.add(i, sig)
+    index_sec = time.perf_counter() - t0
+    print(f"발행 소재 {n:,}건: 서명 {sign_sec:.1f}s ({sign_sec / n * 1000:.2f} ms/건), 인덱싱 {index_sec * 1000:.0f} ms")
+
+    rnd = random.Random(5)
+    copies = [near_copy(published[rnd.randrange(n)], rnd) for _ in range(200)]
+    fresh = build_sample(200, seed=99)
+    for label, queries, expect in (("거의 같은 소재", copies, True), ("새 소재", fresh, False)):
+        sigs = [hasher.signature(material_text(it)) for it in queries]
+        t0 = time.perf_counter()
+        hits = [bool(index.query(sig)) for sig in sigs]
+        sec = time.perf_counter() - t0
+        rate = sum(h == expect for h in hits) / len(hits)
+        print(f"{label:<10} 조회 {sec / len(sigs) * 1000:.3f} ms/건, 정답률 {rate:.1%}")
+    print("※ 조회 시간에는 서명 계산이 빠져 있습니다 (서명은 소재당 1회, 위 ms/건 참고).")
+
+
+if __name__ == "__main__":
+    main()
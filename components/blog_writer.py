@@ -2,6 +2,7 @@ import streamlit as st
 from config import BLOG_CONFIG, QUALITY_CONFIG
 from utils.session_manager import previous_step, next_step
 from utils.ai_analyzer import AIAnalyzer
+from utils.style_scorer import get_style_scorer
 import time
 
 def render_blog_writer_page():
@@ -122,6 +123,22 @@ def configure_blog_settings():
         st.session_state.use_emotions = st.checkbox("감정 표현 사용 (:), ㅠㅠ, ... 등)", value=True)
         st.session_state.use_casual_talk = st.checkbox("자연스러운 구어체 혼용", value=True)
         st.session_state.use_empathy = st.checkbox("담담한 공감 톤", value=True)
+
+        st.checkbox(
+            "실시간 스트리밍 표시",
+            value=BLOG_CONFIG.get("stream", True),
+            key="stream_generation",
+            help="작성되는 글을 바로바로 보여줍니다. 최종 결과는 스트리밍을 끈 경우와 같습니다.",
+        )
+
+        st.number_input(
+            "초안 후보 수",
+            min_value=1, max_value=5,
+            value=BLOG_CONFIG.get("candidates", 1),
+            key="draft_candidates",
+            help="2 이상이면 한 번의 요청으로 초안을 여러 개 받아 BGN 스타일 점수와 분량으로 가장 좋은 글을 보여줍니다. "
+                 "나머지 후보도 바로 바꿔 볼 수 있습니다. (출력 토큰은 후보 수만큼 늘어납니다)",
+        )
     
     # 추가 요청사항
     if 'additional_request' not in st.session_state:
@@ -155,65 +172,99 @@ def generate_blog_content():
     if st.session_state.blog_content:
         display_generated_blog()
 
-def generate_with_ai():
-    """AI를 사용하여 BGN 톤앤매너 블로그 생성"""
-    with st.spinner("🤖 BGN 고유의 자연스러운 톤앤매너로 2,000자 이상 블로그를 작성하고 있습니다..."):
-        try:
-            analyzer = AIAnalyzer(st.session_state.get('openai_api_key'))
-            
-            # 진행률 표시
-            progress_bar = st.progress(0)
-            status_text = st.empty()
-            
-            status_text.text("📝 BGN 톤앤매너 적용 중...")
-            progress_bar.progress(20)
-            time.sleep(1)
-            
-            status_text.text("✍️ 자연스러운 말투로 본문 작성 중...")
-            progress_bar.progress(60)
-            
-            # BGN 스타일 매개변수 전달
-            bgn_style_params = {
-                'staff_role': st.session_state.get('staff_role', '검안사'),
-                'staff_name': st.session_state.get('staff_name', '김서연'),
-                'use_emotions': st.session_state.get('use_emotions', True),
-                'use_casual_talk': st.session_state.get('use_casual_talk', True),
-                'use_empathy': st.session_state.get('use_empathy', True)
-            }
-            
-            # generate_with_ai()에서 analyzer.generate_blog_content_bgn_style 호출 부분 수정
-            blog_content = analyzer.generate_blog_content_bgn_style(
-                st.session_state.selected_material,
-                st.session_state.blog_style,
-                st.session_state.content_length,
-                st.session_state.additional_request,
-                bgn_style_params,
-                temperature=st.session_state.get("creativity", 0.9),
-                top_p=st.session_state.get("top_p", 0.9),
-            )
-
-            progress_bar.progress(90)
-            status_text.text("🔍 BGN 톤앤매너 품질 검증 중...")
-            time.sleep(0.5)
-            
-            st.session_state.blog_content = blog_content
-            
-            progress_bar.progress(100)
-            status_text.empty()
-            progress_bar.empty()
-            
-            # 글자수 확인 및 알림
-            char_count = len(blog_content)
-            if char_count >= 2000:
-                st.success(f"✅ BGN 스타일 블로그 완성! (총 {char_count:,}자)")
-                st.balloons()
+def generate_with_ai(use_cache=True):
+    """AI를 사용하여 BGN 톤앤매너 블로그 생성 (use_cache=False: 재생성 — 캐시 건너뜀)"""
+    try:
+        analyzer = AIAnalyzer(st.session_state.get('openai_api_key'), use_cache=st.session_state.get('llm_cache_enabled'))
+
+        # BGN 스타일 매개변수 전달
+        bgn_style_params = {
+            'staff_role': st.session_state.get('staff_role', '검안사'),
+            'staff_name': st.session_state.get('staff_name', '김서연'),
+            'use_emotions': st.session_state.get('use_emotions', True),
+            'use_casual_talk': st.session_state.get('use_casual_talk', True),
+            'use_empathy': st.session_state.get('use_empathy', True)
+        }
+        args = (
+            st.session_state.selected_material,
+            st.session_state.blog_style,
+            st.session_state.content_length,
+            st.session_state.additional_request,
+            bgn_style_params,
+        )
+        kwargs = dict(
+            temperature=st.session_state.get("creativity", 0.9),
+            top_p=st.session_state.get("top_p", 0.9),
+            use_cache=use_cache,
+            candidates=int(st.session_state.get("draft_candidates", BLOG_CONFIG.get("candidates", 1))),
+        )
+
+        if st.session_state.get("stream_generation", BLOG_CONFIG.get("stream", True)):
+            blog_content = stream_blog_with_ai(analyzer, args, kwargs)
+        else:
+            with st.spinner("🤖 BGN 고유의 자연스러운 톤앤매너로 2,000자 이상 블로그를 작성하고 있습니다..."):
+                blog_content = analyzer.generate_blog_content_bgn_style(*args, **kwargs)
+
+        st.session_state.blog_content = blog_content
+        st.session_state.blog_candidates = analyzer.last_candidates
+
+        # 글자수 확인 및 알림
+        char_count = len(blog_content)
+        if char_count >= 2000:
+            st.success(f"✅ BGN 스타일 블로그 완성! (총 {char_count:,}자)")
+            st.balloons()
+        else:
+            st.warning(f"⚠️ 목표 글자수에 미달하지만 생성 완료 ({char_count:,}자)")
+
+    except Exception as e:
+        st.error(f"❌ 블로그 작성 중 오류: {str(e)}")
+        st.warning("💡 BGN 샘플 블로그로 진행합니다.")
+        generate_sample_blog()
+
+STREAM_STAGE_LABELS = {
+    "outline": "🧭 아웃라인 구성 중...",
+    "draft": "✍️ 자연스러운 말투로 본문 작성 중...",
+    "style": "🔍 짧은 섹션 보강 중...",
+}
+# 본문이 아닌 단계는 미리보기 대신 수신 글자 수만 표시 (보강 문단은 섹션 중간에 들어가므로 초안 미리보기는 유지)
+STREAM_CAPTION_STAGES = {
+    "outline": "아웃라인 {chars:,}자 수신",
+    "style": "보강 문단 {chars:,}자 작성 중",
+}
+
+def stream_blog_with_ai(analyzer, args, kwargs):
+    """아웃라인 → 초안 → 보강 단계를 토큰이 도착하는 대로 화면에 표시하고 최종 본문 반환"""
+    status_text = st.empty()
+    preview = st.empty()
+    progress = st.empty()
+    stage, draft, stage_chars, last_render = None, "", 0, 0.0
+    for event in analyzer.stream_blog_content_bgn_style(*args, **kwargs):
+        if event[0] == "done":
+            result = event[1]
+            break
+        _, event_stage, delta = event
+        if event_stage != stage:
+            stage, stage_chars = event_stage, 0
+            status_text.info(STREAM_STAGE_LABELS.get(stage, stage))
+            if stage in STREAM_CAPTION_STAGES and draft:
+                preview.markdown(draft)   # 보강 중에도 지금까지의 초안을 그대로 보여 줌
+        if stage in STREAM_CAPTION_STAGES:
+            stage_chars += len(delta)
+        else:
+            draft += delta
+        # 조각마다 다시 그리면 느려지므로 0.1초 간격으로만 갱신
+        now = time.monotonic()
+        if now - last_render >= 0.1:
+            last_render = now
+            if stage in STREAM_CAPTION_STAGES:
+                progress.caption(STREAM_CAPTION_STAGES[stage].format(chars=stage_chars))
             else:
-                st.warning(f"⚠️ 목표 글자수에 미달하지만 생성 완료 ({char_count:,}자)")
-            
-        except Exception as e:
-            st.error(f"❌ 블로그 작성 중 오류: {str(e)}")
-            st.warning("💡 BGN 샘플 블로그로 진행합니다.")
-            generate_sample_blog()
+                progress.empty()
+                preview.markdown(draft + "▌")
+    status_text.empty()
+    preview.empty()
+    progress.empty()
+    return result
 
 def generate_sample_blog():
     """BGN 톤앤매너 샘플 블로그 생성"""
@@ -335,6 +386,7 @@ def generate_sample_blog():
 """
     
     st.session_state.blog_content = sample_content.strip()
+    st.session_state.blog_candidates = []
     char_count = len(st.session_state.blog_content)
     st.success(f"✅ BGN 톤앤매너 샘플 블로그 생성! (총 {char_count:,}자)")
 
@@ -397,6 +449,8 @@ def display_generated_blog():
         current_bgn_score = check_bgn_style_quality(st.session_state.blog_content)
         st.metric("BGN 스타일", f"{current_bgn_score:.1f}")
     
+    display_blog_candidates()
+
     # BGN 톤앤매너 분석 결과
     with st.expander("🎯 BGN 톤앤매너 분석", expanded=False):
         bgn_analysis = analyze_bgn_style(st.session_state.blog_content)
@@ -428,52 +482,36 @@ def display_generated_blog():
     # 하단 네비게이션
     display_navigation()
 
+def use_blog_candidate(text):
+    """후보 본문으로 교체 (버튼 콜백이라 다음 실행의 편집기에 바로 반영됨)"""
+    st.session_state.blog_content = text
+
+def display_blog_candidates():
+    """후보 모드로 받은 초안 후보 (순위순). 버튼 한 번으로 본문 교체"""
+    candidates = st.session_state.get("blog_candidates") or []
+    if len(candidates) < 2:
+        return
+    with st.expander(f"🗂️ 초안 후보 {len(candidates)}개", expanded=False):
+        for rank, cand in enumerate(candidates, 1):
+            col1, col2 = st.columns([4, 1])
+            with col1:
+                length = "분량 충족" if cand["meets_length"] else "분량 미달"
+                st.markdown(f"**{rank}위** · 스타일 {cand['score']:.1f} · {cand['chars']:,}자 ({length})")
+                st.caption(cand["text"][:200].replace("\n", " ") + "…")
+            with col2:
+                if cand["text"] == st.session_state.blog_content:
+                    st.success("사용 중")
+                else:
+                    st.button("이 후보 사용", key=f"use_candidate_{rank}",
+                              on_click=use_blog_candidate, args=(cand["text"],), use_container_width=True)
+
 def check_bgn_style_quality(content):
-    """BGN 톤앤매너 품질 점수"""
-    score = 0.5
-    
-    # BGN 시작/종료 멘트 체크
-    if "BGN밝은눈안과(잠실점)" in content:
-        score += 0.2
-    
-    # 다양한 종결어미 체크
-    endings = ['해요', '습니다', '죠', '거든요', '더라고요', '라고요', '네요']
-    found_endings = sum(1 for ending in endings if ending in content)
-    if found_endings >= 4:
-        score += 0.2
-    elif found_endings >= 2:
-        score += 0.1
-    
-    # 감정 표현 체크
-    emotions = [':)', 'ㅠㅠ', '...', '웃음이 나왔', '울컥했']
-    if any(emotion in content for emotion in emotions):
-        score += 0.1
-    
-    return min(score, 1.0)
+    """BGN 톤앤매너 품질 점수 (내용이 같으면 이전 채점 결과 재사용)"""
+    return get_style_scorer().score(content)
 
 def analyze_bgn_style(content):
-    """BGN 스타일 상세 분석"""
-    analysis = {
-        'has_proper_intro': "BGN밝은눈안과(잠실점)" in content and "입니다." in content[:200],
-        'has_proper_outro': "이상으로" in content and "BGN밝은눈안과" in content[-200:],
-        'ending_variety': 0,
-        'has_emotions': False,
-        'has_empathy': False
-    }
-    
-    # 종결어미 다양성
-    endings = ['해요', '습니다', '죠', '거든요', '더라고요', '라고요', '네요']
-    analysis['ending_variety'] = sum(1 for ending in endings if ending in content)
-    
-    # 감정 표현
-    emotions = [':)', 'ㅠㅠ', '...', '웃음이 나왔', '울컥했']
-    analysis['has_emotions'] = any(emotion in content for emotion in emotions)
-    
-    # 공감 표현
-    empathy_words = ['괜찮', '이해', '마음', '공감', '함께']
-    analysis['has_empathy'] = any(word in content for word in empathy_words)
-    
-    return analysis
+    """BGN 스타일 상세 분석 (점수와 같은 한 번의 스캔 결과)"""
+    return get_style_scorer().analyze(content)
 
 def extract_title_from_content(content):
     """블로그 내용에서 제목 추출"""
@@ -502,7 +540,7 @@ def display_navigation():
         if current_chars >= 1500:
             if st.button("🔄 BGN 스타일로 재생성", use_container_width=True):
                 if st.session_state.get('openai_api_key'):
-                    generate_with_ai()
+                    generate_with_ai(use_cache=False)
                 else:
                     generate_sample_blog()
                 st.rerun()
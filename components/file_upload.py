@@ -1,6 +1,8 @@
 # components/file_upload.py
+import io
 import streamlit as st
 from utils.session_manager import next_step
+from utils.file_handler import get_documents, spool_uploaded_files, remove_uploaded_file
 from config import FILE_CONFIG
 
 def render_file_upload_page():
@@ -9,40 +11,49 @@ def render_file_upload_page():
     st.header("1️⃣ 파일 업로드")
     st.markdown("인터뷰 파일이나 콘텐츠 소재를 업로드해주세요.")
     
-    # 파일 업로드
-    uploaded_files = st.file_uploader(
+    # 파일 업로드 (디스크로 옮긴 뒤 위젯을 비워 업로드 바이트를 메모리에 남기지 않음)
+    uploader_key = st.session_state.get("uploader_key", 0)
+    new_files = st.file_uploader(
         "파일을 업로드하세요",
-        type=["txt", "md", "docx", "pdf"],
+        type=["txt", "md", "docx", "pdf", "hwp"],
         accept_multiple_files=True,
-        help=f"지원 형식: {', '.join(FILE_CONFIG['allowed_exts'])}"
+        help=f"지원 형식: {', '.join(FILE_CONFIG['allowed_exts'])}",
+        key=f"file_uploader_{uploader_key}"
     )
     
+    if new_files:
+        existing = {(f.name, f.size) for f in st.session_state.uploaded_files}
+        fresh = [f for f in new_files if (f.name, f.size) not in existing]
+        st.session_state.uploaded_files = list(st.session_state.uploaded_files) + spool_uploaded_files(fresh)
+        st.session_state.uploader_key = uploader_key + 1
+        st.rerun()
+    
+    uploaded_files = st.session_state.uploaded_files
     if uploaded_files:
         st.success(f"✅ {len(uploaded_files)}개 파일이 업로드되었습니다!")
         
         # 업로드된 파일 정보 표시
-        for i, file in enumerate(uploaded_files):
-            with st.expander(f"📄 {file.name}", expanded=False):
-                file_size = file.size / 1024 / 1024  # MB
+        for i, doc in enumerate(get_documents(uploaded_files)):
+            with st.expander(f"📄 {doc.name}", expanded=False):
+                file_size = doc.size / 1024 / 1024  # MB
                 st.write(f"**크기**: {file_size:.2f} MB")
-                st.write(f"**형식**: {file.type}")
+                st.write(f"**형식**: {doc.type}")
                 
-                # 텍스트 파일인 경우 미리보기
-                if file.name.endswith(('.txt', '.md')):
+                # 텍스트 파일인 경우 미리보기 (앞부분만 디코딩)
+                if doc.extension in ('.txt', '.md'):
                     try:
-                        content = str(file.read(), "utf-8")
-                        file.seek(0)  # 파일 포인터 리셋
                         st.text_area(
-                            f"미리보기 ({file.name})", 
-                            content[:500] + "..." if len(content) > 500 else content,
+                            f"미리보기 ({doc.name})", 
+                            doc.preview(500),
                             height=100,
                             disabled=True
                         )
                     except:
                         st.warning("텍스트 미리보기를 할 수 없습니다.")
-        
-        # 세션에 저장
-        st.session_state.uploaded_files = uploaded_files
+                
+                if st.button("🗑️ 파일 제거", key=f"remove_file_{i}"):
+                    remove_uploaded_file(doc.file)
+                    st.rerun()
         
         # 다음 단계로 이동
         if st.button("➡️ 소재 분석 시작", type="primary", use_container_width=True):
@@ -83,19 +94,17 @@ Q: 마지막으로 하고 싶은 말씀이 있다면?
 A: 비슷한 고민을 하고 계신 분들이 너무 오래 혼자 끙끙 앓지 마셨으면 좋겠어요. 작은 것이라도 궁금한 게 있으시면 편하게 연락주세요. 저희가 항상 여기 있으니까요.
 """
     
-    # 샘플 파일을 세션에 저장
-    class SampleFile:
+    # 샘플 파일을 세션에 저장 (업로드 파일처럼 read/seek 지원)
+    class SampleFile(io.BytesIO):
         def __init__(self, name, content):
+            super().__init__(content.encode('utf-8'))
             self.name = name
             self.content = content
             self.size = len(content.encode('utf-8'))
             self.type = "text/plain"
-            
-        def read(self):
-            return self.content.encode('utf-8')
     
     sample_file = SampleFile("sample_interview.txt", sample_content)
-    st.session_state.uploaded_files = [sample_file]
+    st.session_state.uploaded_files = spool_uploaded_files([sample_file])
     
     st.success("✅ 샘플 인터뷰 파일이 생성되었습니다!")
     st.info("다음 단계로 넘어가서 소재 분석을 시작하세요.")
\ No newline at end of file
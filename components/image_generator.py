@@ -4,6 +4,7 @@ import hashlib
 import random
 from openai import OpenAI
 from config import OPENAI_CONFIG, IMAGE_CONFIG
+from utils.openai_clients import get_client
 
 BASE_MODS = [
     "documentary clinical close-up, natural lighting",
@@ -49,7 +50,11 @@ def _gen_variants(client: OpenAI, base_prompt: str, n: int):
 
 def render_image_generator_page():
     st.header("④ 이미지 생성")
-    client = OpenAI(api_key=OPENAI_CONFIG.get("api_key"))
+    try:
+        client = get_client(st.session_state.get("openai_api_key") or OPENAI_CONFIG.get("api_key"))
+    except ValueError as e:
+        st.error(f"❌ {e}")
+        return
 
     base_prompt = st.text_area("기본 프롬프트", placeholder="예: 안구건조증 검사 과정 인포그래픽, ...")
     n = st.slider("생성 개수", 1, 8, IMAGE_CONFIG.get("n", 4))
@@ -1,9 +1,13 @@
 # components/material_analysis.py
+import time
 import streamlit as st
 from utils.session_manager import previous_step, next_step
 from utils.ai_analyzer import AIAnalyzer
+from utils.file_handler import process_uploaded_files, get_documents
 from config import CONTENT_TYPES
 
+STREAM_POLL_SECONDS = 1.0   # 분석 진행 중 소재 목록을 다시 그리는 간격
+
 def render_material_analysis_page():
     """2단계: 소재 분석 페이지"""
     
@@ -16,6 +20,11 @@ def render_material_analysis_page():
             previous_step()
         return
     
+    # 분석 진행 중: 먼저 완성된 소재부터 표시
+    if st.session_state.get("analysis_job") is not None:
+        display_streaming_analysis(st.session_state.analysis_job)
+        return
+
     # 분석 시작
     if not st.session_state.analysis_results:
         display_file_info()
@@ -28,35 +37,25 @@ def display_file_info():
     """업로드된 파일 정보 표시"""
     st.subheader("📄 업로드된 파일")
     
-    for i, file in enumerate(st.session_state.uploaded_files):
-        with st.expander(f"📄 {file.name}", expanded=True):
+    for i, doc in enumerate(get_documents(st.session_state.uploaded_files)):
+        with st.expander(f"📄 {doc.name}", expanded=True):
             col1, col2 = st.columns(2)
             
             with col1:
-                file_size = getattr(file, 'size', 0) / 1024 / 1024
+                file_size = doc.size / 1024 / 1024
                 st.write(f"**크기**: {file_size:.2f} MB")
-                st.write(f"**형식**: {getattr(file, 'type', 'unknown')}")
+                st.write(f"**형식**: {doc.type}")
             
             with col2:
-                # 파일 내용 미리보기
+                # 파일 내용 미리보기 (앞부분만 디코딩, 전체 텍스트는 분석 시 1회 로드)
                 try:
-                    if hasattr(file, 'read'):
-                        content = file.read()
-                        if isinstance(content, bytes):
-                            content = content.decode('utf-8')
-                        elif hasattr(content, 'decode'):
-                            content = content.decode('utf-8')
-                        else:
-                            content = str(content)
-                        
-                        preview = content[:300] + "..." if len(content) > 300 else content
-                        st.text_area(
-                            f"미리보기",
-                            preview,
-                            height=100,
-                            disabled=True,
-                            key=f"preview_{i}"
-                        )
+                    st.text_area(
+                        f"미리보기",
+                        doc.preview(300),
+                        height=100,
+                        disabled=True,
+                        key=f"preview_{i}"
+                    )
                 except Exception as e:
                     st.warning(f"미리보기 불가: {str(e)}")
 
@@ -81,28 +80,23 @@ def run_ai_analysis():
     """AI 분석 실행"""
     with st.spinner("🤖 AI가 콘텐츠 소재를 분석하고 있습니다..."):
         try:
-            # 파일 내용 읽기
-            all_content = ""
-            for file in st.session_state.uploaded_files:
-                try:
-                    if hasattr(file, 'read'):
-                        content = file.read()
-                        if isinstance(content, bytes):
-                            content = content.decode('utf-8')
-                        elif hasattr(content, 'decode'):
-                            content = content.decode('utf-8')
-                        else:
-                            content = str(content)
-                        all_content += f"\n\n=== {file.name} ===\n{content}"
-                except Exception as e:
-                    st.warning(f"{file.name} 읽기 실패: {str(e)}")
-            
-            # AI 분석 실행
-            analyzer = AIAnalyzer(st.session_state.get('openai_api_key'))
-            results = analyzer.analyze_interview_content_keyword_based(all_content)
+            # 파일 내용 추출 (PDF 페이지/DOCX 병렬, 파일별로 유지 → 길면 파일 단위 청크 분석)
+            progress_bar = st.progress(0)
+            status_text = st.empty()
+
+            def on_progress(done, total, name):
+                progress_bar.progress(done / total if total else 1.0)
+                status_text.text(f"📄 텍스트 추출 중... {name} ({done}/{total})")
+
+            documents = process_uploaded_files(st.session_state.uploaded_files, on_progress=on_progress)
+            progress_bar.empty()
+            status_text.empty()
             
-            st.session_state.analysis_results = results
-            st.success("✅ 분석이 완료되었습니다!")
+            # AI 분석 시작 (백그라운드에서 스트리밍 — 완성된 소재부터 화면에 표시)
+            analyzer = AIAnalyzer(st.session_state.get('openai_api_key'), use_cache=st.session_state.get('llm_cache_enabled'))
+            # "분석 다시 실행" 직후에는 캐시를 건너뛰고 새로 분석
+            use_cache = not st.session_state.pop('analysis_bypass_cache', False)
+            st.session_state.analysis_job = analyzer.start_interview_analysis(documents, use_cache=use_cache)
             st.rerun()
             
         except Exception as e:
@@ -166,23 +160,54 @@ def use_sample_analysis():
     st.success("✅ 샘플 분석 결과가 로드되었습니다!")
     st.rerun()
 
-def display_analysis_results():
-    """분석 결과 표시"""
+def display_streaming_analysis(job):
+    """진행 중인 분석: 지금까지 완성된 소재를 표시하고, 새 소재가 오거나 끝나면 화면 갱신"""
+    if job.done():
+        del st.session_state.analysis_job
+        try:
+            st.session_state.analysis_results = job.result()
+            st.success("✅ 분석이 완료되었습니다!")
+        except Exception as e:
+            st.error(f"❌ 분석 중 오류 발생: {str(e)}")
+            st.warning("💡 샘플 분석 결과를 사용해보세요.")
+            return
+        st.rerun()
+
+    st.info("⏳ 소재를 추출하고 있습니다. 완성된 소재부터 보여드리며, 바로 선택하셔도 됩니다.")
+    display_streaming_results(job)
+
+@st.fragment(run_every=STREAM_POLL_SECONDS)
+def display_streaming_results(job):
+    """소재 목록 부분만 주기적으로 다시 그림 — 스크립트를 붙잡고 기다리지 않으므로 선택·이동 클릭이 바로 처리됨"""
+    if job.done():
+        st.rerun()   # 앱 전체 재실행 → display_streaming_analysis가 최종 결과로 전환
+    display_analysis_results(job.snapshot(), in_progress=True)
+
+def display_analysis_results(results=None, in_progress=False):
+    """분석 결과 표시 (in_progress: 스트리밍 중 부분 결과)"""
+    results = st.session_state.analysis_results if results is None else results
     st.subheader("📊 분석 결과")
     
-    total_materials = sum(len(materials) for materials in st.session_state.analysis_results.values())
-    st.info(f"총 {total_materials}개의 콘텐츠 소재가 추출되었습니다.")
+    total_materials = sum(len(materials) for materials in results.values())
+    if in_progress:
+        st.caption(f"지금까지 {total_materials}개의 콘텐츠 소재가 추출되었습니다...")
+    else:
+        st.info(f"총 {total_materials}개의 콘텐츠 소재가 추출되었습니다.")
     
     # 탭으로 카테고리별 표시
-    tabs = st.tabs(list(st.session_state.analysis_results.keys()))
+    tabs = st.tabs(list(results.keys()))
     
-    for i, (category, materials) in enumerate(st.session_state.analysis_results.items()):
+    for i, (category, materials) in enumerate(results.items()):
         with tabs[i]:
             if materials:
                 st.write(f"**{len(materials)}개 소재**")
                 
                 for j, material in enumerate(materials):
-                    with st.expander(f"📝 {material['title']}", expanded=False):
+                    overlap = material.get('published_overlap')
+                    with st.expander(f"{'📰' if overlap else '📝'} {material['title']}", expanded=False):
+                        if overlap:
+                            st.warning(f"이미 발행한 글의 소재와 비슷합니다: '{overlap['title']}' "
+                                       f"(유사도 {overlap['similarity']:.0%})")
                         col1, col2 = st.columns(2)
                         
                         with col1:
@@ -208,6 +233,9 @@ def display_analysis_results():
                             st.success(f"✅ '{material['title']}'이 선택되었습니다!")
                             time.sleep(1)
                             next_step()
+                            st.rerun()   # 스트리밍 중(프래그먼트 안)에서도 페이지 전체를 다음 단계로
+            elif in_progress:
+                st.write("아직 이 카테고리의 소재가 도착하지 않았습니다.")
             else:
                 st.write("이 카테고리에는 추출된 소재가 없습니다.")
 
@@ -239,4 +267,5 @@ def select_material():
     with col2:
         if st.button("🔄 분석 다시 실행", use_container_width=True):
             st.session_state.analysis_results = {}
+            st.session_state.analysis_bypass_cache = True
             st.rerun()
\ No newline at end of file
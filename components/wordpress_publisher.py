@@ -1,6 +1,7 @@
 # components/wordpress_publisher.py
 import streamlit as st
 import requests
+from utils.near_duplicates import get_published_index
 
 # 안전 import
 try:
@@ -79,6 +80,9 @@ def render_wordpress_publisher_page():
                 tags=st.session_state.get("tags", []),
             )
             st.success("발행(또는 초안 저장) 완료!")
+            # 이후 분석에서 같은 소재가 다시 나오면 표시되도록 발행 이력에 등록
+            if st.session_state.get("selected_material"):
+                get_published_index().add(st.session_state.selected_material["data"])
             st.json(res)
         except Exception as e:
             st.error(f"발행 중 오류: {e}")
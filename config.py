@@ -2,6 +2,7 @@
 # 모든 모듈이 참조하는 '단일 출처(Single Source of Truth)' 구성
 
 import os
+import tempfile
 import streamlit as st
 
 # Streamlit secrets와 환경변수를 모두 지원하는 헬퍼 함수
@@ -43,14 +44,140 @@ OPENAI_MODEL = get_config_value("OPENAI_MODEL", "gpt-4o-mini")
 OPENAI_CONFIG = {
     "model": OPENAI_MODEL,
     "api_key": OPENAI_API_KEY,
+    # 분석·아웃라인 호출에 JSON Schema 구조화 출력(response_format) 사용. 미지원 모델이면 False
+    "structured_outputs": True,
+}
+
+# 프로세스 공용 OpenAI 클라이언트 (API 키당 1개, keep-alive 연결 풀 재사용)
+OPENAI_CLIENT_CONFIG = {
+    "max_connections": 20,
+    "max_keepalive_connections": 10,
+    "keepalive_expiry": 60.0,      # 유휴 연결 유지 시간(초)
+    "connect_timeout": 10.0,
+    "read_timeout": 120.0,
+    "max_retries": 2,
+    "max_concurrent_requests": 4,  # 프로세스 전체 동시 LLM 요청 상한 (청크 분석·여러 소재 초안 등)
+    "warm_up": True,               # 앱 시작 시 연결을 미리 열어 둠 (백그라운드)
+    "retire_grace_seconds": 300,   # 키 교체 후 기존 클라이언트를 닫기까지 대기 (진행 중 요청 보호)
+}
+
+# ───────────────────── 단계별 모델 라우팅 ─────────────────────
+# 단계마다 [기본 모델, 대체 모델, ...] 순서로 시도
+# - 기본 모델은 OPENAI_MODEL (본문 초안만 OPENAI_DRAFT_MODEL로 따로 지정 가능)
+# - 대체 모델은 기본 모델보다 싼 모델만 비싼 → 싼 순서로 (가격표에 없는 기본 모델이면 전부)
+# - 속도 제한(429)·타임아웃·연결/서버 오류면 SDK 재시도 없이 다음 모델로 넘어감 (스트리밍은 아직 받은 조각이 없을 때만)
+# - 단계별 지연 시간·토큰·비용은 utils/model_router.routing_stats()로 집계 (사이드바 표시)
+# 1M 토큰당 USD (입력, prefix 캐시 적중 입력, 출력) — 대체 순서 결정과 비용 집계용
+MODEL_PRICES = {
+    "gpt-4o":        {"input": 2.50, "cached_input": 1.25, "output": 10.00},
+    "gpt-4.1":       {"input": 2.00, "cached_input": 0.50, "output": 8.00},
+    "gpt-3.5-turbo": {"input": 0.50, "output": 1.50},
+    "gpt-4.1-mini":  {"input": 0.40, "cached_input": 0.10, "output": 1.60},
+    "gpt-4o-mini":   {"input": 0.15, "cached_input": 0.075, "output": 0.60},
+    "gpt-4.1-nano":  {"input": 0.10, "cached_input": 0.025, "output": 0.40},
+}
+FALLBACK_MODELS = ["gpt-4o-mini", "gpt-4.1-nano"]   # 비싼 → 싼 (더 빠른) 순서
+
+
+def _route(primary: str) -> list:
+    """[기본 모델] + 기본 모델보다 입력 단가가 싼 대체 모델"""
+    price = MODEL_PRICES.get(primary, {}).get("input")
+    return [primary] + [m for m in FALLBACK_MODELS
+                        if m != primary and (price is None or MODEL_PRICES[m]["input"] < price)]
+
+
+MODEL_ROUTING = {
+    "stages": {
+        "analysis":   _route(OPENAI_MODEL),     # 인터뷰 → 소재 JSON
+        "outline":    _route(OPENAI_MODEL),     # 아웃라인 JSON (~1,200토큰)
+        "draft":      _route(get_config_value("OPENAI_DRAFT_MODEL", OPENAI_MODEL)),  # 본문 초안
+        "transition": _route(OPENAI_MODEL),     # 섹션 연결 문장
+        "style":      _route(OPENAI_MODEL),     # 분량 보강 문단
+    },
+    # 단계별 요청 타임아웃(초). 대체 모델이 있으면 클라이언트 기본값(read_timeout)보다 짧게 끊고 넘어감
+    "timeouts": {"analysis": 90.0, "outline": 30.0, "draft": 90.0, "transition": 20.0, "style": 45.0},
+    "prices": MODEL_PRICES,
+}
+
+# ───────────────────── 토큰 예산 ─────────────────────
+# 글자 수 대신 토큰 수로 입력을 자르고(문장 경계), max_tokens는 컨텍스트 창 잔여분에서 결정
+# tiktoken이 없거나 오프라인이면 근사 계산(한글 음절 ≈ 1토큰)으로 동작
+TOKEN_CONFIG = {
+    "use_tiktoken": True,
+    "models": {
+        "gpt-4o-mini":   {"context": 128000, "max_output": 16384},
+        "gpt-4o":        {"context": 128000, "max_output": 16384},
+        "gpt-4.1-mini":  {"context": 1047576, "max_output": 32768},
+        "gpt-4.1":       {"context": 1047576, "max_output": 32768},
+        "gpt-4.1-nano":  {"context": 1047576, "max_output": 32768},
+        "gpt-3.5-turbo": {"context": 16385, "max_output": 4096},
+    },
+    "default_model": {"context": 128000, "max_output": 4096},
+    "analysis_input_tokens": 12000,   # 이보다 길면 청크 분석
+    "analysis_output_tokens": 4000,
+    "chunk_tokens": 9000,
+    "material_tokens": 5000,          # 블로그 생성 시 소재 본문 상한
+    "outline_output_tokens": 1200,
+    "safety_margin": 256,
 }
 
 # ───────────────────── 파일 처리 ─────────────────────
 FILE_CONFIG = {
-    "allowed_exts": [".txt", ".md", ".docx", ".pdf"],
-    "accept": ".txt,.md,.docx,.pdf",
+    "allowed_exts": [".txt", ".md", ".docx", ".pdf", ".hwp"],
+    "accept": ".txt,.md,.docx,.pdf,.hwp",
     "max_size_mb": 25,
-    "max_chars_for_analysis": 15000,
+    # 긴 인터뷰: 잘라내지 않고 파일별로 겹치는 청크로 나눠 병렬 분석 (크기는 TOKEN_CONFIG)
+    "chunked_analysis": True,
+    "chunk_overlap_chars": 800,
+    # 문서 추출: PDF 페이지/HWP 섹션/DOCX를 프로세스 풀로 분산 (작은 작업은 직렬)
+    "parallel_extraction": True,
+    "extraction_workers": 0,        # 0 → CPU 수
+    "parallel_min_pages": 8,
+    "pdf_pages_per_task": 4,
+    "hwp_sections_per_task": 1,
+    # 업로드 스풀: 세션에는 핸들만, 바이트는 임시 폴더(세션 종료 시 삭제)
+    "upload_spool_dir": os.path.join(tempfile.gettempdir(), "bgn_uploads"),
+    "upload_stale_hours": 24,
+}
+
+# ───────────────────── 전사본 압축 ─────────────────────
+# 분석 프롬프트에 넣기 전 인터뷰 텍스트 정리 (원문 오프셋 맵 유지 → source_quote는 원문 구간으로 복원)
+COMPRESSION_CONFIG = {
+    "enabled": True,
+    "steps": [
+        "strip_timestamps",         # [00:12:34], 화자 라벨 앞 00:12:34 (본문 시각은 보존)
+        "normalize_speakers",       # 질문:/인터뷰어: → Q:, 답변: → A:
+        "strip_fillers",            # 단독 어절 군더더기 말
+        "collapse_repeated_lines",  # 연속 반복된 동일 줄(반복 Q: 헤더 등)
+        "normalize_whitespace",     # 중복 공백/빈 줄
+    ],
+    "fillers": ["음", "으음", "어", "아", "에", "흠", "그니까", "뭐랄까", "뭐지"],
+}
+
+# ───────────────────── 캐시 ─────────────────────
+# 추출 텍스트 캐시: 메모리 LRU + 디스크(SQLite, 용량 상한 초과 시 오래 안 쓴 항목부터 제거)
+CACHE_CONFIG = {
+    "dir": get_config_value("CACHE_DIR", os.path.join(tempfile.gettempdir(), "bgn_blog_cache")),
+    "text_memory_items": 64,
+    "text_disk_max_mb": 200,
+    # LLM 응답 캐시 (opt-in): 같은 모델·메시지·temperature·top_p·max_tokens 요청은 저장된 응답 재사용
+    "llm_enabled": str(get_config_value("LLM_CACHE_ENABLED", "false")).lower() in ("1", "true", "yes"),
+    "llm_memory_items": 128,
+    "llm_disk_max_mb": 100,
+    "llm_ttl_hours": 72,
+}
+
+# ───────────────────── 유사 소재 탐지 ─────────────────────
+# MinHash(한글 글자 n-gram) + LSH로 제목+내용이 거의 같은 소재를 찾음
+# - 한 번의 분석 안에서 중복 소재는 하나만 남김
+# - 이미 발행한 소재(CACHE_CONFIG["dir"]/published_materials.sqlite3)와 겹치면 표시
+DEDUP_CONFIG = {
+    "enabled": True,
+    "shingle_size": 3,     # 공백·문장부호를 뺀 글자 n-gram
+    "num_perm": 64,        # 서명 길이 (= bands × rows)
+    "bands": 16,           # LSH 밴드 수 (rows = num_perm / bands)
+    "threshold": 0.6,      # 추정 자카드 유사도가 이 값 이상이면 중복
+    "check_published": True,
 }
 
 # ───────────────────── 콘텐츠 탭 키 ─────────────────────
@@ -62,6 +189,42 @@ CONTENT_TYPES = [
     "BGN 환자 질문 FAQ형",
 ]
 
+# 소재 자동 분류 규칙 (utils/categorizer.py)
+# - keywords: 제목+내용+키워드에서 찾을 단어 (대소문자 무시)
+# - role_hints / audience_hints: staff_perspective / target_audience에서 찾을 단어
+# - 유형 점수: 키워드 등장마다 weight(기본 1), 힌트 등장마다 hint_weight
+# - mode: "scoring" = 최고점 유형(동점이면 CONTENT_TYPES 순서) / "first_match" = 유형 순서대로 첫 매칭 유형(기존 any() 체인)
+# - 엔진은 속도만 다르고 결과는 같음: scoring은 Aho-Corasick 오토마톤(pyahocorasick) 한 번의 스캔,
+#   first_match는 패턴(키워드+힌트) 수 < automaton_min_patterns면 유형별 any() 체인, 이상이면 오토마톤
+#   (python -m benchmarks.bench_categorizer 기준 first_match 체인은 유형당 약 1,000개부터 오토마톤보다 느림)
+# - 아무것도 맞지 않으면 default
+CATEGORY_RULES = {
+    "default": "BGN 환자 에피소드형",
+    "hint_weight": 2.0,
+    "mode": "scoring",
+    "automaton_min_patterns": 5000,
+    "categories": {
+        "BGN 환자 에피소드형": {
+            "keywords": ["수술", "회복", "후기", "변화", "감동", "울컥"],
+            "audience_hints": ["예비 환자"],
+        },
+        "BGN 검사·과정형": {
+            "keywords": ["검사", "장비", "과정", "측정", "결과", "프로세스", "진단"],
+        },
+        "BGN 센터 운영/분위기형": {
+            "keywords": ["운영", "분위기", "대기시간", "예약", "서비스", "시스템", "원무"],
+            "role_hints": ["원무"],
+        },
+        "BGN 직원 성장기형": {
+            "keywords": ["신입", "멘토", "멘토링", "교육", "배움", "첫 수술", "성장"],
+            "role_hints": ["신입"],
+        },
+        "BGN 환자 질문 FAQ형": {
+            "keywords": ["질문", "언제", "가능", "방법", "주의", "faq", "자주 묻는"],
+        },
+    },
+}
+
 # ───────────────────── 블로그 길이 프리셋 ─────────────────────
 QUALITY_CONFIG = {
     "표준 BGN (2,000자)":   {"min_chars": 2000, "target_chars": 2200, "max_tokens": 4500},
@@ -73,6 +236,32 @@ QUALITY_CONFIG = {
 BLOG_CONFIG = {
     "default_style": "따뜻하고 담백한 의료 에세이",
     "default_length": "표준 BGN (2,000자)",
+    "stream": True,   # 블로그 생성 시 토큰 스트리밍으로 작성 과정을 실시간 표시
+    # 아웃라인의 H2 섹션을 동시에 작성(섹션별 분량은 아웃라인 섹션의 target_chars로 지정 가능)
+    "section_parallel": True,
+    "transition_pass": True,   # 섹션 경계에 짧은 연결 문장 추가
+    # 분량 미달 시 가장 짧은 섹션부터 새 문단으로 보강 (섹션 1개가 맡는 최대 글자 수 기준)
+    "gap_fill_chars_per_section": 350,
+    # 초안 후보 수: 2 이상이면 한 요청(n=)으로 초안 여러 개를 받아 스타일 점수·분량으로 1위를 고름
+    # (섹션 병렬 작성 대신 한 번에 작성, 출력 토큰은 후보 수만큼 늘어남)
+    "candidates": 1,
+    # 스트리밍 중 목표 분량(target_chars, 섹션별 분량)을 넘기면 첫 문단·섹션 경계에서 생성을 멈춤 (남은 출력 토큰 절약)
+    "length_stop": True,
+    # 멈춘 글에 마무리 인사가 없으면 덧붙이는 기본 마무리 문장
+    "closing_line": "이상으로 BGN밝은눈안과(잠실점) {staff_role} {staff_name}이었습니다. 읽어 주셔서 감사합니다.",
+}
+
+# BGN 톤앤매너 채점 규칙 (utils/style_scorer.py가 하나의 매처로 컴파일)
+STYLE_CONFIG = {
+    "brand": "BGN밝은눈안과(잠실점)",
+    "outro_brand": "BGN밝은눈안과",
+    "intro_marker": "입니다.",
+    "outro_marker": "이상으로",
+    "edge_chars": 200,   # 시작/끝 멘트를 찾는 앞뒤 글자 수
+    "endings": ["해요", "습니다", "죠", "거든요", "더라고요", "라고요", "네요"],
+    "emotions": [":)", "ㅠㅠ", "...", "웃음이 나왔", "울컥했"],
+    "empathy_words": ["괜찮", "이해", "마음", "공감", "함께"],
+    "memo_items": 256,   # 내용 해시별 채점 결과 보관 개수
 }
 
 # ───────────────────── 이미지 생성 기본값 ─────────────────────
@@ -1,5 +1,7 @@
 # main.py
 import streamlit as st
+from streamlit import runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 import os
 from dotenv import load_dotenv
 
@@ -44,6 +46,11 @@ except ImportError:
 
 # 유틸리티 import
 from utils.session_manager import initialize_session_state, get_all_steps
+from utils.cache_store import cache_settings, get_response_cache
+from utils.openai_clients import rotate_api_key
+from utils.schemas import parse_failure_stats
+from utils.model_router import routing_stats
+from utils.prompts import prefix_cache_stats
 
 # 설정 import
 try:
@@ -170,6 +177,50 @@ def render_sidebar():
                 ⚠️ **주의**: .env 파일은 Git에 커밋하지 마세요!
                 """)
     
+    _sync_openai_client(st.session_state.get("openai_api_key"))
+
+    # LLM 응답 캐시
+    with st.sidebar.expander("🗄️ 응답 캐시", expanded=False):
+        st.toggle(
+            "같은 요청은 저장된 AI 응답 재사용",
+            value=cache_settings()["llm_enabled"],
+            key="llm_cache_enabled",
+            help="모델·프롬프트·창의성 설정이 같으면 API를 다시 호출하지 않습니다. 재생성 버튼은 항상 새로 생성합니다.",
+        )
+        stats = get_response_cache().stats()
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        c1, c2 = st.columns(2)
+        c1.metric("적중", f"{hits:,}")
+        c2.metric("미적중", f"{stats['misses']:,}")
+        st.caption(f"저장 {stats['disk_items']:,}건 · {stats['disk_bytes'] / 1024 / 1024:.1f}MB")
+        if st.button("캐시 비우기", use_container_width=True):
+            get_response_cache().clear()
+            st.rerun()
+
+    # 구조화 출력(JSON) 파싱 실패율
+    with st.sidebar.expander("📊 JSON 파싱 통계", expanded=False):
+        labels = {"bgn_materials": "소재 분석", "blog_outline": "아웃라인"}
+        for name, s in parse_failure_stats().items():
+            st.caption(f"**{labels.get(name, name)}**: {s['calls']:,}회 · 첫 응답 실패 {s['first_try_failure_rate']:.0%}"
+                       f" · 재시도 복구 {s['retry_recovered']:,} · 최종 실패 {s['failure_rate']:.0%}")
+
+    # 단계별 모델 라우팅: 지연 시간·비용
+    with st.sidebar.expander("🛣️ 모델 라우팅", expanded=False):
+        labels = {"analysis": "소재 분석", "outline": "아웃라인", "draft": "초안", "transition": "연결 문장", "style": "분량 보강"}
+        rows = routing_stats()
+        if not rows:
+            st.caption("아직 호출 기록이 없습니다.")
+        for r in rows:
+            st.caption(f"**{labels.get(r['stage'], r['stage'])}** · `{r['model']}`: {r['calls']:,}회"
+                       f" · 평균 {r['latency_avg']:.1f}s (최대 {r['latency_max']:.1f}s)"
+                       f" · 토큰 {r['prompt_tokens']:,}/{r['completion_tokens']:,} · ${r['cost_usd']:.4f}"
+                       f" · 대체 {r['fallbacks']:,} · 실패 {r['errors']:,}")
+        if rows:
+            st.caption(f"합계 ${sum(r['cost_usd'] for r in rows):.4f}")
+        # 템플릿별 프롬프트 prefix 캐시 적중 (응답 usage의 cached_tokens)
+        for key, s in prefix_cache_stats().items():
+            st.caption(f"🧩 `{key}`: 캐시 적중 {s['cache_hits']:,}/{s['calls']:,}회 · 입력 토큰의 {s['cached_ratio']:.0%}")
+
     # 진행 단계 표시
     steps = get_all_steps()
     for i, step_label in enumerate(steps, 1):
@@ -197,5 +248,19 @@ def render_sidebar():
                 st.session_state.step += 1
                 st.rerun()
 
+def _sync_openai_client(api_key):
+    """처음 쓰는 키는 공용 클라이언트 연결을 미리 열고, 세션이 키를 바꾸면 이전 키 참조를 놓음
+
+    이전 키 클라이언트는 그 키를 쓰는 다른 세션이 없을 때만 닫힘 (끝난 세션은 참조에서 제외)
+    """
+    previous = st.session_state.get("_active_openai_key")
+    if not api_key or api_key == previous:
+        return
+    ctx = get_script_run_ctx()
+    owner = ctx.session_id if ctx else "default"
+    is_live = runtime.get_instance().is_active_session if runtime.exists() else None
+    rotate_api_key(previous, api_key, owner, is_live)
+    st.session_state._active_openai_key = api_key
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
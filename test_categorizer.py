@@ -0,0 +1,99 @@
+from benchmarks.bench_categorizer import build_sample, expand_rules
+from utils.categorizer import CATEGORY_RULES, Categorizer
+
+
+def legacy_categorize(it):
+    """user-019 이전 ai_analyzer._categorize_bgn_materials의 분류 규칙 (하드코딩 any() 체인)"""
+    text = f"{it.get('title','')} {it.get('content','')} {', '.join(it.get('keywords', []))}".lower()
+    role = (it.get("staff_perspective") or "").lower()
+    audience = (it.get("target_audience") or "")
+    if any(k in text for k in ["수술","회복","후기","변화","감동","울컥"]) or "예비 환자" in audience:
+        return "BGN 환자 에피소드형"
+    if any(k in text for k in ["검사","장비","과정","측정","결과","프로세스","진단"]):
+        return "BGN 검사·과정형"
+    if any(k in text for k in ["운영","분위기","대기시간","예약","서비스","시스템","원무"]) or "원무" in role:
+        return "BGN 센터 운영/분위기형"
+    if any(k in text for k in ["신입","멘토","멘토링","교육","배움","첫 수술","성장"]) or "신입" in role:
+        return "BGN 직원 성장기형"
+    if any(k in text for k in ["질문","언제","가능","방법","주의","faq","자주 묻는"]):
+        return "BGN 환자 질문 FAQ형"
+    return "BGN 환자 에피소드형"
+
+
+FIRST_MATCH = {**CATEGORY_RULES, "mode": "first_match"}
+
+# (소재, 기존 첫 매칭 결과, 점수 방식 결과) — 기본(scoring)으로 바뀌며 달라지는 분류
+PINNED = [
+    ({"title": "수술 전 검사", "content": "장비로 측정한 결과와 진단 과정을 설명드려요."},
+     "BGN 환자 에피소드형", "BGN 검사·과정형"),
+    ({"title": "수술 예약 안내", "content": "예약 시스템으로 대기시간을 줄였어요.", "staff_perspective": "원무팀"},
+     "BGN 환자 에피소드형", "BGN 센터 운영/분위기형"),
+    ({"title": "첫 수술 참관", "content": "멘토 선생님과의 교육 시간이 기억나요.", "staff_perspective": "신입 간호사"},
+     "BGN 환자 에피소드형", "BGN 직원 성장기형"),
+    ({"title": "검사 결과", "content": "질문이 많으셨어요.", "target_audience": "예비 환자"},
+     "BGN 환자 에피소드형", "BGN 환자 에피소드형"),
+    ({"title": "수술 검사", "content": ""},   # 동점 → CONTENT_TYPES 순서
+     "BGN 환자 에피소드형", "BGN 환자 에피소드형"),
+    ({"title": "FAQ", "content": "운동은 언제부터 가능한가요?"},
+     "BGN 환자 질문 FAQ형", "BGN 환자 질문 FAQ형"),
+    ({"title": "평범한 하루", "content": "특별한 일 없이 지나갔어요."},   # 무매칭 → default
+     "BGN 환자 에피소드형", "BGN 환자 에피소드형"),
+]
+
+
+def test_engines_agree_on_shipped_rules():
+    items = build_sample(2000) + [item for item, _, _ in PINNED]
+    for rules in (CATEGORY_RULES, FIRST_MATCH):
+        chain = Categorizer(rules, engine="chain")
+        automaton = Categorizer(rules, engine="automaton")
+        assert [chain.categorize(it) for it in items] == [automaton.categorize(it) for it in items]
+        assert [chain.scores(it) for it in items] == [automaton.scores(it) for it in items]
+
+
+def test_engines_agree_on_expanded_rules():
+    items = build_sample(500)
+    rules = expand_rules(CATEGORY_RULES, 200)
+    chain = Categorizer(rules, engine="chain")
+    automaton = Categorizer(rules, engine="automaton")
+    assert [chain.categorize(it) for it in items] == [automaton.categorize(it) for it in items]
+
+
+def test_default_mode_scores_every_category():
+    categorizer = Categorizer()
+    assert categorizer.mode == "scoring" and categorizer.engine == "automaton"
+    for item, _, scoring_label in PINNED:
+        assert categorizer.categorize(item) == scoring_label
+
+
+def test_first_match_mode_keeps_legacy_labels():
+    items = build_sample(2000)
+    legacy = [legacy_categorize(it) for it in items]
+    for engine in ("chain", "automaton"):
+        categorizer = Categorizer(FIRST_MATCH, engine=engine)
+        assert [categorizer.categorize(it) for it in items] == legacy
+        for item, legacy_label, _ in PINNED:
+            assert legacy_categorize(item) == legacy_label
+            assert categorizer.categorize(item) == legacy_label
+
+
+def test_scores_count_every_occurrence():
+    item = {"title": "첫 수술", "content": "수술 후 회복", "staff_perspective": "신입"}
+    for engine in ("chain", "automaton"):
+        scores = Categorizer(engine=engine).scores(item)
+        # "첫 수술" 안의 "수술"도 겹쳐서 셈, 역할 힌트는 hint_weight
+        assert scores["BGN 환자 에피소드형"] == 3.0
+        assert scores["BGN 직원 성장기형"] == 1.0 + CATEGORY_RULES["hint_weight"]
+
+
+def test_self_overlapping_keywords_count_the_same():
+    rules = {**CATEGORY_RULES, "categories": {"BGN 환자 질문 FAQ형": {"keywords": ["ㅋㅋ", "아아아"]}}}
+    item = {"title": "ㅋㅋㅋㅋ", "content": "아아아아아"}
+    for engine in ("chain", "automaton"):
+        assert Categorizer(rules, engine=engine).scores(item)["BGN 환자 질문 FAQ형"] == 6.0
+
+
+def test_first_match_switches_to_automaton_for_large_rules():
+    assert Categorizer(FIRST_MATCH).engine == "chain"
+    rules = expand_rules(FIRST_MATCH, 1000)
+    assert Categorizer(rules).engine == "automaton"
+    assert Categorizer({**rules, "automaton_min_patterns": 10 ** 9}).engine == "chain"
@@ -0,0 +1,42 @@
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+from utils import extraction_engine
+
+
+class DyingPool:
+    """세 번째 작업부터 워커가 죽은 것처럼 BrokenProcessPool을 내는 풀"""
+
+    def __init__(self):
+        self.submitted = 0
+
+    def submit(self, fn, *args):
+        self.submitted += 1
+        future = Future()
+        if self.submitted < 3:
+            future.set_result(fn(*args))
+        else:
+            future.set_exception(BrokenProcessPool("worker died"))
+        return future
+
+
+def test_broken_pool_reruns_only_unfinished_tasks(monkeypatch):
+    calls = []
+    original = extraction_engine._run_task
+
+    def run_task(kind, source, start, stop):
+        calls.append(source)
+        return original(kind, source, start, stop)
+
+    monkeypatch.setattr(extraction_engine, "_run_task", run_task)
+    monkeypatch.setattr(extraction_engine, "_get_pool", lambda workers, method: DyingPool())
+    monkeypatch.setattr(extraction_engine, "shutdown_pool", lambda: None)
+    files = [(f"{i}.txt", f"문서 {i}".encode("utf-8")) for i in range(5)]
+    progress = []
+
+    results = extraction_engine.extract_documents(
+        files, on_progress=lambda done, total, name: progress.append(done), parallel=True, use_cache=False)
+
+    assert [r.text for r in results] == [f"문서 {i}" for i in range(5)]
+    assert sorted(calls) == sorted(data for _, data in files)   # 파일마다 한 번씩만 추출
+    assert progress == [1, 2, 3, 4, 5]
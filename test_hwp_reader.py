@@ -0,0 +1,38 @@
+import struct
+import zlib
+
+from utils import hwp_reader
+
+PARA_TEXT = 67
+_decompressobj = zlib.decompressobj
+
+
+def records(texts):
+    return b"".join(struct.pack("<I", PARA_TEXT | (len(p) << 20)) + p for p in (t.encode("utf-16-le") for t in texts))
+
+
+class HoldBackInflater:
+    """마지막 몇 바이트를 flush()에서야 돌려주는 inflater (버퍼링하는 zlib 구현 흉내)"""
+
+    def __init__(self, wbits):
+        self._inner = _decompressobj(wbits)
+        self._held = b""
+
+    def decompress(self, chunk):
+        data = self._held + self._inner.decompress(chunk)
+        data, self._held = data[:-6], data[-6:]
+        return data
+
+    def flush(self):
+        return self._held + self._inner.flush()
+
+
+def test_records_in_final_flush_are_parsed(monkeypatch):
+    texts = [f"문단 {i}" for i in range(20)]
+    deflate = zlib.compressobj(9, zlib.DEFLATED, -15)
+    stream = deflate.compress(records(texts)) + deflate.flush()
+    monkeypatch.setattr(hwp_reader.zlib, "decompressobj", HoldBackInflater)
+
+    out = list(hwp_reader._iter_records([stream[i:i + 16] for i in range(0, len(stream), 16)], True))
+
+    assert [payload.decode("utf-16-le") for _, payload in out] == texts
@@ -0,0 +1,75 @@
+import asyncio
+import types
+
+from utils import ai_analyzer, prompts
+from utils.length_control import LengthStop, closing_pattern
+
+CLOSING = closing_pattern("이상으로", "BGN밝은눈안과")
+PARAGRAPH = "수술 후 첫 검진에서 시력이 잘 나왔다고 말씀드리니 환자분이 활짝 웃으셨어요. " * 3
+
+
+def feed_all(stop, text, size=7):
+    cut = None
+    for i in range(0, len(text), size):
+        cut = stop.feed(text[i:i + size])
+        if cut is not None:
+            break
+    return cut
+
+
+def test_body_sentence_with_outro_word_does_not_disable_stop():
+    # "이상으로"가 본문 문장에 나와도(브랜드 없음) 목표 분량을 넘긴 첫 문단 경계에서 멈춤
+    text = PARAGRAPH + "\n\n" + "검사 결과가 예상 이상으로 좋았어요. " + PARAGRAPH + "\n\n" + PARAGRAPH * 2
+    stop = LengthStop(len(PARAGRAPH) + 20, CLOSING)
+    cut = feed_all(stop, text)
+    assert cut == text.index("\n\n", len(PARAGRAPH) + 20)
+
+
+def test_closing_near_tail_is_received_to_the_end():
+    closing = "이상으로 BGN밝은눈안과(잠실점) 검안사 김이었습니다.\n\n읽어 주셔서 감사합니다 :)"
+    text = PARAGRAPH + "\n\n" + closing
+    stop = LengthStop(len(PARAGRAPH) + 10, CLOSING)
+    assert feed_all(stop, text, size=3) is None   # 조각 사이에 걸친 마무리 인사도 인식
+
+
+def test_closing_far_before_tail_is_ignored():
+    text = "이상으로 BGN밝은눈안과 소개를 마치고 본론으로 갈게요.\n\n" + PARAGRAPH * 4 + "\n\n" + PARAGRAPH
+    target = len(PARAGRAPH) * 4
+    stop = LengthStop(target, CLOSING, tail_chars=200)
+    assert feed_all(stop, text) == text.index("\n\n", target)
+
+
+def test_cut_stream_usage_is_excluded_from_prefix_cache_stats(monkeypatch):
+    body = PARAGRAPH + "\n\n" + PARAGRAPH + "\n\n" + PARAGRAPH
+    closed = []
+
+    class Stream:
+        def __aiter__(self):
+            async def gen():
+                for i in range(0, len(body), 11):
+                    delta = types.SimpleNamespace(content=body[i:i + 11])
+                    yield types.SimpleNamespace(choices=[types.SimpleNamespace(index=0, delta=delta)], usage=None)
+            return gen()
+
+        async def close(self):
+            closed.append(True)
+
+    class Completions:
+        async def create(self, **kwargs):
+            return Stream()
+
+    client = types.SimpleNamespace(chat=types.SimpleNamespace(completions=Completions()),
+                                   with_options=lambda **kw: client)
+    monkeypatch.setattr(ai_analyzer.AsyncAIAnalyzer, "client", property(lambda self: client))
+    analyzer = ai_analyzer.AsyncAIAnalyzer(api_key="sk-test", use_cache=False)
+    messages = prompts.render("blog_section", staff_role="검안사", staff_name="김", post_title="t", toc="1. a",
+                              title="t", content="c", keywords="k", number=1, h2="a", bullets="자유", h3="없음",
+                              chars=len(PARAGRAPH), position="중간 섹션입니다.")
+    key = prompts.template_key(messages)
+    before = prompts.prefix_cache_stats().get(key, {}).get("calls", 0)
+
+    text = asyncio.run(analyzer._chat(messages, stage="draft", temperature=0.5, max_tokens=2000,
+                                      use_cache=False, stop=LengthStop(len(PARAGRAPH), None)))
+
+    assert closed and text == body[:body.index("\n\n", len(PARAGRAPH))]
+    assert prompts.prefix_cache_stats().get(key, {}).get("calls", 0) == before
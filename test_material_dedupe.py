@@ -0,0 +1,48 @@
+import asyncio
+
+from utils import ai_analyzer
+from utils.ai_analyzer import AsyncAIAnalyzer
+from utils.categorizer import CONTENT_TYPES
+
+QUOTE = "수술 다음 날 아침에 시계가 또렷하게 보여서 정말 놀랐어요."
+
+
+def near_duplicate(i):
+    content = (f"라식 수술을 받으신 환자분이 회복실에서 해 주신 이야기예요. {QUOTE} "
+               "안경 없이 출근한 첫날, 버스 번호가 멀리서도 보여서 한참을 웃으셨다고 해요. "
+               f"검안사로서 그 변화를 옆에서 지켜보는 순간이 가장 뿌듯합니다. ({i})")
+    return {
+        "title": f"수술 다음 날 또렷해진 아침 ({i})",
+        "content": content,
+        "keywords": ["BGN", "라식", "회복", "변화"],
+        "usage_point": "회복 경험 공감",
+        "staff_perspective": "검안사",
+        "source_quote": QUOTE,
+    }
+
+
+def test_near_duplicates_collapsing_below_minimum_fall_back_to_samples(monkeypatch):
+    monkeypatch.setitem(ai_analyzer.DEDUP_CONFIG, "check_published", False)
+    analyzer = AsyncAIAnalyzer(api_key="sk-test", use_cache=False)
+
+    validated = analyzer._validate_bgn_keyword_materials({"키워드 기반 소재": [near_duplicate(i) for i in range(6)]})
+    materials = validated["키워드 기반 소재"]
+
+    assert analyzer.last_validation_stats["valid"] + analyzer.last_validation_stats["repaired"] == 6
+    # 6개 모두 유효하지만 중복 제거 후 1개 → 최소 4개 미달이므로 샘플 소재로 대체
+    assert materials == analyzer._get_bgn_keyword_fallback_materials()["키워드 기반 소재"]
+    assert any("샘플 보강" in message for _, message in analyzer.drain_notices())
+
+
+def test_analysis_result_uses_samples_after_dedupe(monkeypatch):
+    monkeypatch.setitem(ai_analyzer.DEDUP_CONFIG, "check_published", False)
+    analyzer = AsyncAIAnalyzer(api_key="sk-test", use_cache=False)
+
+    async def fake_analyze(content, use_cache=True, on_item=None):
+        return {"키워드 기반 소재": [near_duplicate(i) for i in range(6)]}
+
+    monkeypatch.setattr(analyzer, "_analyze_keywords_for_bgn", fake_analyze)
+    categorized = asyncio.run(analyzer.analyze_interview_documents([("인터뷰", QUOTE)]))
+
+    titles = {it["title"] for k in CONTENT_TYPES for it in categorized.get(k, [])}
+    assert titles == {it["title"] for it in analyzer._get_bgn_keyword_fallback_materials()["키워드 기반 소재"]}
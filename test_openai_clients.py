@@ -0,0 +1,45 @@
+import pytest
+
+from utils import openai_clients
+
+
+@pytest.fixture
+def retired(monkeypatch):
+    closed = []
+    monkeypatch.setitem(openai_clients.OPENAI_CLIENT_CONFIG, "warm_up", False)
+    monkeypatch.setitem(openai_clients.OPENAI_CONFIG, "api_key", "sk-default")
+    monkeypatch.setattr(openai_clients, "_KEY_OWNERS", {})
+    monkeypatch.setattr(openai_clients, "_retire", closed.append)
+    return closed
+
+
+def kids(*keys):
+    return sorted(openai_clients._key_id(k) for k in keys)
+
+
+def test_rotation_keeps_key_used_by_another_session(retired):
+    openai_clients.acquire_key("sk-shared", "session-a")
+    openai_clients.acquire_key("sk-shared", "session-b")
+
+    openai_clients.rotate_api_key("sk-shared", "sk-new", "session-a")
+    assert retired == []
+
+    openai_clients.rotate_api_key("sk-shared", "sk-other", "session-b")
+    assert retired == kids("sk-shared")
+
+
+def test_keys_of_ended_sessions_are_retired(retired):
+    live = {"session-a", "session-b"}
+    openai_clients.acquire_key("sk-old", "session-a")
+    openai_clients.acquire_key("sk-old", "session-b")
+    openai_clients.acquire_key("sk-b-only", "session-b")
+
+    live.discard("session-b")
+    openai_clients.rotate_api_key("sk-old", "sk-new", "session-a", live.__contains__)
+    assert sorted(retired) == kids("sk-old", "sk-b-only")
+
+
+def test_default_key_is_never_retired(retired):
+    openai_clients.acquire_key("sk-default", "session-a")
+    openai_clients.rotate_api_key("sk-default", "sk-new", "session-a")
+    assert retired == []
@@ -0,0 +1,16 @@
+from utils.transcript_compressor import compress_transcript
+
+STEPS = ["strip_timestamps"]
+
+
+def test_speaker_timecodes_are_stripped():
+    text = "[00:10:30] 질문: 수술은 어떠셨어요?\n00:10:42 답변: 생각보다 금방 끝났어요.\n[10:45 - 10:52] 네."
+    out = compress_transcript(text, steps=STEPS).text
+    assert out == "질문: 수술은 어떠셨어요?\n답변: 생각보다 금방 끝났어요.\n네."
+
+
+def test_times_in_content_are_kept():
+    text = "10:30 예약은 오전 진료로 잡아 드려요.\n오후 2:00 수술 전에 다시 안내드려요.\n10:30:00 기준으로 접수해요."
+    out = compress_transcript(text, steps=STEPS)
+    assert out.text == text
+    assert out.locate("10:30 예약은 오전 진료로") == (0, len("10:30 예약은 오전 진료로"))
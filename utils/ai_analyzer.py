@@ -1,11 +1,28 @@
 ﻿# utils/ai_analyzer.py
+import asyncio
+import hashlib
 import json
+import queue
+import re
+import threading
+import time
+from types import SimpleNamespace
 import streamlit as st
-from openai import OpenAI
+from utils.transcript_compressor import compress_transcript
+from utils.token_budget import count_tokens, count_message_tokens, trim_to_budget, chars_for_tokens, plan_max_tokens, model_limits, TOKEN_CONFIG
+from utils.cache_store import cache_settings, get_response_cache
+from utils.openai_clients import get_async_client, resolve_api_key
+from utils.async_runner import llm_semaphore, run_sync, submit
+from utils import model_router, prompts, schemas
+from utils.json_stream import JsonArrayItemStream
+from utils.length_control import LengthStop, closing_pattern
+from utils.categorizer import categorize_materials
+from utils.near_duplicates import DEDUP_CONFIG, NearDuplicateFilter, collapse_near_duplicates, flag_published_overlap
+from utils.style_scorer import get_style_scorer
 
 # ── 안전 import: config.py 일부 값이 비어도 앱이 즉사하지 않도록 가드
 try:
-    from config import OPENAI_CONFIG, CONTENT_TYPES, QUALITY_CONFIG, FILE_CONFIG
+    from config import OPENAI_CONFIG, CONTENT_TYPES, QUALITY_CONFIG, FILE_CONFIG, BLOG_CONFIG
 except Exception:
     OPENAI_CONFIG = {"model": "gpt-4o-mini", "api_key": ""}
     CONTENT_TYPES = [
@@ -16,28 +33,264 @@ except Exception:
         "BGN 환자 질문 FAQ형",
     ]
     QUALITY_CONFIG = {"표준 BGN (2,000자)": {"min_chars": 2000, "target_chars": 2200, "max_tokens": 4500}}
-    FILE_CONFIG = {"max_chars_for_analysis": 15000}
-
-class AIAnalyzer:
-    def __init__(self, api_key: str | None = None):
-        api_key = api_key or OPENAI_CONFIG.get("api_key", "")
-        self.client = OpenAI(api_key=api_key)
+    FILE_CONFIG = {"chunked_analysis": True}
+    BLOG_CONFIG = {"section_parallel": True, "transition_pass": True, "gap_fill_chars_per_section": 350, "candidates": 1,
+                   "length_stop": True, "closing_line": "이상으로 BGN밝은눈안과(잠실점) {staff_role} {staff_name}이었습니다. 읽어 주셔서 감사합니다."}
+try:
+    from config import COMPRESSION_CONFIG
+except Exception:
+    COMPRESSION_CONFIG = {"enabled": False}
+
+_H2_LINE = re.compile(r"(?m)^##[ \t]+\S")
+
+# 인용문 퍼지 매칭 시 무시할 문자: 공백, 각종 따옴표
+_QUOTE_IGNORED = set(" \t\r\n\u00a0\u3000\"'“”‘’「」『』")
+
+
+def _squeeze(text: str):
+    """무시 문자를 뺀 문자열과, 각 글자의 원문 인덱스"""
+    kept, index = [], []
+    for i, ch in enumerate(text):
+        if ch not in _QUOTE_IGNORED:
+            kept.append(ch)
+            index.append(i)
+    return "".join(kept), index
+
+
+def _locate_quote(content: str, quote: str):
+    """content 안에서 quote 구간 [s, e) 찾기: 정확히 일치 → 공백·따옴표 무시 일치 순. 없으면 None"""
+    quote = (quote or "").strip()
+    if not quote or not content:
+        return None
+    i = content.find(quote)
+    if i >= 0:
+        return i, i + len(quote)
+    squeezed_q, _ = _squeeze(quote)
+    if not squeezed_q:
+        return None
+    squeezed_c, index = _squeeze(content)
+    j = squeezed_c.find(squeezed_q)
+    if j < 0:
+        return None
+    return index[j], index[j + len(squeezed_q) - 1] + 1
+
+
+class AsyncAIAnalyzer:
+    """AsyncOpenAI 기반 분석기. 여러 요청(파일별 분석, 소재별 초안 등)을 asyncio.gather로 동시에 실행 가능
+
+    - 모든 LLM 호출은 프로세스 공용 세마포어(max_concurrent_requests) 안에서 실행
+    - 코루틴 안에서는 st.*를 호출하지 않고 알림을 self.notices에 (level, message)로 모음
+      → 동기 래퍼(AIAnalyzer)가 스크립트 스레드에서 표시
+    """
+
+    def __init__(self, api_key: str | None = None, use_cache: bool | None = None):
+        self.api_key = resolve_api_key(api_key)
         self.config = OPENAI_CONFIG
+        self.use_cache = cache_settings()["llm_enabled"] if use_cache is None else use_cache
+        self.last_compression_stats = {}
+        self.last_validation_stats = {}
+        self.last_candidates = []
+        self.notices = []
+
+    @property
+    def client(self):
+        """현재 이벤트 루프의 공용 AsyncOpenAI (키·루프당 1개, 연결 풀 재사용)"""
+        return get_async_client(self.api_key)
+
+    def _notify(self, level: str, message: str):
+        self.notices.append((level, message))
+
+    def drain_notices(self) -> list:
+        notices, self.notices = self.notices, []
+        return notices
+
+    # ───────────────────────────── LLM 호출 (응답 캐시) ─────────────────────────────
+    async def _chat(self, messages, *, stage, temperature, top_p=None, max_tokens, use_cache=True, on_delta=None,
+                    response_format=None, accept=None, stop=None) -> str:
+        """chat.completions 호출. 캐시 사용 시 (모델 경로, 메시지, temperature, top_p, max_tokens)가 같으면 저장된 응답 반환
+
+        stage: MODEL_ROUTING 단계 — 단계의 모델을 순서대로 시도 (속도 제한·타임아웃이면 다음 모델)
+        use_cache=False는 조회만 건너뜀(새로 샘플링) — 새 응답은 다시 저장됨
+        on_delta가 있으면 stream=True로 받아 조각마다 on_delta(text) 호출 (반환값은 조각을 이어 붙인 전체 응답)
+        accept(content)가 False인 응답(예: 스키마 불일치)은 캐시에 저장하지 않음
+        stop(LengthStop)이 있으면 스트리밍으로 받으며 목표 분량 뒤 첫 경계에서 멈춤 (반환값은 잘린 응답)
+        """
+        choices = await self._chat_choices(
+            messages, n=1, stage=stage, temperature=temperature, top_p=top_p, max_tokens=max_tokens,
+            use_cache=use_cache, on_delta=on_delta, response_format=response_format, accept=accept, stop=stop,
+        )
+        return choices[0]
+
+    async def _chat_choices(self, messages, *, n, stage, temperature, top_p=None, max_tokens, use_cache=True,
+                            on_delta=None, response_format=None, accept=None, stop=None) -> list:
+        """_chat과 같지만 한 요청으로 응답 n개(choices)를 받아 리스트로 반환
+
+        입력 토큰은 한 번만 과금되고 출력 토큰만 n배. 스트리밍 조각은 첫 번째 응답만 on_delta로 전달
+        stop은 n=1일 때만 사용 (한 응답에서 멈추면 나머지 응답도 끊기므로)
+        """
+        if n > 1:
+            stop = None
+        models = model_router.stage_models(stage)
+        key = None
+        params = {"top_p": top_p} if top_p is not None else {}
+        if response_format:
+            params["response_format"] = response_format
+        if model_router.stage_timeout(stage):
+            params["timeout"] = model_router.stage_timeout(stage)
+        if n > 1:
+            params["n"] = n
+        if self.use_cache:
+            request = {"model": models, "messages": messages,
+                       "temperature": temperature, "top_p": top_p, "max_tokens": max_tokens,
+                       "response_format": response_format}
+            if n > 1:
+                request["n"] = n
+            if stop is not None:
+                request["stop_after_chars"] = stop.target_chars
+            raw = json.dumps(request, ensure_ascii=False, sort_keys=True)
+            key = "llm:" + hashlib.sha256(raw.encode("utf-8")).hexdigest()
+            if use_cache:
+                cached = get_response_cache().get(key)
+                if cached is not None:
+                    choices = json.loads(cached) if n > 1 else [cached]
+                    if on_delta:
+                        on_delta(choices[0])
+                    return choices
+        async with llm_semaphore():
+            for tier, model in enumerate(models):
+                emitted = []
+                forward = (lambda d: (emitted.append(True), on_delta(d))) if on_delta else None
+                # 대체 모델이 남아 있으면 SDK 재시도 없이 바로 넘어감
+                client = self.client if tier == len(models) - 1 else self.client.with_options(max_retries=0)
+                if stop is not None:
+                    stop.reset()
+                started = time.perf_counter()
+                try:
+                    choices, usage = await self._complete(
+                        client, model, messages, temperature=temperature,
+                        max_tokens=min(max_tokens, model_limits(model)["max_output"]), on_delta=forward, stop=stop, **params)
+                except Exception as e:
+                    model_router.record(stage, model, latency=time.perf_counter() - started, fallback=tier > 0,
+                                        error=type(e).__name__)
+                    if emitted or tier == len(models) - 1 or not model_router.should_fall_back(e):
+                        raise
+                    self._notify("caption", f"↪️ {stage}: {model} 응답 지연/제한({type(e).__name__}) → {models[tier + 1]}로 전환")
+                    continue
+                prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+                details = getattr(usage, "prompt_tokens_details", None)
+                cached_tokens = getattr(details, "cached_tokens", 0) or 0
+                model_router.record(stage, model, latency=time.perf_counter() - started, fallback=tier > 0,
+                                    prompt_tokens=prompt_tokens, cached_tokens=cached_tokens,
+                                    completion_tokens=getattr(usage, "completion_tokens", 0) or 0)
+                if usage is not None and not getattr(usage, "estimated", False) and prompts.template_key(messages):
+                    prompts.record_usage(prompts.template_key(messages), prompt_tokens, cached_tokens)
+                break
+        if key and all(choices) and (accept is None or all(accept(c) for c in choices)):
+            get_response_cache().put(key, json.dumps(choices, ensure_ascii=False) if n > 1 else choices[0])
+        return choices
+
+    async def _complete(self, client, model, messages, *, temperature, max_tokens, on_delta=None, stop=None, **params):
+        """모델 1개로 한 번 호출 → ([응답 본문...], usage). 스트리밍이면 마지막 청크의 usage 사용
+
+        stop이 멈출 위치를 알려 주면 거기까지만 받고 스트림을 닫음 — usage 청크를 못 받으므로 토큰 수는 로컬 추정
+        (estimated=True, 캐시된 입력 토큰은 알 수 없으므로 prefix 캐시 통계에서 제외)
+        """
+        if on_delta is None and stop is None:
+            resp = await client.chat.completions.create(
+                model=model, messages=messages, temperature=temperature, max_tokens=max_tokens, **params,
+            )
+            return [c.message.content or "" for c in sorted(resp.choices, key=lambda c: c.index)], resp.usage
+        stream = await client.chat.completions.create(
+            model=model, messages=messages, temperature=temperature, max_tokens=max_tokens,
+            stream=True, stream_options={"include_usage": True}, **params,
+        )
+        parts, usage, cut = {}, None, None
+        async for chunk in stream:
+            if getattr(chunk, "usage", None):
+                usage = chunk.usage
+            for choice in chunk.choices or ():
+                delta = choice.delta.content
+                if not delta:
+                    continue
+                if choice.index == 0 and stop is not None:
+                    received = len(stop.text)
+                    cut = stop.feed(delta)
+                    if cut is not None:
+                        delta = delta[:max(0, cut - received)]
+                parts.setdefault(choice.index, []).append(delta)
+                if choice.index == 0 and on_delta and delta:
+                    on_delta(delta)
+            if cut is not None:
+                await stream.close()
+                text = "".join(parts.get(0, ()))[:cut]
+                usage = SimpleNamespace(prompt_tokens=count_message_tokens(messages, model),
+                                        completion_tokens=count_tokens(stop.text, model), estimated=True)
+                return [text], usage
+        return ["".join(parts.get(i, ())) for i in range(params.get("n", 1))], usage
+
+    async def _chat_json(self, schema_name, messages, *, on_delta=None, **kwargs):
+        """구조화 출력 호출 + 로컬 스키마 검증. 실패하면 오류 내용을 알려 주고 한 번만 다시 요청
+
+        두 번째도 실패하면 SchemaError. 결과는 schemas.parse_failure_stats()에 집계
+        """
+        fmt = schemas.response_format(schema_name) if self.config.get("structured_outputs", True) else None
+        accept = lambda text: schemas.is_valid(schema_name, text)
+        text = await self._chat(messages, response_format=fmt, accept=accept, on_delta=on_delta, **kwargs)
+        try:
+            data = schemas.parse(schema_name, text)
+            schemas.record(schema_name, first_try_ok=True)
+            return data
+        except schemas.SchemaError as e:
+            error = e
+        retry = messages + [
+            {"role": "assistant", "content": text},
+            {"role": "user", "content": f"위 응답이 요구한 JSON 형식에 맞지 않습니다: {error}\n형식을 고친 JSON만 다시 출력하세요."},
+        ]
+        kwargs["max_tokens"] = plan_max_tokens(model_router.primary_model(kwargs["stage"]), retry, kwargs["max_tokens"])
+        text = await self._chat(retry, response_format=fmt, accept=accept, **kwargs)
+        try:
+            data = schemas.parse(schema_name, text)
+        except schemas.SchemaError:
+            schemas.record(schema_name, first_try_ok=False, recovered=False)
+            raise
+        schemas.record(schema_name, first_try_ok=False, recovered=True)
+        return data
 
     # ───────────────────────────────── 인터뷰 → 소재 ─────────────────────────────────
-    def analyze_interview_content_keyword_based(self, content: str):
-        content = content or ""
-        max_len = FILE_CONFIG.get("max_chars_for_analysis", 15000)
-        if len(content) > max_len:
-            st.warning(f"📏 텍스트가 {len(content):,}자입니다. 앞 {max_len:,}자만 분석합니다.")
-            content = content[:max_len]
+    async def analyze_interview_content_keyword_based(self, content: str, use_cache: bool = True):
+        return await self.analyze_interview_documents([(None, content)], use_cache=use_cache)
+
+    async def analyze_interview_documents(self, documents, use_cache: bool = True, on_item=None):
+        """(파일명, 본문) 목록 분석: 길이 초과 시 파일별 청크로 나눠 병렬 분석 후 병합
+
+        use_cache=False면 응답 캐시 조회를 건너뛰고 다시 분석
+        on_item(category, item): 응답을 스트리밍하며 소재 객체가 완성될 때마다 검증·분류해 호출 (루프 스레드)
+          최종 반환값은 전체 응답 기준으로 다시 검증·병합한 결과
+        """
+        documents = [(name, text or "") for name, text in documents]
+        transcripts = []
+        if COMPRESSION_CONFIG.get("enabled", True):
+            transcripts = [(name, compress_transcript(text)) for name, text in documents]
+            documents = [(name, t.text) for name, t in transcripts]
+            self._report_compression(transcripts)
+        content = "".join(f"\n\n=== {name} ===\n{text}" if name else text for name, text in documents)
+        budget = TOKEN_CONFIG.get("analysis_input_tokens", 12000)
+        tokens = count_tokens(content, model_router.primary_model("analysis"))
 
         try:
-            payload = self._analyze_keywords_for_bgn(content)
+            if tokens <= budget:
+                payload = await self._analyze_keywords_for_bgn(content, use_cache, on_item)
+            elif FILE_CONFIG.get("chunked_analysis", True):
+                payload = await self._analyze_keywords_chunked(documents, use_cache, on_item)
+            else:
+                self._notify("warning", f"📏 텍스트가 약 {tokens:,} 토큰입니다. 문장 단위로 앞 {budget:,} 토큰만 분석합니다.")
+                payload = await self._analyze_keywords_for_bgn(trim_to_budget(content, budget, model_router.primary_model("analysis")), use_cache, on_item)
         except Exception as e:
-            st.warning(f"분석 실패 → 샘플로 대체: {e}")
+            self._notify("warning", f"분석 실패 → 샘플로 대체: {e}")
             payload = self._get_bgn_keyword_fallback_materials()
 
+        if transcripts:
+            self._attach_source_spans(payload, transcripts)
         validated = self._validate_bgn_keyword_materials(payload)
         categorized = self._categorize_bgn_materials(validated.get("키워드 기반 소재", []))
 
@@ -45,112 +298,181 @@ class AIAnalyzer:
             fb = self._get_bgn_keyword_fallback_materials()["키워드 기반 소재"]
             categorized = self._categorize_bgn_materials(fb)
 
-        st.success("✅ BGN 키워드 분석 완료")
+        self._notify("success", "✅ BGN 키워드 분석 완료")
         return categorized
 
-    def _analyze_keywords_for_bgn(self, content: str) -> dict:
-        prompt = f"""
-다음은 BGN밝은눈안과(잠실점) 직원 인터뷰 전문 일부입니다.
-이 텍스트를 기반으로 블로그로 확장 가능한 '소재'를 추출하세요.
-
-[인터뷰 내용]
-{content}
-
-[출력 형식(JSON)]
-{{
-  "키워드 기반 소재": [
-    {{
-      "title": "BGN 직원 1인칭 관점의 구체적이고 따뜻한 제목",
-      "content": "인터뷰에서 실제 언급된 구체 내용(≥120자). 독자 이해를 돕는 공신력 있는 일반 의학 설명 보강 허용(과장/후기/효능단정 금지).",
-      "keywords": ["BGN","관련 키워드", "6~8개"],
-      "timestamp": "인터뷰 구간(있다면)",
-      "usage_point": "2000자 이상 블로그 전개 포인트",
-      "staff_perspective": "검안사/간호사/원무팀/의료진",
-      "target_audience": "예비 환자/기존 환자/일반인",
-      "direct_quote": "직접 인용(있다면)",
-      "source_quote": "인터뷰 본문에서 해당 소재를 뒷받침하는 문장(필수)",
-      "evidence_span": [시작_문자_인덱스, 끝_문자_인덱스],
-      "bgn_brand_fit": "따뜻함/전문성/신뢰 연결",
-      "emotion_tone": "감정 톤"
-    }}
-  ]
-}}
-
-[중요 지침]
-- 최소 6개 이상, 주제/관점이 서로 다른 소재.
-- 인터뷰 '내용' 중심 + 공신력 있는 일반 의학 설명 보강(새로운 환자/사례 창작 금지).
-- 각 아이템은 반드시 `source_quote`를 포함하고, 그 문장이 `content` 안에 그대로 들어가야 하며,
-  `evidence_span`이 content 내 인덱스와 일치해야 함.
-- 반드시 JSON만 출력.
-"""
-        resp = self.client.chat.completions.create(
-            model=self.config["model"],
-            messages=[
-                {"role": "system", "content": "BGN 콘텐츠 기획자. 반드시 JSON만 출력."},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.3,
-            max_tokens=4000,
+    async def _analyze_keywords_for_bgn(self, content: str, use_cache: bool = True, on_item=None) -> dict:
+        messages = prompts.render("bgn_materials", content=content)
+        return await self._chat_json(
+            "bgn_materials", messages, stage="analysis", temperature=0.3,
+            max_tokens=plan_max_tokens(model_router.primary_model("analysis"), messages, TOKEN_CONFIG.get("analysis_output_tokens", 4000)),
+            use_cache=use_cache, on_delta=self._item_emitter(on_item) if on_item else None,
         )
-        txt = (resp.choices[0].message.content or "").strip()
-        start, end = txt.find("{"), txt.rfind("}") + 1
-        if start < 0 or end <= start:
-            raise json.JSONDecodeError("JSON 파싱 실패", txt, 0)
-        return json.loads(txt[start:end])
+
+    def _item_emitter(self, on_item):
+        """스트리밍 조각 → 점진 파서 → 완성된 소재를 검증·분류해 on_item(category, item)"""
+        parser = JsonArrayItemStream("키워드 기반 소재")
+
+        def on_delta(text):
+            for it in parser.feed(text):
+                if self._check_material_item(it) in ("valid", "repaired"):
+                    category = next(k for k, v in self._categorize_bgn_materials([it]).items() if v)
+                    on_item(category, it)
+        return on_delta
+
+    # ───────────────────────────── 전사본 압축 ─────────────────────────────
+    def _report_compression(self, transcripts):
+        """파일별 절감 토큰 수 표시"""
+        self.last_compression_stats = {name or "인터뷰": t.stats() for name, t in transcripts}
+        for name, s in self.last_compression_stats.items():
+            if s["tokens_before"]:
+                pct = s["tokens_saved"] / s["tokens_before"] * 100
+                self._notify("caption", f"✂️ {name}: 약 {s['tokens_before']:,} → {s['tokens_after']:,} 토큰 "
+                           f"({s['tokens_saved']:,} 토큰, {pct:.0f}% 절감)")
+
+    def _attach_source_spans(self, payload: dict, transcripts):
+        """압축문 기준 source_quote를 원문 파일/구간(source_file, source_span)으로 복원"""
+        for it in (payload or {}).get("키워드 기반 소재", []):
+            if not isinstance(it, dict):
+                continue
+            for name, t in transcripts:
+                span = t.locate(it.get("source_quote", ""))
+                if span:
+                    it["source_file"] = name
+                    it["source_span"] = list(span)
+                    break
+
+    # ───────────────────────────── 긴 인터뷰: 청크 맵리듀스 ─────────────────────────────
+    def _split_into_chunks(self, text: str, size: int, overlap: int) -> list:
+        """줄바꿈 경계를 우선해 text를 size자 이하, overlap자씩 겹치는 청크로 분할"""
+        if len(text) <= size:
+            return [text]
+        chunks, start = [], 0
+        while start < len(text):
+            end = min(start + size, len(text))
+            if end < len(text):
+                cut = text.rfind("\n", start + size // 2, end)
+                if cut > start:
+                    end = cut
+            chunks.append(text[start:end])
+            if end >= len(text):
+                break
+            nxt = max(end - overlap, start + 1)
+            nl = text.rfind("\n", max(start + 1, nxt - overlap), nxt)
+            start = nl + 1 if nl != -1 else nxt
+        return chunks
+
+    async def _analyze_keywords_chunked(self, documents, use_cache: bool = True, on_item=None) -> dict:
+        """파일별 청크를 공용 동시성 상한 안에서 동시에 분석하고 결과를 병합·중복 제거"""
+        chunk_tokens = TOKEN_CONFIG.get("chunk_tokens", 9000)
+        overlap = FILE_CONFIG.get("chunk_overlap_chars", 800)
+        chunks = []
+        for name, text in documents:
+            # 청크 크기(토큰)를 파일의 글자/토큰 비율로 글자 수로 환산
+            size = chars_for_tokens(text, chunk_tokens, model_router.primary_model("analysis"))
+            parts = self._split_into_chunks(text, size, overlap)
+            for i, part in enumerate(parts, 1):
+                label = name or "인터뷰"
+                header = f"=== {label} ({i}/{len(parts)}) ===" if len(parts) > 1 else f"=== {label} ==="
+                chunks.append(f"{header}\n{part}")
+
+        self._notify("info", f"📚 긴 인터뷰를 {len(chunks)}개 구간으로 나눠 분석합니다.")
+
+        results = await asyncio.gather(
+            *(self._analyze_keywords_for_bgn(c, use_cache, on_item) for c in chunks), return_exceptions=True)
+        payloads = [r for r in results if not isinstance(r, BaseException)]
+        errors = [r for r in results if isinstance(r, BaseException)]
+
+        if not payloads:
+            raise errors[0]
+        if errors:
+            self._notify("warning", f"⚠️ {len(errors)}개 구간 분석 실패 → 나머지 {len(payloads)}개 구간 결과로 진행")
+        return self._merge_keyword_payloads(payloads)
+
+    def _merge_keyword_payloads(self, payloads: list) -> dict:
+        """청크별 결과 병합: 제목 또는 근거 문장이 같으면(겹침 구간) 하나만 남김"""
+        def norm(s):
+            return re.sub(r"[\W_]+", "", str(s or "")).lower()
+
+        merged, seen = [], set()
+        for payload in payloads:
+            for it in (payload or {}).get("키워드 기반 소재", []):
+                if not isinstance(it, dict):
+                    continue
+                keys = {k for k in (norm(it.get("title")), norm(it.get("source_quote"))) if k}
+                if keys & seen:
+                    continue
+                seen |= keys
+                merged.append(it)
+        return {"키워드 기반 소재": merged}
+
+    def _dedupe_materials(self, items: list) -> list:
+        """거의 같은 소재(여러 파일·청크에서 반복된 일화)는 하나만 남기고, 이미 발행한 소재와 겹치면 표시"""
+        if not DEDUP_CONFIG.get("enabled", True):
+            return items
+        items, dropped = collapse_near_duplicates(items)
+        if dropped:
+            self._notify("caption", f"🧬 거의 같은 소재 {dropped}개를 하나로 합쳤습니다.")
+        if DEDUP_CONFIG.get("check_published", True):
+            flagged = flag_published_overlap(items)
+            if flagged:
+                self._notify("caption", f"📰 이미 발행한 글과 겹치는 소재 {flagged}개를 표시했습니다.")
+        return items
 
     def _validate_bgn_keyword_materials(self, materials: dict) -> dict:
+        """필수 필드·분량 검사 후 evidence_span 검증. 구간이 틀리면 버리지 않고 content에서 인용문을 다시 찾아 복구
+        유효 소재는 중복 제거까지 거친 뒤 4개 미만이면 샘플 소재로 대체"""
         out = {"키워드 기반 소재": []}
         items = (materials or {}).get("키워드 기반 소재", [])
-        for it in items:
-            req = ["title","content","keywords","usage_point","staff_perspective","source_quote","evidence_span"]
-            if not all(k in it for k in req):
-                continue
-            c = it.get("content","")
-            q = it.get("source_quote","")
-            span = it.get("evidence_span", [])
-            if len(c) < 120 or len(it.get("keywords",[])) < 4:
-                continue
-            if q not in c:
-                continue
-            if (not isinstance(span, list)) or len(span) != 2:
-                continue
-            s, e = span
-            if not (isinstance(s,int) and isinstance(e,int)): 
-                continue
-            if not (0 <= s < e <= len(c)):
-                continue
-            if c[s:e] != q:
-                continue
-            out["키워드 기반 소재"].append(it)
+        stats = {"total": 0, "valid": 0, "repaired": 0, "dropped": 0, "drop_reasons": {}}
 
+        for it in items:
+            stats["total"] += 1
+            status = self._check_material_item(it)
+            if status in ("valid", "repaired"):
+                stats[status] += 1
+                out["키워드 기반 소재"].append(it)
+            else:
+                stats["dropped"] += 1
+                stats["drop_reasons"][status] = stats["drop_reasons"].get(status, 0) + 1
+
+        self.last_validation_stats = stats
+        if stats["repaired"] or stats["dropped"]:
+            total = max(1, stats["total"])
+            self._notify("caption", f"🩹 근거 구간 검증: {stats['total']}개 중 복구 {stats['repaired']}개"
+                                    f"({stats['repaired'] / total:.0%}), 제외 {stats['dropped']}개({stats['dropped'] / total:.0%})")
+
+        # 중복 제거 뒤에 최소 개수를 따져야 거의 같은 소재만 남은 결과도 샘플로 보강됨
+        out["키워드 기반 소재"] = self._dedupe_materials(out["키워드 기반 소재"])
         if len(out["키워드 기반 소재"]) < 4:
-            st.warning("⚠️ 유효 소재 부족 → 샘플 보강")
+            self._notify("warning", "⚠️ 유효 소재 부족 → 샘플 보강")
             out = self._get_bgn_keyword_fallback_materials()
         return out
 
-    def _categorize_bgn_materials(self, items: list) -> dict:
-        out = {k: [] for k in CONTENT_TYPES}
-
-        def put(cat, it): out[cat].append(it)
+    def _check_material_item(self, it) -> str:
+        """소재 1개 검사: "valid" / "repaired"(evidence_span 재계산) / 그 외는 제외 사유"""
+        req = ["title","content","keywords","usage_point","staff_perspective","source_quote"]
+        if not isinstance(it, dict) or not all(k in it for k in req):
+            return "필수 필드 누락"
+        c = it.get("content","")
+        q = it.get("source_quote","")
+        if len(c) < 120 or len(it.get("keywords",[])) < 4:
+            return "분량/키워드 부족"
+        span = it.get("evidence_span")
+        if (isinstance(span, list) and len(span) == 2 and all(isinstance(x, int) for x in span)
+                and 0 <= span[0] < span[1] <= len(c) and q and c[span[0]:span[1]] == q):
+            return "valid"
+        found = _locate_quote(c, q)
+        if found is None:
+            return "인용문 없음"
+        s, e = found
+        it["evidence_span"] = [s, e]
+        it["source_quote"] = c[s:e]   # 공백/따옴표 차이가 있었다면 content 기준 문자열로 교정
+        return "repaired"
 
-        for it in items:
-            text = f"{it.get('title','')} {it.get('content','')} {', '.join(it.get('keywords', []))}".lower()
-            role = (it.get("staff_perspective") or "").lower()
-            audience = (it.get("target_audience") or "")
-
-            if any(k in text for k in ["수술","회복","후기","변화","감동","울컥"]) or "예비 환자" in audience:
-                put("BGN 환자 에피소드형", it); continue
-            if any(k in text for k in ["검사","장비","과정","측정","결과","프로세스","진단"]):
-                put("BGN 검사·과정형", it); continue
-            if any(k in text for k in ["운영","분위기","대기시간","예약","서비스","시스템","원무"]) or "원무" in role:
-                put("BGN 센터 운영/분위기형", it); continue
-            if any(k in text for k in ["신입","멘토","멘토링","교육","배움","첫 수술","성장"]) or "신입" in role:
-                put("BGN 직원 성장기형", it); continue
-            if any(k in text for k in ["질문","언제","가능","방법","주의","faq","자주 묻는"]):
-                put("BGN 환자 질문 FAQ형", it); continue
-
-            put("BGN 환자 에피소드형", it)
-        return out
+    def _categorize_bgn_materials(self, items: list) -> dict:
+        """config.CATEGORY_RULES 기반 점수 분류 (utils/categorizer)"""
+        return categorize_materials(items)
 
     def _get_bgn_keyword_fallback_materials(self):
         """샘플 소재 반환"""
@@ -188,8 +510,8 @@ class AIAnalyzer:
         }
 
     # 구버전 호환
-    def analyze_interview_content(self, content: str):
-        return self.analyze_interview_content_keyword_based(content)
+    async def analyze_interview_content(self, content: str):
+        return await self.analyze_interview_content_keyword_based(content)
 
     # ───────────────────────────────── 블로그 초안 ─────────────────────────────────
     def _infer_role_name_from_filename(self, filename: str):
@@ -203,10 +525,19 @@ class AIAnalyzer:
             pass
         return None, None
 
-    def generate_blog_content_bgn_style(
+    async def generate_blog_content_bgn_style(
         self, selected_material, style, length, additional_request, bgn_style_params,
-        *, source_filename=None, temperature=0.9, top_p=0.9,
+        *, source_filename=None, temperature=0.9, top_p=0.9, use_cache=True, on_delta=None, candidates=None,
     ):
+        """아웃라인 → 초안 → (분량 미달 시) 보강. use_cache=False면 캐시를 건너뛰고 새로 샘플링
+
+        on_delta(stage, text): 단계("outline"/"draft"/"style")별 스트리밍 조각 콜백 (루프 스레드에서 호출됨)
+        candidates: 2 이상이면 한 요청으로 초안 후보를 여러 개 받아 로컬에서 순위를 매기고 1위를 반환
+                    (전체 순위는 last_candidates, 섹션 병렬 작성은 사용하지 않음)
+        """
+        def stage(name):
+            return (lambda text: on_delta(name, text)) if on_delta else None
+
         material = selected_material["data"]
         staff_role = bgn_style_params.get("staff_role", "검안사")
         staff_name = bgn_style_params.get("staff_name", "김서연")
@@ -217,41 +548,44 @@ class AIAnalyzer:
             if n: staff_name = n
 
         cfg = QUALITY_CONFIG.get(length, {"min_chars": 2000, "target_chars": 2200, "max_tokens": 4500})
-        if len(material.get("content","")) > 8000:
-            material["content"] = material["content"][:8000]
-
-        outline = self._make_outline(material, style, staff_role, staff_name, cfg["min_chars"], additional_request, temperature, top_p)
-        draft = self._draft_from_outline(outline, material, cfg["target_chars"], staff_role, staff_name, temperature, top_p, cfg["max_tokens"])
+        material["content"] = trim_to_budget(
+            material.get("content", ""), TOKEN_CONFIG.get("material_tokens", 5000), model_router.primary_model("draft"))
+
+        self.last_candidates = []
+        candidates = BLOG_CONFIG.get("candidates", 1) if candidates is None else candidates
+        outline = await self._make_outline(material, style, staff_role, staff_name, cfg["min_chars"], additional_request, temperature, top_p, use_cache, stage("outline"))
+        if candidates > 1:
+            drafts = await self._draft_from_outline(outline, material, cfg["target_chars"], staff_role, staff_name, temperature, top_p, cfg["max_tokens"], use_cache, stage("draft"), n=candidates)
+            ranked = get_style_scorer().rank(drafts, cfg["min_chars"], cfg["target_chars"])
+            best = ranked[0]
+            self._notify("caption", f"🗂️ 초안 후보 {len(ranked)}개 중 {best['index'] + 1}번(스타일 {best['score']:.1f}, {best['chars']:,}자)을 골랐습니다.")
+            self.last_candidates = ranked
+            draft = best["text"]
+        elif BLOG_CONFIG.get("section_parallel", True) and len(outline.get("h2_sections") or []) >= 2:
+            draft = await self._draft_sections_parallel(outline, material, cfg["target_chars"], staff_role, staff_name, temperature, top_p, cfg["max_tokens"], use_cache, stage("draft"))
+        else:
+            draft = await self._draft_from_outline(outline, material, cfg["target_chars"], staff_role, staff_name, temperature, top_p, cfg["max_tokens"], use_cache, stage("draft"))
         if len(draft) < cfg["min_chars"]:
             shortage = cfg["min_chars"] - len(draft)
-            draft = self._style_pass(draft, staff_role, staff_name, shortage, min(temperature,0.8), top_p, cfg["max_tokens"])
+            draft = await self._fill_gaps(draft, staff_role, staff_name, shortage, min(temperature,0.8), top_p, cfg["max_tokens"], use_cache, stage("style"))
+            if self.last_candidates:
+                self.last_candidates[0] = {**self.last_candidates[0], **get_style_scorer().candidate(draft, cfg["min_chars"])}
         return draft
 
-    def _make_outline(self, material, style, staff_role, staff_name, min_chars, additional_request, temperature, top_p):
-        prompt = f"""
-다음 내용을 바탕으로 블로그 아웃라인을 작성하세요.
-- 병원: BGN밝은눈안과(잠실점)
-- 화자: {staff_role} {staff_name} (1인칭)
-- 글 최소 분량: {min_chars}자 이상
-- 분위기: 따뜻함과 전문성, 과장/권유 금지
-- 스타일: {style}
-- 소재 제목: {material.get('title','')}
-- 핵심 내용: {material.get('content','')}
-- 활용 포인트: {material.get('usage_point','')}
-- 추가 요청: {additional_request or '없음'}
-
-요청: H2/H3 헤딩 구조의 JSON만 출력.
-필드: title, h2_sections[{{"h2": str, "bullets": [str], "h3": [str]}}]
-"""
-        res = self.client.chat.completions.create(
-            model=self.config["model"],
-            messages=[{"role": "system","content":"간결한 편집자. JSON만 출력."},{"role":"user","content":prompt}],
-            temperature=temperature, top_p=top_p, max_tokens=1200,
-        ).choices[0].message.content
+    async def _make_outline(self, material, style, staff_role, staff_name, min_chars, additional_request, temperature, top_p, use_cache=True, on_delta=None):
+        messages = prompts.render(
+            "blog_outline", staff_role=staff_role, staff_name=staff_name, min_chars=min_chars, style=style,
+            title=material.get("title", ""), content=material.get("content", ""),
+            usage_point=material.get("usage_point", ""), additional_request=additional_request or "없음",
+        )
         try:
-            start, end = res.find("{"), res.rfind("}") + 1
-            return json.loads(res[start:end])
-        except Exception:
+            return await self._chat_json(
+                "blog_outline", messages, stage="outline", temperature=temperature, top_p=top_p,
+                max_tokens=plan_max_tokens(model_router.primary_model("outline"), messages, TOKEN_CONFIG.get("outline_output_tokens", 1200)),
+                use_cache=use_cache, on_delta=on_delta,
+            )
+        except schemas.SchemaError as e:
+            self._notify("caption", f"🧭 아웃라인 형식 오류로 기본 구성을 사용합니다: {e}")
             return {"title": material.get("title","BGN 블로그"),
                     "h2_sections":[
                         {"h2":"오늘도 이런 일이 있었어요","bullets":[],"h3":[]},
@@ -261,51 +595,307 @@ class AIAnalyzer:
                         {"h2":"마지막으로 하고 싶은 말","bullets":[],"h3":[]},
                     ]}
 
-    def _draft_from_outline(self, outline, material, target_chars, staff_role, staff_name, temperature, top_p, max_tokens):
-        import json as _json
-        prompt = f"""
-아래 JSON 아웃라인과 소재로 블로그 초안을 작성하세요.
-
-규칙:
-- 시작 멘트: "안녕하세요, BGN밝은눈안과(잠실점) {staff_role} {staff_name}입니다."
-- 1인칭 시점 유지, 과장/권유 금지, 자연스러운 구어체 허용
-- 목표 분량: 약 {target_chars}자
-- H2/H3 구조 유지
-- 인터뷰 실제 언급 내용을 중심 + 공신력 있는 일반 의학 배경설명만 보강(효능 단정/후기 금지)
-
-아웃라인 JSON:
-{_json.dumps(outline, ensure_ascii=False)}
-
-소재 요약:
-- 제목: {material.get('title','')}
-- 내용: {material.get('content','')}
-- 키워드: {', '.join(material.get('keywords', [])[:8])}
-"""
-        res = self.client.chat.completions.create(
-            model=self.config["model"],
-            messages=[{"role":"system","content":"따뜻하고 담백한 의료 콘텐츠 작가."},{"role":"user","content":prompt}],
-            temperature=temperature, top_p=top_p, max_tokens=max_tokens,
+    async def _draft_from_outline(self, outline, material, target_chars, staff_role, staff_name, temperature, top_p, max_tokens, use_cache=True, on_delta=None, n=1):
+        """아웃라인 → 초안 한 번에 작성. n>1이면 같은 요청으로 후보 n개를 받아 리스트로 반환"""
+        messages = prompts.render(
+            "blog_draft", staff_role=staff_role, staff_name=staff_name,
+            title=material.get("title", ""), content=material.get("content", ""),
+            keywords=", ".join(material.get("keywords", [])[:8]),
+            outline=json.dumps(outline, ensure_ascii=False), target_chars=target_chars,
         )
-        return res.choices[0].message.content
-
-    def _style_pass(self, text, staff_role, staff_name, shortage, temperature, top_p, max_tokens):
-        prompt = f"""
-다음 글을 BGN 톤으로 자연스럽게 보강하세요.
-- 병원: BGN밝은눈안과(잠실점)
-- 화자: {staff_role} {staff_name} 1인칭
-- 목표: 과도한 반복 없이 구체성/경험담을 추가하여 {shortage}자 이상 보강
-- 금지: 과장된 치료효과 단정, 후기형 홍보, 과도한 이모티콘
-- 유지: 기존 문장과 흐름
-
-원문:
-{text}
-"""
-        res = self.client.chat.completions.create(
-            model=self.config["model"],
-            messages=[{"role":"system","content":"세심한 카피에디터."},{"role":"user","content":prompt}],
-            temperature=temperature, top_p=top_p, max_tokens=max_tokens,
+        stop = self._length_stop(target_chars) if n == 1 else None
+        drafts = await self._chat_choices(
+            messages, n=n, stage="draft", temperature=temperature, top_p=top_p,
+            max_tokens=plan_max_tokens(model_router.primary_model("draft"), messages, max_tokens),
+            use_cache=use_cache, on_delta=on_delta, stop=stop,
         )
-        return res.choices[0].message.content
+        if n > 1:
+            return drafts
+        if stop is not None and stop.stopped_at is not None:
+            self._notify("caption", f"✂️ 목표 분량({target_chars:,}자)을 넘긴 첫 문단 경계({stop.stopped_at:,}자)에서 작성을 멈췄습니다.")
+        return self._ensure_closing(drafts[0], staff_role, staff_name, on_delta) if stop is not None else drafts[0]
+
+    def _length_stop(self, target_chars: int, closing: bool = True):
+        """초안용 분량 제어기 (BLOG_CONFIG length_stop이 꺼져 있으면 None). closing=False면 마무리 인사를 기다리지 않음"""
+        if not BLOG_CONFIG.get("length_stop", True):
+            return None
+        cfg = get_style_scorer().cfg
+        pattern = closing_pattern(cfg["outro_marker"], cfg["outro_brand"]) if closing else None
+        return LengthStop(target_chars, pattern, tail_chars=cfg.get("edge_chars", 200))
+
+    def _ensure_closing(self, text: str, staff_role, staff_name, on_delta=None) -> str:
+        """목표 분량에서 끊겨 마무리 인사가 없으면 기본 마무리 문장을 붙임 (이미 있으면 그대로)"""
+        if not text or get_style_scorer().analyze(text)["has_proper_outro"]:
+            return text
+        closing = "\n\n" + BLOG_CONFIG.get("closing_line", "").format(staff_role=staff_role, staff_name=staff_name)
+        if on_delta:
+            on_delta(closing)
+        return text.rstrip() + closing
+
+    # ───────────────────────────── 섹션 병렬 초안 ─────────────────────────────
+    def _section_targets(self, sections: list, target_chars: int) -> list:
+        """섹션별 목표 글자 수: 섹션에 target_chars가 있으면 그 값, 나머지는 남은 분량을 균등 분배"""
+        fixed = [max(200, int(sec["target_chars"])) if isinstance(sec, dict) and sec.get("target_chars") else None for sec in sections]
+        free = [i for i, t in enumerate(fixed) if t is None]
+        rest = max(0, target_chars - sum(t for t in fixed if t))
+        share = rest // len(free) if free else 0
+        return [t if t is not None else max(200, share) for t in fixed]
+
+    async def _draft_sections_parallel(self, outline, material, target_chars, staff_role, staff_name, temperature, top_p, max_tokens, use_cache=True, on_delta=None):
+        """H2 섹션을 동시에 작성하고 이어 붙인 뒤, 섹션 경계에 짧은 연결 문장을 넣음
+
+        모든 섹션 프롬프트는 같은 화자·톤 규칙과 전체 목차를 공유하고,
+        인사말은 첫 섹션만, 마무리 인사는 마지막 섹션만 쓰도록 지시
+        on_delta에는 섹션 순서대로 전달 (앞 섹션이 끝날 때까지 뒤 섹션 조각은 모아 둠)
+        """
+        sections = [sec for sec in outline.get("h2_sections", []) if isinstance(sec, dict) and sec.get("h2")]
+        targets = self._section_targets(sections, target_chars)
+        toc = "\n".join(f"{i}. {sec['h2']}" for i, sec in enumerate(sections, 1))
+        emitter = _OrderedEmitter(len(sections), on_delta, separator="\n\n") if on_delta else None
+
+        async def write(i, sec, chars):
+            if i == 0:
+                position = f'첫 섹션입니다. 헤딩 바로 다음 첫 문장은 "안녕하세요, BGN밝은눈안과(잠실점) {staff_role} {staff_name}입니다."로 쓰세요.'
+            elif i == len(sections) - 1:
+                position = "마지막 섹션입니다. 인사말 없이 시작하고, 독자에게 건네는 따뜻한 마무리 인사로 끝내세요."
+            else:
+                position = "중간 섹션입니다. 인사말과 마무리 인사 없이 이 섹션 내용만 쓰세요."
+            messages = prompts.render(
+                "blog_section", staff_role=staff_role, staff_name=staff_name,
+                post_title=outline.get("title", material.get("title", "")), toc=toc,
+                title=material.get("title", ""), content=material.get("content", ""),
+                keywords=", ".join(material.get("keywords", [])[:8]),
+                number=i + 1, h2=sec["h2"], bullets=", ".join(sec.get("bullets") or []) or "자유",
+                h3=", ".join(sec.get("h3") or []) or "없음", chars=chars, position=position,
+            )
+            desired = min(max_tokens, max(400, int(max_tokens * chars / max(1, target_chars) * 1.5)))
+            last = i == len(sections) - 1
+            stop = self._length_stop(chars, closing=last)
+            forward = (lambda d: emitter.delta(i, d)) if emitter else None
+            text = await self._chat(
+                messages, stage="draft", temperature=temperature, top_p=top_p,
+                max_tokens=plan_max_tokens(model_router.primary_model("draft"), messages, desired),
+                use_cache=use_cache, on_delta=forward, stop=stop,
+            )
+            if last and stop is not None:
+                text = self._ensure_closing(text, staff_role, staff_name, forward)
+            if emitter:
+                emitter.finish(i)
+            return text.strip()
+
+        parts = await asyncio.gather(*(write(i, sec, chars) for i, (sec, chars) in enumerate(zip(sections, targets))))
+        if BLOG_CONFIG.get("transition_pass", True):
+            parts = await self._add_transitions(parts, staff_role, staff_name, use_cache)
+        return "\n\n".join(parts)
+
+    async def _add_transitions(self, parts: list, staff_role, staff_name, use_cache=True) -> list:
+        """섹션 경계마다 1문장짜리 연결 문장만 받아 앞 섹션 끝에 덧붙임 (본문은 다시 쓰지 않음)"""
+        boundaries = []
+        for i in range(len(parts) - 1):
+            tail = parts[i].rsplit("\n\n", 1)[-1][-300:]
+            head = parts[i + 1][:300]
+            boundaries.append(f"[{i}]\n앞 섹션 끝: {tail}\n다음 섹션 시작: {head}")
+        messages = prompts.render(
+            "section_transitions", staff_role=staff_role, staff_name=staff_name,
+            boundaries="\n".join(boundaries), count=len(boundaries),
+        )
+        try:
+            res = await self._chat_json(
+                "section_transitions", messages, stage="transition", temperature=0.5,
+                max_tokens=plan_max_tokens(model_router.primary_model("transition"), messages, 60 * len(boundaries) + 50),
+                use_cache=use_cache,
+            )
+        except Exception:
+            return parts
+        bridges = res["transitions"]
+        if len(bridges) != len(boundaries):
+            return parts
+        return [part + (f"\n\n{bridges[i].strip()}" if i < len(bridges) and bridges[i].strip() else "")
+                for i, part in enumerate(parts)]
+
+    # ───────────────────────────── 분량 보강 (얇은 섹션만) ─────────────────────────────
+    def _split_sections(self, text: str) -> list:
+        """'## ' 헤딩 기준으로 분할 (첫 헤딩 앞 도입부는 첫 섹션에 포함). 이어 붙이면 원문과 같음"""
+        starts = [m.start() for m in _H2_LINE.finditer(text)] or [0]
+        starts[0] = 0
+        return [text[a:b] for a, b in zip(starts, starts[1:] + [len(text)])]
+
+    def _plan_gap_fill(self, sections: list, shortage: int) -> dict:
+        """가장 짧은 섹션부터 부족분을 나눠 맡김 → {섹션 인덱스: 추가 글자 수}"""
+        per = BLOG_CONFIG.get("gap_fill_chars_per_section", 350)
+        count = max(1, min(len(sections), -(-shortage // per)))
+        thinnest = sorted(range(len(sections)), key=lambda i: len(sections[i].strip()))[:count]
+        share = -(-int(shortage * 1.1) // count)   # 모자라지 않도록 10% 여유
+        return {i: share for i in sorted(thinnest)}
+
+    async def _fill_gaps(self, text, staff_role, staff_name, shortage, temperature, top_p, max_tokens, use_cache=True, on_delta=None):
+        """분량 미달 시 전체를 다시 쓰지 않고, 얇은 섹션에만 새 문단을 받아 끼워 넣음
+
+        섹션의 마지막 문단(연결 문장·마무리 인사) 앞에 삽입 → 추가 비용은 부족분에 비례
+        """
+        sections = self._split_sections(text)
+        plan = self._plan_gap_fill(sections, shortage)
+        emitter = _OrderedEmitter(len(plan), on_delta, separator="\n\n") if on_delta else None
+        model = model_router.primary_model("style")
+
+        async def expand(slot, i, chars):
+            section = sections[i].strip()
+            messages = prompts.render("gap_fill", staff_role=staff_role, staff_name=staff_name, section=section, chars=chars)
+            per_char = count_tokens(section, model) / max(1, len(section))
+            desired = int(chars * per_char * 1.3) + TOKEN_CONFIG.get("safety_margin", 256)
+            added = await self._chat(
+                messages, stage="style", temperature=temperature, top_p=top_p,
+                max_tokens=plan_max_tokens(model, messages, min(desired, max_tokens)),
+                use_cache=use_cache, on_delta=(lambda d: emitter.delta(slot, d)) if emitter else None,
+            )
+            if emitter:
+                emitter.finish(slot)
+            return i, added.strip()
+
+        results = await asyncio.gather(*(expand(slot, i, chars) for slot, (i, chars) in enumerate(plan.items())))
+        for i, added in results:
+            if added:
+                sections[i] = self._splice_paragraph(sections[i], added)
+        return "".join(sections)
+
+    def _splice_paragraph(self, section: str, added: str) -> str:
+        """섹션 마지막 문단 앞에 added 삽입 (문단이 하나뿐이면 끝에 추가). 섹션 뒤 공백은 유지"""
+        body = section.rstrip()
+        trailing = section[len(body):]
+        paragraphs = body.split("\n\n")
+        if len(paragraphs) > 2:   # 헤딩 + 본문 2문단 이상
+            paragraphs.insert(len(paragraphs) - 1, added)
+        else:
+            paragraphs.append(added)
+        return "\n\n".join(paragraphs) + trailing
+
+class _OrderedEmitter:
+    """동시에 생성되는 섹션 조각을 섹션 순서대로 on_delta에 전달"""
+
+    def __init__(self, count: int, on_delta, separator: str = ""):
+        self.on_delta = on_delta
+        self.separator = separator
+        self.buffers = [[] for _ in range(count)]
+        self.done = [False] * count
+        self.head = 0
+
+    def delta(self, i: int, text: str):
+        if i == self.head:
+            self.on_delta(text)
+        else:
+            self.buffers[i].append(text)
+
+    def finish(self, i: int):
+        self.done[i] = True
+        while self.head < len(self.done) and self.done[self.head]:
+            self.head += 1
+            if self.head < len(self.buffers):
+                self.on_delta(self.separator + "".join(self.buffers[self.head]))
+                self.buffers[self.head] = []
+
+class AIAnalyzer:
+    """AsyncAIAnalyzer의 동기 래퍼 (Streamlit 스크립트 스레드용)
+
+    공용 백그라운드 루프에서 실행해 결과를 기다리고, 모인 알림은 호출 스레드에서 st.*로 표시
+    """
+
+    def __init__(self, api_key: str | None = None, use_cache: bool | None = None):
+        self.async_analyzer = AsyncAIAnalyzer(api_key, use_cache)
+        self.config = self.async_analyzer.config
+
+    @property
+    def last_compression_stats(self) -> dict:
+        return self.async_analyzer.last_compression_stats
+
+    @property
+    def last_validation_stats(self) -> dict:
+        return self.async_analyzer.last_validation_stats
+
+    @property
+    def last_candidates(self) -> list:
+        return self.async_analyzer.last_candidates
+
+    def _run(self, coro):
+        try:
+            return run_sync(coro)
+        finally:
+            for level, message in self.async_analyzer.drain_notices():
+                getattr(st, level)(message)
+
+    def analyze_interview_content_keyword_based(self, content: str, use_cache: bool = True):
+        return self._run(self.async_analyzer.analyze_interview_content_keyword_based(content, use_cache))
+
+    def analyze_interview_documents(self, documents, use_cache: bool = True):
+        return self._run(self.async_analyzer.analyze_interview_documents(documents, use_cache))
+
+    def analyze_interview_content(self, content: str):
+        return self._run(self.async_analyzer.analyze_interview_content(content))
+
+    def start_interview_analysis(self, documents, use_cache: bool = True) -> "AnalysisJob":
+        """분석을 백그라운드 루프에서 시작하고 바로 반환. 완성된 소재는 job.snapshot()으로 먼저 볼 수 있음"""
+        job = AnalysisJob(self)
+        job.future = submit(self.async_analyzer.analyze_interview_documents(documents, use_cache, on_item=job.add))
+        return job
+
+    def generate_blog_content_bgn_style(self, *args, **kwargs):
+        return self._run(self.async_analyzer.generate_blog_content_bgn_style(*args, **kwargs))
+
+    def stream_blog_content_bgn_style(self, *args, **kwargs):
+        """블로그 생성을 스트리밍: ("delta", 단계, 조각) 이벤트를 생성하고 마지막에 ("done", 최종 본문)
+
+        최종 본문은 generate_blog_content_bgn_style과 같은 경로로 만들어짐 (조각은 표시용)
+        """
+        events = queue.Queue()
+        future = submit(self.async_analyzer.generate_blog_content_bgn_style(
+            *args, on_delta=lambda stage, text: events.put(("delta", stage, text)), **kwargs))
+        future.add_done_callback(lambda _: events.put(None))
+        try:
+            while (event := events.get()) is not None:
+                yield event
+            yield ("done", future.result())
+        finally:
+            for level, message in self.async_analyzer.drain_notices():
+                getattr(st, level)(message)
+
+class AnalysisJob:
+    """진행 중인 소재 분석. 스트리밍으로 완성된 소재를 카테고리별로 모아 둠
+
+    스크립트 재실행과 무관하게 백그라운드에서 계속 진행되므로 세션 상태에 보관해 두고 폴링
+    """
+
+    def __init__(self, analyzer: AIAnalyzer):
+        self.analyzer = analyzer
+        self.future = None
+        self.version = 0
+        self._items = {k: [] for k in CONTENT_TYPES}
+        self._seen = set()
+        self._near = NearDuplicateFilter() if DEDUP_CONFIG.get("enabled", True) else None
+        self._lock = threading.Lock()
+
+    def add(self, category: str, item: dict):
+        """루프 스레드에서 호출: 제목이 같거나 내용이 거의 같은 소재(청크 겹침)는 한 번만"""
+        key = re.sub(r"\s+", "", str(item.get("title", ""))).lower()
+        with self._lock:
+            if key in self._seen or (self._near is not None and self._near.is_duplicate(item)):
+                return
+            self._seen.add(key)
+            self._items.setdefault(category, []).append(item)
+            self.version += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {k: list(v) for k, v in self._items.items()}
+
+    def done(self) -> bool:
+        return self.future is not None and self.future.done()
+
+    def result(self) -> dict:
+        """최종 결과 (스크립트 스레드에서 호출: 모인 알림도 함께 표시)"""
+        try:
+            return self.future.result()
+        finally:
+            for level, message in self.analyzer.async_analyzer.drain_notices():
+                getattr(st, level)(message)
 
 # 샘플(테스트용)
 def get_sample_materials():
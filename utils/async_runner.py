@@ -0,0 +1,64 @@
+# utils/async_runner.py
+# 동기 코드(Streamlit 스크립트 스레드)에서 코루틴을 실행하기 위한 프로세스 공용 이벤트 루프
+# - 백그라운드 데몬 스레드 1개에서 루프를 계속 돌리고, run_sync()로 코루틴을 넘겨 결과를 기다림
+# - 루프별 LLM 동시 요청 세마포어(llm_semaphore)로 프로세스 전체 동시성 상한을 공유
+#
+# NOTE: 루프 스레드에는 Streamlit 스크립트 컨텍스트가 없으므로 코루틴 안에서 st.*를 호출하지 않습니다.
+import asyncio
+import threading
+import weakref
+
+try:
+    from config import OPENAI_CLIENT_CONFIG
+except Exception:
+    OPENAI_CLIENT_CONFIG = {"max_concurrent_requests": 4}
+
+_LOOP = None
+_LOOP_LOCK = threading.Lock()
+_SEMAPHORES = weakref.WeakKeyDictionary()   # 이벤트 루프 → asyncio.Semaphore
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """백그라운드 이벤트 루프 (처음 호출 시 시작)"""
+    global _LOOP
+    with _LOOP_LOCK:
+        if _LOOP is None or _LOOP.is_closed():
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def _run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            threading.Thread(target=_run, name="bgn-async-loop", daemon=True).start()
+            ready.wait()
+            _LOOP = loop
+        return _LOOP
+
+
+def submit(coro):
+    """코루틴을 백그라운드 루프에 예약하고 concurrent.futures.Future 반환 (기다리지 않음)"""
+    loop = get_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("백그라운드 루프 안에서는 submit()/run_sync() 대신 await를 사용하세요.")
+    return asyncio.run_coroutine_threadsafe(coro, loop)
+
+
+def run_sync(coro, timeout: float | None = None):
+    """코루틴을 백그라운드 루프에서 실행하고 결과(또는 예외)를 돌려줌"""
+    return submit(coro).result(timeout)
+
+
+def llm_semaphore() -> asyncio.Semaphore:
+    """현재 루프의 공용 LLM 동시 요청 세마포어"""
+    loop = asyncio.get_running_loop()
+    sem = _SEMAPHORES.get(loop)
+    if sem is None:
+        sem = _SEMAPHORES[loop] = asyncio.Semaphore(max(1, int(OPENAI_CLIENT_CONFIG.get("max_concurrent_requests", 4))))
+    return sem
@@ -0,0 +1,206 @@
+# utils/cache_store.py
+# 2단 캐시: 프로세스 내 LRU(메모리) + SQLite(디스크, 용량 상한·LRU 제거)
+# - 값은 문자열, 디스크에는 zlib 압축해 저장
+# - 선택적 TTL: 만료 항목은 조회 시 미스로 처리하고 삭제
+# - 디스크 경로를 만들 수 없는 환경(읽기 전용 FS 등)에서는 메모리 캐시로만 동작
+#
+# NOTE: 추출 엔진 워커에서도 import될 수 있으므로 streamlit을 import하지 않습니다.
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+_DEFAULTS = {
+    "dir": os.path.join(tempfile.gettempdir(), "bgn_blog_cache"),
+    "text_memory_items": 64,
+    "text_disk_max_mb": 200,
+    "llm_enabled": False,
+    "llm_memory_items": 128,
+    "llm_disk_max_mb": 100,
+    "llm_ttl_hours": 72,
+}
+
+
+def cache_settings() -> dict:
+    try:
+        from config import CACHE_CONFIG
+    except Exception:
+        CACHE_CONFIG = {}
+    return {**_DEFAULTS, **CACHE_CONFIG}
+
+
+class TieredCache:
+    def __init__(self, name: str, db_path: str | None, max_memory_items: int = 64, max_disk_bytes: int = 0,
+                 ttl_seconds: float = 0):
+        self.name = name
+        self.max_memory_items = max_memory_items
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl_seconds = ttl_seconds
+        self._mem = OrderedDict()
+        self._lock = threading.RLock()
+        self._db = None
+        self.hits = {"memory": 0, "disk": 0}
+        self.misses = 0
+        if db_path and max_disk_bytes > 0:
+            try:
+                os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+                self._db = sqlite3.connect(db_path, timeout=5, check_same_thread=False, isolation_level=None)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS entries ("
+                    " key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL,"
+                    " created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+                )
+                self._db.execute("CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries(accessed_at)")
+            except (sqlite3.Error, OSError):
+                self._db = None
+
+    # ───────────────────────────── 조회/저장 ─────────────────────────────
+    def get(self, key: str):
+        with self._lock:
+            if key in self._mem:
+                value, created_at = self._mem[key]
+                if not self._expired(created_at):
+                    self._mem.move_to_end(key)
+                    self.hits["memory"] += 1
+                    return value
+                del self._mem[key]
+            row = self._disk_get(key)
+            if row is None:
+                self.misses += 1
+                return None
+            value, created_at = row
+            self.hits["disk"] += 1
+            self._mem_put(key, value, created_at)
+            return value
+
+    def put(self, key: str, value: str):
+        with self._lock:
+            now = time.time()
+            self._mem_put(key, value, now)
+            self._disk_put(key, value, now)
+
+    def clear(self):
+        with self._lock:
+            self._mem.clear()
+            if self._db is not None:
+                try:
+                    self._db.execute("DELETE FROM entries")
+                except sqlite3.Error:
+                    pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            disk_items, disk_bytes = 0, 0
+            if self._db is not None:
+                try:
+                    disk_items, disk_bytes = self._db.execute(
+                        "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+                except sqlite3.Error:
+                    pass
+            return {
+                "memory_hits": self.hits["memory"],
+                "disk_hits": self.hits["disk"],
+                "misses": self.misses,
+                "memory_items": len(self._mem),
+                "disk_items": disk_items,
+                "disk_bytes": disk_bytes,
+            }
+
+    # ───────────────────────────── 내부 ─────────────────────────────
+    def _expired(self, created_at: float) -> bool:
+        return bool(self.ttl_seconds) and time.time() - created_at > self.ttl_seconds
+
+    def _mem_put(self, key, value, created_at):
+        self._mem[key] = (value, created_at)
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_memory_items:
+            self._mem.popitem(last=False)
+
+    def _disk_get(self, key):
+        if self._db is None:
+            return None
+        try:
+            row = self._db.execute("SELECT value, created_at FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if self._expired(row[1]):
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                return None
+            self._db.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            return zlib.decompress(row[0]).decode("utf-8"), row[1]
+        except (sqlite3.Error, zlib.error):
+            return None
+
+    def _disk_put(self, key, value, now):
+        if self._db is None:
+            return
+        blob = zlib.compress(value.encode("utf-8"))
+        if len(blob) > self.max_disk_bytes:
+            return
+        try:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now, now),
+            )
+            self._evict()
+        except sqlite3.Error:
+            pass
+
+    def _evict(self):
+        """만료 항목을 지우고, 디스크 용량 상한 초과 시 가장 오래 안 쓴 항목부터 삭제"""
+        if self.ttl_seconds:
+            self._db.execute("DELETE FROM entries WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+        excess = total - self.max_disk_bytes
+        victims, freed = [], 0
+        for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY accessed_at ASC"):
+            victims.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self._db.executemany("DELETE FROM entries WHERE key = ?", victims)
+
+
+_TEXT_CACHE = None
+_TEXT_CACHE_LOCK = threading.Lock()
+
+
+def get_text_cache() -> TieredCache:
+    """문서 추출 텍스트 캐시 (프로세스 공용, 파일 바이트 해시가 키)"""
+    global _TEXT_CACHE
+    with _TEXT_CACHE_LOCK:
+        if _TEXT_CACHE is None:
+            cfg = cache_settings()
+            _TEXT_CACHE = TieredCache(
+                "text",
+                os.path.join(cfg["dir"], "extracted_text.sqlite3") if cfg["dir"] else None,
+                max_memory_items=int(cfg["text_memory_items"]),
+                max_disk_bytes=int(float(cfg["text_disk_max_mb"]) * 1024 * 1024),
+            )
+        return _TEXT_CACHE
+
+
+_RESPONSE_CACHE = None
+_RESPONSE_CACHE_LOCK = threading.Lock()
+
+
+def get_response_cache() -> TieredCache:
+    """LLM 응답 캐시 (프로세스 공용, 모델·메시지·샘플링 파라미터 해시가 키)"""
+    global _RESPONSE_CACHE
+    with _RESPONSE_CACHE_LOCK:
+        if _RESPONSE_CACHE is None:
+            cfg = cache_settings()
+            _RESPONSE_CACHE = TieredCache(
+                "llm",
+                os.path.join(cfg["dir"], "llm_responses.sqlite3") if cfg["dir"] else None,
+                max_memory_items=int(cfg["llm_memory_items"]),
+                max_disk_bytes=int(float(cfg["llm_disk_max_mb"]) * 1024 * 1024),
+                ttl_seconds=float(cfg["llm_ttl_hours"]) * 3600,
+            )
+        return _RESPONSE_CACHE
@@ -0,0 +1,215 @@
+# utils/categorizer.py
+# 소재 → 콘텐츠 유형 자동 분류
+# - 규칙은 config.CATEGORY_RULES (CONTENT_TYPES 옆)에서 읽음
+# - 유형 점수 = 키워드 등장 횟수 × weight + 힌트(역할/독자) 등장 횟수 × hint_weight
+# - mode "scoring"(기본): 모든 유형 점수 중 최고점 유형 (동점이면 CONTENT_TYPES 순서)
+#   mode "first_match": 유형 순서대로 처음 매칭된 유형 (기존 any() 체인 규칙)
+# - 엔진은 속도만 다르고 결과는 같음
+#   automaton: 모든 패턴을 Aho-Corasick 오토마톤(C 확장 pyahocorasick) 하나로 컴파일해 한 번의 스캔
+#   → scoring 모드는 항상, first_match 모드는 패턴 수 ≥ automaton_min_patterns일 때
+#   chain: 유형별 C 부분 문자열 검색(str.count / in) — 작은 규칙의 first_match는 단락 평가로 가장 빠름
+#   pyahocorasick이 없으면 chain
+# - 무매칭이면 default
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    from config import CONTENT_TYPES, CATEGORY_RULES
+except Exception:
+    CONTENT_TYPES = [
+        "BGN 환자 에피소드형",
+        "BGN 검사·과정형",
+        "BGN 센터 운영/분위기형",
+        "BGN 직원 성장기형",
+        "BGN 환자 질문 FAQ형",
+    ]
+    CATEGORY_RULES = {
+        "default": "BGN 환자 에피소드형",
+        "hint_weight": 2.0,
+        "mode": "scoring",
+        "automaton_min_patterns": 5000,
+        "categories": {
+            "BGN 환자 에피소드형": {"keywords": ["수술", "회복", "후기", "변화", "감동", "울컥"],
+                               "audience_hints": ["예비 환자"]},
+            "BGN 검사·과정형": {"keywords": ["검사", "장비", "과정", "측정", "결과", "프로세스", "진단"]},
+            "BGN 센터 운영/분위기형": {"keywords": ["운영", "분위기", "대기시간", "예약", "서비스", "시스템", "원무"],
+                                 "role_hints": ["원무"]},
+            "BGN 직원 성장기형": {"keywords": ["신입", "멘토", "멘토링", "교육", "배움", "첫 수술", "성장"],
+                              "role_hints": ["신입"]},
+            "BGN 환자 질문 FAQ형": {"keywords": ["질문", "언제", "가능", "방법", "주의", "faq", "자주 묻는"]},
+        },
+    }
+
+# 패턴이 어느 필드에서 유효한지
+_TEXT, _ROLE, _AUDIENCE = 0, 1, 2
+_HINT_FIELDS = (("role_hints", _ROLE), ("audience_hints", _AUDIENCE))
+_MODES = ("scoring", "first_match")
+
+
+def _fields(item: dict) -> tuple:
+    text = f"{item.get('title', '')} {item.get('content', '')} {', '.join(item.get('keywords') or [])}".lower()
+    return text, (item.get("staff_perspective") or "").lower(), (item.get("target_audience") or "").lower()
+
+
+def _occurrences(text: str, pattern: str) -> int:
+    """겹치는 등장까지 센 횟수 (오토마톤과 같은 기준)"""
+    n, i = 0, text.find(pattern)
+    while i >= 0:
+        n += 1
+        i = text.find(pattern, i + 1)
+    return n
+
+
+def _counter(patterns: list):
+    """패턴 목록 → text의 등장 횟수 합을 세는 함수
+
+    자기 자신과 겹칠 수 없는 패턴(대부분)은 C의 str.count로, "ㅋㅋ"처럼 겹칠 수 있는 패턴만 _occurrences로
+    """
+    if not patterns:
+        return lambda text: 0
+    plain, tricky = [], []
+    for p in patterns:
+        (tricky if any(p[:j] == p[-j:] for j in range(1, len(p))) else plain).append(p)
+
+    def count(text: str) -> int:
+        n = sum(map(text.count, plain)) if plain else 0
+        for p in tricky:
+            n += _occurrences(text, p)
+        return n
+    return count
+
+
+class Categorizer:
+    """CATEGORY_RULES → 분류기
+
+    engine: "chain" / "automaton" / None(모드·패턴 수로 자동) — 같은 규칙이면 어느 엔진이든 분류 결과가 같음
+    """
+
+    def __init__(self, rules: dict | None = None, content_types: list | None = None, engine: str | None = None):
+        rules = rules or CATEGORY_RULES
+        self.content_types = list(content_types or CONTENT_TYPES)
+        self.default = rules.get("default") or self.content_types[0]
+        self.mode = rules.get("mode", "scoring")
+        if self.mode not in _MODES:
+            raise ValueError(f"알 수 없는 분류 방식입니다: {self.mode}")
+        self.hint_weight = float(rules.get("hint_weight", 2.0))
+        self._index = {cat: i for i, cat in enumerate(self.content_types)}
+        self._weights = [0.0] * len(self.content_types)
+
+        chain, patterns = [], []
+        for cat, rule in rules.get("categories", {}).items():
+            if cat not in self._index:
+                raise ValueError(f"CONTENT_TYPES에 없는 분류 유형입니다: {cat}")
+            i = self._index[cat]
+            self._weights[i] = float(rule.get("weight", 1.0))
+            keywords = [kw.lower() for kw in rule.get("keywords", []) if kw]
+            hints = {field: [h.lower() for h in rule.get(key, []) if h] for key, field in _HINT_FIELDS}
+            chain.append((i, keywords, hints[_ROLE], hints[_AUDIENCE],
+                          _counter(keywords), _counter(hints[_ROLE]), _counter(hints[_AUDIENCE])))
+            patterns += [(kw, _TEXT, i) for kw in keywords]
+            patterns += [(h, field, i) for field, hs in hints.items() for h in hs]
+        self._chain = sorted(chain, key=lambda c: c[0])
+
+        if engine is None:
+            large = len(patterns) >= rules.get("automaton_min_patterns", 5000)
+            engine = "automaton" if (self.mode == "scoring" or large) and ahocorasick is not None else "chain"
+        if engine not in ("chain", "automaton"):
+            raise ValueError(f"알 수 없는 분류 엔진입니다: {engine}")
+        self.engine = engine
+        self._automata = self._compile(patterns) if engine == "automaton" else None
+
+    @staticmethod
+    def _compile(patterns: list) -> dict:
+        """필드별 C 오토마톤 (같은 패턴의 유형들은 하나로 묶음)"""
+        if ahocorasick is None:
+            raise ImportError("automaton 엔진에는 pyahocorasick이 필요합니다.")
+        merged = {}
+        for pattern, field, i in patterns:
+            merged.setdefault(field, {}).setdefault(pattern, []).append(i)
+        automata = {}
+        for field, payloads in merged.items():
+            automaton = ahocorasick.Automaton()
+            for pattern, payload in payloads.items():
+                automaton.add_word(pattern, tuple(payload))
+            automaton.make_automaton()
+            automata[field] = automaton
+        return automata
+
+    def _accumulate(self, counts: list, text: str, field: int):
+        automaton = self._automata.get(field)
+        if automaton is None or not text:
+            return
+        for _, payload in automaton.iter(text):
+            for i in payload:
+                counts[i] += 1
+
+    @staticmethod
+    def _chain_hit(text, role, audience, keywords, roles, audiences) -> bool:
+        # map(str.__contains__)는 제너레이터 프레임 없이 C에서 돌아 any(k in text for k ...)보다 빠름
+        return (any(map(text.__contains__, keywords))
+                or bool(roles) and any(map(role.__contains__, roles))
+                or bool(audiences) and any(map(audience.__contains__, audiences)))
+
+    def _counts(self, item: dict) -> tuple:
+        """유형별 (키워드 등장 횟수, 힌트 등장 횟수) — 엔진마다 세는 방법만 다름"""
+        text, role, audience = _fields(item)
+        n = len(self.content_types)
+        hits, hint_hits = [0] * n, [0] * n
+        if self._automata is None:
+            for i, _, _, _, count_text, count_role, count_audience in self._chain:
+                hits[i] += count_text(text)
+                hint_hits[i] += count_role(role) + count_audience(audience)
+        else:
+            self._accumulate(hits, text, _TEXT)
+            self._accumulate(hint_hits, role, _ROLE)
+            self._accumulate(hint_hits, audience, _AUDIENCE)
+        return hits, hint_hits
+
+    def _score_list(self, item: dict) -> list:
+        hits, hint_hits = self._counts(item)
+        return [h * w + hh * self.hint_weight for h, hh, w in zip(hits, hint_hits, self._weights)]
+
+    def scores(self, item: dict) -> dict:
+        """유형별 점수 (등장 횟수 × weight, 힌트는 × hint_weight)"""
+        return dict(zip(self.content_types, self._score_list(item)))
+
+    def categorize(self, item: dict) -> str:
+        if self.mode == "first_match":
+            if self._automata is None:
+                # 단락 평가: 첫 매칭 유형에서 바로 반환
+                text, role, audience = _fields(item)
+                hit = self._chain_hit
+                for i, keywords, roles, audiences, *_ in self._chain:
+                    if hit(text, role, audience, keywords, roles, audiences):
+                        return self.content_types[i]
+                return self.default
+            hits, hint_hits = self._counts(item)
+            return next((self.content_types[i] for i, (h, hh) in enumerate(zip(hits, hint_hits)) if h or hh),
+                        self.default)
+        scores = self._score_list(item)
+        best = max(range(len(scores)), key=lambda i: (scores[i], -i))
+        return self.content_types[best] if scores[best] > 0 else self.default
+
+    def group(self, items: list) -> dict:
+        out = {k: [] for k in self.content_types}
+        for it in items:
+            out[self.categorize(it)].append(it)
+        return out
+
+
+_DEFAULT = None
+
+
+def get_categorizer() -> Categorizer:
+    """config 규칙으로 컴파일된 공용 분류기 (최초 호출 시 1회 컴파일)"""
+    global _DEFAULT
+    if _DEFAULT is None:
+        _DEFAULT = Categorizer()
+    return _DEFAULT
+
+
+def categorize_materials(items: list) -> dict:
+    """소재 목록 → {콘텐츠 유형: [소재, ...]}"""
+    return get_categorizer().group(items)
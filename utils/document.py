@@ -0,0 +1,142 @@
+# utils/document.py
+# 업로드 파일 1개에 대한 지연 로딩 래퍼
+# - preview(): 앞부분 바이트만 읽어 UTF-8 경계가 안전한 접두부만 디코딩 (미리보기용)
+# - text: 분석에 필요할 때 한 번만 전체 추출 (추출 엔진 + 바이트 해시 캐시 경유)
+# - 읽은 뒤에는 항상 파일 포인터를 되돌려 이후 read()가 비지 않도록 함
+import codecs
+import io
+from pathlib import Path
+
+from utils.docx_stream import iter_docx_text
+from utils.hwp_reader import iter_hwp_paragraphs
+from utils.extraction_engine import extract_documents, iter_pdf_pages
+
+_TEXT_EXTS = (".txt", ".md")
+_MIME_EXTS = {
+    "text/plain": ".txt",
+    "text/markdown": ".md",
+    "application/pdf": ".pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": ".docx",
+    "application/x-hwp": ".hwp",
+    "application/haansofthwp": ".hwp",
+}
+
+
+class ExtractedDocument:
+    # UTF-8 한 글자는 최대 4바이트
+    MAX_BYTES_PER_CHAR = 4
+
+    def __init__(self, file):
+        self.file = file
+        self.name = getattr(file, "name", "document")
+        self.size = getattr(file, "size", 0)
+        self.type = getattr(file, "type", "unknown")
+        ext = Path(self.name).suffix.lower()
+        self.extension = ext if ext else _MIME_EXTS.get(self.type, "")
+        self._text = None
+        self._error = None
+
+    # ───────────────────────────── 미리보기 ─────────────────────────────
+    def preview(self, max_chars: int = 300) -> str:
+        """앞 max_chars자 미리보기 (잘렸으면 '...' 부착). 전체 텍스트는 읽지 않음"""
+        if self._text is not None:
+            head, more = self._text[:max_chars], len(self._text) > max_chars
+        elif self.extension in _TEXT_EXTS:
+            head, more = self._decode_prefix(max_chars)
+        elif self.extension == ".pdf":
+            head, more = self._pdf_prefix(max_chars)
+        elif self.extension == ".docx":
+            head, more = self._stream_prefix(iter_docx_text, max_chars)
+        elif self.extension == ".hwp":
+            head, more = self._stream_prefix(iter_hwp_paragraphs, max_chars)
+        else:
+            text = self.text
+            head, more = text[:max_chars], len(text) > max_chars
+        return head + "..." if more else head
+
+    def _read_prefix(self, n: int) -> bytes:
+        self._rewind()
+        data = self.file.read(n)
+        self._rewind()
+        return data
+
+    def _decode_prefix(self, max_chars: int):
+        limit = max_chars * self.MAX_BYTES_PER_CHAR
+        raw = self._read_prefix(limit + 1)
+        complete = len(raw) <= limit
+        # 미완성 멀티바이트 문자는 final=False 디코더가 버퍼에 남겨 둠
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        text = decoder.decode(raw[:limit], final=complete)
+        return text[:max_chars], (not complete) or len(text) > max_chars
+
+    def _pdf_prefix(self, max_chars: int):
+        pages, length = [], 0
+        for page in iter_pdf_pages(self.source()):
+            if page.strip():
+                pages.append(page)
+                length += len(page) + 1
+            if length > max_chars:
+                break
+        text = "\n".join(pages)
+        return text[:max_chars], len(text) > max_chars
+
+    def _stream_prefix(self, iter_parts, max_chars: int):
+        """스트리밍 파서(DOCX/HWP)로 앞 단락만 읽고 중단 (실패 시 전체 추출 경로)"""
+        try:
+            source = self.source()
+            with (open(source, "rb") if isinstance(source, str) else io.BytesIO(source)) as f:
+                parts, length = [], 0
+                for part in iter_parts(f):
+                    if part.strip():
+                        parts.append(part)
+                        length += len(part) + 1
+                    if length > max_chars:
+                        break
+        except Exception:
+            text = self.text
+            return text[:max_chars], len(text) > max_chars
+        text = "\n".join(parts)
+        return text[:max_chars], len(text) > max_chars
+
+    # ───────────────────────────── 전체 텍스트 ─────────────────────────────
+    @property
+    def loaded(self) -> bool:
+        return self._text is not None or self._error is not None
+
+    @property
+    def text(self) -> str:
+        """전체 텍스트 (최초 접근 시 1회만 추출, 실패 시 예외)"""
+        if not self.loaded:
+            load_documents([self])
+        if self._error is not None:
+            raise self._error
+        return self._text
+
+    def source(self):
+        """추출 엔진 입력: 디스크에 스풀된 업로드면 경로, 아니면 bytes"""
+        path = getattr(self.file, "path", None)
+        return path if path else self.read_bytes()
+
+    def read_bytes(self) -> bytes:
+        self._rewind()
+        data = self.file.read()
+        self._rewind()
+        return data
+
+    def _rewind(self):
+        if hasattr(self.file, "seek"):
+            self.file.seek(0)
+
+    def _extraction_name(self) -> str:
+        return Path(self.name).with_suffix(self.extension).name if self.extension else self.name
+
+
+def load_documents(documents, on_progress=None):
+    """아직 로드되지 않은 문서들을 한 번의 배치로 추출 (PDF 페이지/DOCX 병렬, 캐시 사용)"""
+    pending = [d for d in documents if not d.loaded]
+    if not pending:
+        return documents
+    batch = [(d._extraction_name(), d.source()) for d in pending]
+    for doc, result in zip(pending, extract_documents(batch, on_progress=on_progress)):
+        doc._text, doc._error = (None, result.error) if result.error else (result.text, None)
+    return documents
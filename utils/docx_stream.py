@@ -0,0 +1,70 @@
+# utils/docx_stream.py
+# python-docx DOM을 만들지 않고 word/document.xml을 zip에서 바로 스트리밍 파싱
+# - 본문 단락과 표 셀 텍스트를 문서 순서대로 generator로 생성
+# - 처리한 요소는 즉시 비워 메모리 사용량을 문서 크기와 무관하게 유지
+# - 파싱 실패 시 호출부(extraction_engine)에서 python-docx 경로로 대체
+#
+# NOTE: 추출 엔진 워커에서 실행되므로 streamlit을 import하지 않습니다.
+import zipfile
+import xml.etree.ElementTree as ET
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_P, _T, _TAB, _BR, _CR = _W + "p", _W + "t", _W + "tab", _W + "br", _W + "cr"
+_TBL, _TC, _BODY, _PPR = _W + "tbl", _W + "tc", _W + "body", _W + "pPr"
+
+
+def iter_docx_text(source):
+    """DOCX(경로 또는 파일 객체)의 단락/표 셀 텍스트를 순서대로 생성
+
+    - 표 밖 단락: 단락 1개당 1개
+    - 표 셀: 셀 1개당 1개 (셀 안 단락은 줄바꿈으로 연결)
+    """
+    with zipfile.ZipFile(source) as zf, zf.open("word/document.xml") as xml:
+        paragraphs = []   # 작성 중인 단락 버퍼 스택 (텍스트 상자 등 중첩 단락 대응)
+        cells = []        # 작성 중인 표 셀 스택 (중첩 표 대응)
+        body = None
+        in_ppr = 0        # 단락 속성(w:pPr) 안의 w:tab은 탭 위치 정의라 텍스트가 아님
+        for event, elem in ET.iterparse(xml, events=("start", "end")):
+            tag = elem.tag
+            if event == "start":
+                if tag == _P:
+                    paragraphs.append([])
+                elif tag == _TC:
+                    cells.append([])
+                elif tag == _PPR:
+                    in_ppr += 1
+                elif tag == _BODY:
+                    body = elem
+                continue
+
+            if tag == _T:
+                if paragraphs and elem.text:
+                    paragraphs[-1].append(elem.text)
+            elif tag == _PPR:
+                in_ppr -= 1
+            elif tag == _TAB:
+                if paragraphs and not in_ppr:
+                    paragraphs[-1].append("\t")
+            elif tag in (_BR, _CR):
+                if paragraphs:
+                    paragraphs[-1].append("\n")
+            elif tag == _P:
+                text = "".join(paragraphs.pop())
+                if cells:
+                    cells[-1].append(text)
+                else:
+                    yield text
+            elif tag == _TC:
+                text = "\n".join(t for t in cells.pop() if t.strip())
+                if cells:
+                    cells[-1].append(text)
+                else:
+                    yield text
+
+            # 본문 최상위 요소는 처리 즉시 떼어내 누적을 막음
+            if body is not None and tag in (_P, _TBL) and not paragraphs and not cells:
+                elem.clear()
+                try:
+                    body.remove(elem)
+                except ValueError:
+                    pass
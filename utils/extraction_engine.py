@@ -0,0 +1,288 @@
+# utils/extraction_engine.py
+# 업로드 문서 텍스트 추출 엔진
+# - PDF는 페이지 묶음, HWP는 섹션, DOCX는 파일 단위로 프로세스 풀에 분산
+# - 결과는 항상 원래 파일/페이지 순서대로 이어붙임
+# - 작은 작업은 프로세스 기동 비용이 더 크므로 직렬로 처리
+# - 추출 결과는 파일 바이트 해시로 캐시(utils.cache_store) → 같은 파일은 다시 파싱하지 않음
+# - 입력(source)은 bytes 또는 디스크 경로(스풀된 업로드). 경로면 워커에는 경로만 전달
+#
+# NOTE: 이 모듈은 워커 프로세스에서도 import되므로 streamlit/config를
+#       모듈 최상단에서 import하지 않습니다. (설정은 _settings()에서 지연 로드)
+import hashlib
+import io
+import multiprocessing as mp
+import os
+import threading
+import zipfile
+import xml.etree.ElementTree as ET
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from utils.cache_store import get_text_cache
+from utils.docx_stream import iter_docx_text
+from utils.hwp_reader import count_hwp_sections, iter_hwp_paragraphs
+
+ExtractionResult = namedtuple("ExtractionResult", ["name", "text", "error"])
+
+_DEFAULTS = {
+    "parallel_extraction": True,
+    "extraction_workers": 0,      # 0 → CPU 수
+    "parallel_min_pages": 8,      # PDF 페이지 + DOCX 파일 수가 이보다 적으면 직렬
+    "pdf_pages_per_task": 4,
+    "hwp_sections_per_task": 1,
+    "mp_start_method": "spawn",   # 스레드가 많은 Streamlit 프로세스에서 fork는 위험
+}
+
+# 추출 로직이 바뀌면 올려서 이전 캐시를 무효화
+EXTRACTOR_VERSION = "2"   # 2: DOCX 스트리밍 파서(표 셀 포함)
+
+# 페이지/섹션 단위로 쪼개 분산하는 형식 → 작업당 단위 수 설정 키
+_SPLIT_KINDS = {"pdf": "pdf_pages_per_task", "hwp": "hwp_sections_per_task"}
+
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+
+def _settings() -> dict:
+    try:
+        from config import FILE_CONFIG
+    except Exception:
+        FILE_CONFIG = {}
+    return {k: FILE_CONFIG.get(k, v) for k, v in _DEFAULTS.items()}
+
+
+# ───────────────────────────── 형식별 추출기 (워커에서 실행) ─────────────────────────────
+def _open(source):
+    """bytes 또는 파일 경로를 바이너리 스트림으로"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    return open(source, "rb")
+
+
+def extract_plain_text(source) -> str:
+    with _open(source) as f:
+        return str(f.read(), "utf-8")
+
+
+def extract_docx_text(source) -> str:
+    """DOCX 본문+표 셀 텍스트 (스트리밍 파서 우선, 실패 시 python-docx)"""
+    try:
+        with _open(source) as f:
+            return "\n".join(t for t in iter_docx_text(f) if t.strip())
+    except (zipfile.BadZipFile, KeyError, ET.ParseError):
+        return extract_docx_text_python_docx(source)
+
+
+def extract_docx_text_python_docx(source) -> str:
+    """python-docx 전체 DOM 경로 (단락만, 표 제외) — 대체 경로 및 벤치마크 기준"""
+    import docx
+    with _open(source) as f:
+        doc = docx.Document(f)
+    return "\n".join(p.text for p in doc.paragraphs if p.text.strip())
+
+
+def count_pdf_pages(source) -> int:
+    import PyPDF2
+    with _open(source) as f:
+        return len(PyPDF2.PdfReader(f).pages)
+
+
+def iter_pdf_pages(source):
+    """페이지 텍스트를 앞에서부터 하나씩 생성 (미리보기처럼 앞부분만 필요할 때)"""
+    import PyPDF2
+    with _open(source) as f:
+        for page in PyPDF2.PdfReader(f).pages:
+            yield page.extract_text() or ""
+
+
+def extract_pdf_pages(source, start: int = 0, stop: int | None = None) -> list:
+    """[start, stop) 페이지의 텍스트를 페이지 순서대로 반환"""
+    import PyPDF2
+    with _open(source) as f:
+        reader = PyPDF2.PdfReader(f)
+        stop = len(reader.pages) if stop is None else min(stop, len(reader.pages))
+        return [(reader.pages[i].extract_text() or "") for i in range(start, stop)]
+
+
+def extract_hwp_sections(source, start: int = 0, stop: int | None = None) -> list:
+    """[start, stop) 섹션별 텍스트 (섹션 스트림을 하나씩 점진적으로 해제)"""
+    with _open(source) as f:
+        count = count_hwp_sections(f)
+        stop = count if stop is None else min(stop, count)
+        return [
+            "\n".join(t for t in iter_hwp_paragraphs(f, i, i + 1) if t.strip())
+            for i in range(start, stop)
+        ]
+
+
+def _count_units(kind: str, source) -> int:
+    """분할 가능한 형식의 작업 단위 수 (PDF 페이지 / HWP 섹션)"""
+    if kind == "pdf":
+        return count_pdf_pages(source)
+    with _open(source) as f:
+        return count_hwp_sections(f)
+
+
+def _join_pages(pages) -> str:
+    return "\n".join(t for t in pages if t.strip())
+
+
+def _file_kind(name: str) -> str:
+    ext = Path(name or "").suffix.lower()
+    if ext == ".pdf":
+        return "pdf"
+    if ext == ".docx":
+        return "docx"
+    if ext == ".hwp":
+        return "hwp"
+    if ext in (".txt", ".md"):
+        return "text"
+    raise ValueError(f"지원하지 않는 파일 형식입니다: {ext or name}")
+
+
+def text_cache_key(name: str, source) -> str:
+    """캐시 키: 형식 + 추출기 버전 + 파일 바이트 SHA-256"""
+    digest = hashlib.sha256()
+    with _open(source) as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return f"{_file_kind(name)}:{EXTRACTOR_VERSION}:{digest.hexdigest()}"
+
+
+def _run_task(kind: str, source, start: int, stop: int | None) -> list:
+    """워커 작업 단위: 항상 페이지(또는 단일 본문) 리스트를 반환"""
+    if kind == "pdf":
+        return extract_pdf_pages(source, start, stop)
+    if kind == "hwp":
+        return extract_hwp_sections(source, start, stop)
+    if kind == "docx":
+        return [extract_docx_text(source)]
+    return [extract_plain_text(source)]
+
+
+# ───────────────────────────── 프로세스 풀 ─────────────────────────────
+def _get_pool(workers: int, method: str) -> ProcessPoolExecutor:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context(method))
+        return _POOL
+
+
+def shutdown_pool():
+    """프로세스 풀 종료 (다음 호출 시 다시 생성)"""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.shutdown(wait=False, cancel_futures=True)
+            _POOL = None
+
+
+# ───────────────────────────── 공개 API ─────────────────────────────
+def extract_documents(files, on_progress=None, parallel: bool | None = None, use_cache: bool = True) -> list:
+    """(파일명, bytes 또는 경로) 목록의 텍스트를 추출해 입력 순서대로 ExtractionResult 리스트로 반환
+
+    on_progress(done_pages, total_pages, name): 페이지(또는 파일) 완료 시마다 호출
+    parallel: None이면 설정과 작업량으로 자동 결정, False면 강제 직렬
+    use_cache: 파일 바이트 해시 기반 추출 캐시 사용 여부
+    """
+    cfg = _settings()
+    cache = get_text_cache() if use_cache else None
+    files = list(files)
+    slots = [None] * len(files)       # 파일별 페이지 리스트(PDF는 페이지 인덱스별)
+    errors = [None] * len(files)
+    cached = [None] * len(files)
+    keys = [None] * len(files)
+    tasks = []                        # (file_idx, kind, start, stop, weight)
+
+    for idx, (name, data) in enumerate(files):
+        try:
+            kind = _file_kind(name)
+            if cache is not None:
+                keys[idx] = text_cache_key(name, data)
+                cached[idx] = cache.get(keys[idx])
+                if cached[idx] is not None:
+                    continue
+            if kind in _SPLIT_KINDS:
+                pages = _count_units(kind, data)
+                slots[idx] = [""] * pages
+                step = max(1, int(cfg[_SPLIT_KINDS[kind]]))
+                for s in range(0, pages, step):
+                    tasks.append((idx, kind, s, min(s + step, pages), min(step, pages - s)))
+            else:
+                slots[idx] = [""]
+                tasks.append((idx, kind, 0, None, 1))
+        except Exception as e:
+            errors[idx] = e
+
+    hits = [files[i][0] for i in range(len(files)) if cached[i] is not None]
+    total = sum(t[4] for t in tasks) + len(hits)
+    heavy = sum(t[4] for t in tasks if t[1] != "text")
+    if parallel is None:
+        parallel = bool(cfg["parallel_extraction"]) and heavy >= int(cfg["parallel_min_pages"])
+
+    done = 0
+    for name in hits:
+        done += 1
+        if on_progress:
+            on_progress(done, total, name)
+
+    finished = set()                  # 결과를 저장한 작업 (풀이 죽어도 직렬로 다시 돌리지 않음)
+
+    def _store(task, pages):
+        nonlocal done
+        idx, kind, start = task[0], task[1], task[2]
+        slots[idx][start:start + len(pages)] = pages
+        finished.add(task)
+        done += task[4]
+        if on_progress:
+            on_progress(done, total, files[idx][0])
+
+    if parallel and tasks:
+        workers = int(cfg["extraction_workers"]) or (os.cpu_count() or 2)
+        workers = max(1, min(workers, len(tasks)))
+        futures = {}
+        try:
+            pool = _get_pool(workers, cfg["mp_start_method"])
+            futures = {pool.submit(_run_task, t[1], files[t[0]][1], t[2], t[3]): t for t in tasks}
+            for f in as_completed(futures):
+                task = futures[f]
+                try:
+                    _store(task, f.result())
+                except BrokenProcessPool:
+                    raise
+                except Exception as e:
+                    errors[task[0]] = errors[task[0]] or e
+            tasks = []
+        except BrokenProcessPool:
+            # 워커가 죽으면 풀을 버리고 끝나지 않은 작업만 직렬로 처리 (진행률은 이어서)
+            shutdown_pool()
+            for f, task in futures.items():
+                # 아직 꺼내지 않았지만 이미 성공한 작업 결과는 살림
+                if task not in finished and f.done() and not f.cancelled() and f.exception() is None:
+                    _store(task, f.result())
+            tasks = [t for t in tasks if t not in finished and errors[t[0]] is None]
+
+    for task in tasks:
+        if errors[task[0]] is not None:
+            continue
+        try:
+            _store(task, _run_task(task[1], files[task[0]][1], task[2], task[3]))
+        except Exception as e:
+            errors[task[0]] = e
+
+    results = []
+    for idx, (name, _) in enumerate(files):
+        if errors[idx] is not None:
+            results.append(ExtractionResult(name, "", errors[idx]))
+            continue
+        if cached[idx] is not None:
+            text = cached[idx]
+        else:
+            text = _join_pages(slots[idx]) if _file_kind(name) in _SPLIT_KINDS else slots[idx][0]
+            if cache is not None:
+                cache.put(keys[idx], text)
+        results.append(ExtractionResult(name, text, None))
+    return results
@@ -1,5 +1,8 @@
 import streamlit as st
 from pathlib import Path
+from utils.extraction_engine import extract_documents
+from utils.document import ExtractedDocument, load_documents
+from utils.upload_store import UploadStore
 
 def process_uploaded_file(uploaded_file):
     """업로드된 파일을 처리하여 텍스트 내용 반환"""
@@ -9,10 +12,9 @@ def process_uploaded_file(uploaded_file):
     file_extension = Path(file_name).suffix.lower()
     
     try:
-        if file_type == "text/plain" or file_extension == ".txt":
-            # 텍스트 파일 처리
-            content = str(uploaded_file.read(), "utf-8")
-            return content
+        if file_type == "text/plain" or file_extension in (".txt", ".md"):
+            # 텍스트 파일 처리 (바이트 해시 캐시 경유)
+            return _extract_single(uploaded_file, ".txt")
             
         elif file_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document" or file_extension == ".docx":
             # DOCX 파일 처리
@@ -23,9 +25,8 @@ def process_uploaded_file(uploaded_file):
             return process_pdf_file(uploaded_file)
             
         elif file_extension == ".hwp":
-            # HWP 파일 처리 (추후 구현)
-            st.warning("HWP 파일은 현재 개발 중입니다. 텍스트나 DOCX 파일을 사용해주세요.")
-            return "HWP 파일 처리는 추후 지원 예정입니다."
+            # HWP 5.x 파일 처리 (OLE 섹션 스트리밍, 바이트 해시 캐시 경유)
+            return _extract_single(uploaded_file, ".hwp")
             
         else:
             raise ValueError(f"지원하지 않는 파일 형식입니다: {file_type}")
@@ -44,24 +45,16 @@ def process_docx_file(uploaded_file):
             st.info("💡 **해결 방법**: 텍스트(.txt) 파일로 변환하거나 내용을 직접 입력해주세요.")
             return "DOCX 파일 처리 라이브러리가 없습니다. 텍스트 파일을 사용하거나 내용을 직접 입력해주세요."
         
-        # 파일을 메모리에서 직접 처리
-        doc = docx.Document(uploaded_file)
-        
-        # 모든 단락의 텍스트 추출
-        full_text = []
-        for paragraph in doc.paragraphs:
-            if paragraph.text.strip():  # 빈 줄이 아닌 경우만
-                full_text.append(paragraph.text)
-        
-        return "\n".join(full_text)
+        # 파일을 메모리에서 직접 처리 (빈 단락 제외, 바이트 해시 캐시 경유)
+        return _extract_single(uploaded_file, ".docx")
         
     except Exception as e:
         st.error(f"DOCX 파일 처리 실패: {str(e)}")
         st.info("💡 **대안**: 파일 내용을 복사해서 직접 입력하거나 .txt 파일로 저장해서 업로드해주세요.")
         raise Exception(f"DOCX 파일 처리 실패: {str(e)}")
 
-def process_pdf_file(uploaded_file):
-    """PDF 파일에서 텍스트 추출 (조건부 import)"""
+def process_pdf_file(uploaded_file, on_progress=None):
+    """PDF 파일에서 텍스트 추출 (조건부 import, 페이지가 많으면 프로세스 병렬)"""
     try:
         # 조건부 import - 라이브러리가 없어도 오류 없이 처리
         try:
@@ -71,24 +64,73 @@ def process_pdf_file(uploaded_file):
             st.info("💡 **해결 방법**: PDF 내용을 복사해서 직접 입력하거나 .txt 파일로 변환해주세요.")
             return "PDF 파일 처리 라이브러리가 없습니다. 텍스트 파일을 사용하거나 내용을 직접 입력해주세요."
         
-        # PDF 리더 생성
-        pdf_reader = PyPDF2.PdfReader(uploaded_file)
-        
-        # 모든 페이지의 텍스트 추출
-        full_text = []
-        for page_num in range(len(pdf_reader.pages)):
-            page = pdf_reader.pages[page_num]
-            text = page.extract_text()
-            if text.strip():  # 빈 페이지가 아닌 경우만
-                full_text.append(text)
-        
-        return "\n".join(full_text)
+        # 페이지 순서를 유지하며 추출 (빈 페이지 제외, 바이트 해시 캐시 경유)
+        return _extract_single(uploaded_file, ".pdf", on_progress=on_progress)
         
     except Exception as e:
         st.error(f"PDF 파일 처리 실패: {str(e)}")
         st.info("💡 **대안**: PDF 내용을 복사해서 직접 입력해주세요.")
         raise Exception(f"PDF 파일 처리 실패: {str(e)}")
 
+def _extract_single(uploaded_file, extension, on_progress=None):
+    """단일 파일을 추출 엔진으로 처리 (MIME으로만 판별된 경우를 위해 확장자 보정)"""
+    if hasattr(uploaded_file, "seek"):
+        uploaded_file.seek(0)
+    name = Path(uploaded_file.name).with_suffix(extension).name
+    result = extract_documents([(name, uploaded_file.read())], on_progress=on_progress)[0]
+    if result.error:
+        raise result.error
+    return result.text
+
+def get_upload_store():
+    """세션별 업로드 스풀 저장소 (세션 상태가 해제되면 임시 폴더도 삭제됨)"""
+    if "upload_store" not in st.session_state:
+        st.session_state.upload_store = UploadStore()
+    return st.session_state.upload_store
+
+def spool_uploaded_files(uploaded_files):
+    """업로드 파일을 디스크로 옮기고 세션에 둘 가벼운 핸들 목록 반환"""
+    store = get_upload_store()
+    return [store.spool(f) for f in uploaded_files]
+
+def remove_uploaded_file(handle):
+    """세션 목록과 스풀 폴더에서 업로드 파일 제거"""
+    st.session_state.uploaded_files = [f for f in st.session_state.uploaded_files if f is not handle]
+    if hasattr(handle, "path"):
+        get_upload_store().remove(handle)
+
+def get_documents(uploaded_files):
+    """업로드 파일 → ExtractedDocument 목록 (세션에 보관해 rerun 사이에도 한 번만 로드)"""
+    cache = st.session_state.setdefault("documents", {})
+    documents = []
+    for f in uploaded_files:
+        key = getattr(f, "file_id", None) or (f.name, getattr(f, "size", 0))
+        doc = cache.get(key)
+        if doc is None:
+            doc = cache[key] = ExtractedDocument(f)
+        else:
+            doc.file = f
+        documents.append(doc)
+    # 목록에서 빠진 파일의 문서는 정리
+    live = {getattr(f, "file_id", None) or (f.name, getattr(f, "size", 0)) for f in uploaded_files}
+    for key in [k for k in cache if k not in live]:
+        del cache[key]
+    return documents
+
+def process_uploaded_files(uploaded_files, on_progress=None):
+    """여러 업로드 파일을 한 번에 추출 → [(파일명, 텍스트)] (실패 파일은 경고 후 제외)
+
+    PDF 페이지와 DOCX 파일을 프로세스 풀로 분산하고, 작업량이 적으면 직렬로 처리합니다.
+    on_progress(done, total, name)로 페이지 단위 진행률을 받을 수 있습니다.
+    """
+    documents = []
+    for doc in load_documents(get_documents(uploaded_files), on_progress=on_progress):
+        try:
+            documents.append((doc.name, doc.text))
+        except Exception as e:
+            st.warning(f"{doc.name} 읽기 실패: {str(e)}")
+    return documents
+
 def validate_file_size(uploaded_file, max_size_mb=10):
     """파일 크기 검증"""
     file_size_mb = uploaded_file.size / (1024 * 1024)
@@ -0,0 +1,242 @@
+# utils/hwp_reader.py
+# HWP 5.x 텍스트 추출 (외부 라이브러리 없음)
+# - OLE 복합 문서(CFB)를 직접 읽어 BodyText/Section* 스트림을 섹터 단위로 스트리밍
+# - 섹션마다 zlib(raw deflate)을 점진적으로 풀면서 레코드를 파싱, 단락 텍스트를 generator로 생성
+# - 한 번에 메모리에 올리는 것은 FAT/디렉터리와 현재 섹션의 해제 버퍼뿐
+#
+# NOTE: 추출 엔진 워커에서 실행되므로 streamlit을 import하지 않습니다.
+import struct
+import zlib
+
+_CFB_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+_HWP_SIGNATURE = b"HWP Document File"
+_ENDOFCHAIN = 0xFFFFFFFE
+_NOSTREAM = 0xFFFFFFFF
+_MAXREGSECT = 0xFFFFFFFA
+
+_HWPTAG_PARA_TEXT = 0x10 + 51
+
+# PARA_TEXT 제어 문자: 1글자짜리(char)를 제외한 나머지는 8 WCHAR(16바이트)를 차지
+_CHAR_CONTROLS = {0, 10, 13, 24, 25, 26, 27, 28, 29, 30, 31}
+_CONTROL_TEXT = {9: "\t", 10: "\n", 24: "-", 30: " ", 31: " "}
+
+
+class HwpError(ValueError):
+    pass
+
+
+# ───────────────────────────── OLE 복합 문서 ─────────────────────────────
+class CompoundFile:
+    """읽기 전용 CFB 리더. 스트림 내용은 필요할 때 섹터 단위로만 읽음"""
+
+    def __init__(self, fp):
+        self.fp = fp
+        header = self._read_at(0, 512)
+        if header[:8] != _CFB_SIGNATURE:
+            raise HwpError("HWP 5.x(OLE) 형식이 아닙니다.")
+        self.sector_size = 1 << struct.unpack_from("<H", header, 0x1E)[0]
+        self.mini_sector_size = 1 << struct.unpack_from("<H", header, 0x20)[0]
+        (fat_count, dir_start, _, self.mini_cutoff, minifat_start, minifat_count,
+         difat_start, difat_count) = struct.unpack_from("<IIIIIIII", header, 0x2C)
+        self.fat = self._load_fat(header, fat_count, difat_start, difat_count)
+        self.minifat = self._load_chain_array(minifat_start) if minifat_count else []
+        self.entries = self._load_directory(dir_start)
+        root = self.entries[0]
+        self._mini_stream_start = root["start"]
+        self.paths = {}
+        self._index(root["child"], "")
+
+    # 섹터/체인 ------------------------------------------------------------
+    def _read_at(self, offset: int, size: int) -> bytes:
+        self.fp.seek(offset)
+        return self.fp.read(size)
+
+    def _sector(self, sid: int) -> bytes:
+        return self._read_at((sid + 1) * self.sector_size, self.sector_size)
+
+    def _chain(self, start: int, table: list):
+        seen = 0
+        sid = start
+        while sid <= _MAXREGSECT and sid < len(table):
+            yield sid
+            sid = table[sid]
+            seen += 1
+            if seen > len(table):
+                raise HwpError("손상된 OLE 섹터 체인입니다.")
+
+    def _load_fat(self, header, fat_count, difat_start, difat_count) -> list:
+        sids = list(struct.unpack_from("<109I", header, 0x4C))
+        per = self.sector_size // 4
+        sid = difat_start
+        for _ in range(difat_count):
+            if sid > _MAXREGSECT:
+                break
+            values = struct.unpack(f"<{per}I", self._sector(sid))
+            sids.extend(values[:-1])
+            sid = values[-1]
+        fat = []
+        for sid in sids[:fat_count]:
+            fat.extend(struct.unpack(f"<{per}I", self._sector(sid)))
+        return fat
+
+    def _load_chain_array(self, start: int) -> list:
+        per = self.sector_size // 4
+        out = []
+        for sid in self._chain(start, self.fat):
+            out.extend(struct.unpack(f"<{per}I", self._sector(sid)))
+        return out
+
+    def _load_directory(self, start: int) -> list:
+        entries = []
+        for sid in self._chain(start, self.fat):
+            data = self._sector(sid)
+            for off in range(0, len(data), 128):
+                raw = data[off:off + 128]
+                name_len = struct.unpack_from("<H", raw, 64)[0]
+                left, right, child = struct.unpack_from("<III", raw, 68)
+                start_sid, size = struct.unpack_from("<IQ", raw, 116)
+                if self.sector_size == 512:
+                    size &= 0xFFFFFFFF   # v3: 상위 4바이트는 무시
+                entries.append({
+                    "name": raw[:max(0, name_len - 2)].decode("utf-16-le", "replace"),
+                    "type": raw[66], "left": left, "right": right, "child": child,
+                    "start": start_sid, "size": size,
+                })
+        return entries
+
+    def _index(self, eid: int, prefix: str):
+        """디렉터리 레드블랙 트리를 순회해 '저장소/스트림' 경로 → 엔트리 색인"""
+        stack = [eid]
+        while stack:
+            eid = stack.pop()
+            if eid == _NOSTREAM or eid >= len(self.entries):
+                continue
+            e = self.entries[eid]
+            stack.extend((e["left"], e["right"]))
+            path = f"{prefix}{e['name']}"
+            self.paths[path] = e
+            if e["type"] == 1:   # storage
+                self._index(e["child"], path + "/")
+
+    # 스트림 --------------------------------------------------------------
+    def exists(self, path: str) -> bool:
+        return path in self.paths
+
+    def iter_stream(self, path: str):
+        """스트림 내용을 섹터(또는 미니 섹터) 크기 조각으로 생성"""
+        e = self.paths.get(path)
+        if e is None or e["type"] != 2:
+            raise HwpError(f"OLE 스트림이 없습니다: {path}")
+        remaining = e["size"]
+        if remaining < self.mini_cutoff:
+            mini_sids = list(self._chain(self._mini_stream_start, self.fat))
+            per = self.sector_size // self.mini_sector_size
+            for msid in self._chain(e["start"], self.minifat):
+                if remaining <= 0:
+                    break
+                sid = mini_sids[msid // per]
+                offset = (sid + 1) * self.sector_size + (msid % per) * self.mini_sector_size
+                chunk = self._read_at(offset, min(self.mini_sector_size, remaining))
+                remaining -= len(chunk)
+                yield chunk
+        else:
+            for sid in self._chain(e["start"], self.fat):
+                if remaining <= 0:
+                    break
+                chunk = self._sector(sid)[:remaining]
+                remaining -= len(chunk)
+                yield chunk
+
+    def read_stream(self, path: str) -> bytes:
+        return b"".join(self.iter_stream(path))
+
+
+# ───────────────────────────── HWP 레코드 ─────────────────────────────
+def _open_hwp(fp):
+    cf = CompoundFile(fp)
+    if not cf.exists("FileHeader"):
+        raise HwpError("HWP 파일 헤더가 없습니다.")
+    header = cf.read_stream("FileHeader")
+    if not header.startswith(_HWP_SIGNATURE):
+        raise HwpError("HWP 5.x 문서가 아닙니다.")
+    props = struct.unpack_from("<I", header, 36)[0]
+    if props & 0x2:
+        raise HwpError("암호가 설정된 HWP 문서는 지원하지 않습니다.")
+    if props & 0x4:
+        raise HwpError("배포용 HWP 문서는 지원하지 않습니다.")
+    return cf, bool(props & 0x1)
+
+
+def _section_paths(cf: CompoundFile) -> list:
+    sections = [p for p in cf.paths if p.startswith("BodyText/Section")]
+    return sorted(sections, key=lambda p: int(p[len("BodyText/Section"):] or 0))
+
+
+def _inflate(chunks, compressed: bool):
+    """섹션 스트림 조각 → 해제된 조각 (마지막에 inflater에 남은 바이트까지)"""
+    if not compressed:
+        yield from chunks
+        return
+    inflater = zlib.decompressobj(-15)
+    for chunk in chunks:
+        yield inflater.decompress(chunk)
+    yield inflater.flush()
+
+
+def _iter_records(chunks, compressed: bool):
+    """섹션 스트림 조각을 점진적으로 해제하며 (tag, payload) 레코드 생성"""
+    buf = bytearray()
+    pos = 0
+    for data in _inflate(chunks, compressed):
+        buf += data
+        while True:
+            if len(buf) - pos < 4:
+                break
+            head = struct.unpack_from("<I", buf, pos)[0]
+            tag, size, hlen = head & 0x3FF, (head >> 20) & 0xFFF, 4
+            if size == 0xFFF:
+                if len(buf) - pos < 8:
+                    break
+                size, hlen = struct.unpack_from("<I", buf, pos + 4)[0], 8
+            if len(buf) - pos < hlen + size:
+                break
+            yield tag, bytes(buf[pos + hlen:pos + hlen + size])
+            pos += hlen + size
+        if pos:
+            del buf[:pos]
+            pos = 0
+
+
+def _para_text(payload: bytes) -> str:
+    """PARA_TEXT 레코드(UTF-16LE) → 문자열 (제어 문자 처리)"""
+    out = []
+    n = len(payload) // 2
+    codes = struct.unpack(f"<{n}H", payload[:n * 2])
+    i = 0
+    while i < n:
+        c = codes[i]
+        if c >= 32:
+            j = i
+            while j < n and codes[j] >= 32:
+                j += 1
+            out.append(payload[i * 2:j * 2].decode("utf-16-le", "replace"))
+            i = j
+            continue
+        if c in _CONTROL_TEXT:
+            out.append(_CONTROL_TEXT[c])
+        i += 1 if c in _CHAR_CONTROLS else 8
+    return "".join(out).rstrip("\r")
+
+
+def count_hwp_sections(fp) -> int:
+    cf, _ = _open_hwp(fp)
+    return len(_section_paths(cf))
+
+
+def iter_hwp_paragraphs(fp, start: int = 0, stop: int | None = None):
+    """[start, stop) 섹션의 단락(표 셀 안 단락 포함) 텍스트를 문서 순서대로 생성"""
+    cf, compressed = _open_hwp(fp)
+    for path in _section_paths(cf)[start:stop]:
+        for tag, payload in _iter_records(cf.iter_stream(path), compressed):
+            if tag == _HWPTAG_PARA_TEXT:
+                yield _para_text(payload)
@@ -0,0 +1,77 @@
+# utils/json_stream.py
+# 스트리밍 JSON 점진 파서
+# - '{"키": [ {...}, {...} ]}' 형태 응답이 조각으로 도착할 때, 배열 원소 객체가 닫히는 즉시 dict로 꺼냄
+# - 문자열 안의 괄호/이스케이프를 구분하며, 한 번 훑은 글자는 다시 스캔하지 않음
+import json
+
+
+class JsonArrayItemStream:
+    """루트 객체의 key 배열 원소(객체)를 완성되는 대로 반환하는 점진 파서
+
+    parser = JsonArrayItemStream("키워드 기반 소재")
+    for chunk in stream:
+        for item in parser.feed(chunk):
+            ...
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self._buf = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._pending_key = None
+        self._array_depth = None   # 대상 배열 안쪽 깊이 (열리기 전 None, 닫힌 뒤 -1)
+        self._item_start = None
+
+    def feed(self, chunk: str) -> list:
+        """조각을 추가하고 이번에 완성된 원소 목록을 반환 (파싱 불가 원소는 건너뜀)"""
+        if not chunk:
+            return []
+        self._buf += chunk
+        items = []
+        buf = self._buf
+        for pos in range(self._pos, len(buf)):
+            ch = buf[pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._item_start is None:
+                        try:
+                            self._pending_key = json.loads(buf[self._string_start:pos + 1])
+                        except json.JSONDecodeError:
+                            self._pending_key = None
+                continue
+            if ch == '"':
+                self._in_string = True
+                self._string_start = pos
+            elif ch in "{[":
+                if ch == "{" and self._depth == self._array_depth:
+                    self._item_start = pos
+                if ch == "[" and self._depth == 1 and self._array_depth is None and self._pending_key == self.key:
+                    self._array_depth = 2
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if ch == "}" and self._depth == self._array_depth and self._item_start is not None:
+                    try:
+                        item = json.loads(buf[self._item_start:pos + 1])
+                        if isinstance(item, dict):
+                            items.append(item)
+                    except json.JSONDecodeError:
+                        pass
+                    self._item_start = None
+                elif ch == "]" and self._array_depth is not None and self._depth == self._array_depth - 1:
+                    self._array_depth = -1
+        self._pos = len(buf)
+        # 완성된 원소 앞부분은 더 필요 없으므로 버퍼를 줄여 둠 (키 문자열 위치는 이미 소비됨)
+        if self._item_start is None and not self._in_string:
+            self._buf = ""
+            self._pos = 0
+        return items
@@ -0,0 +1,57 @@
+# utils/length_control.py
+# 스트리밍 초안 분량 제어
+# - 도착한 글자 수가 목표를 넘으면 그 뒤 첫 자연스러운 경계(문단 끝, 다음 헤딩 앞)에서 생성을 멈춤
+# - 헤딩 줄 바로 뒤에서는 멈추지 않고, 글 끝부분(목표 분량 근처)에서 마무리 인사가 시작됐으면 끝까지 받음
+#   마무리 인사는 끝 멘트 + 브랜드가 한 줄에 함께 나온 경우만 인정 ("이상으로"만으로는 본문 문장일 수 있음)
+# - 멈춘 뒤의 출력 토큰은 받지 않으므로(스트림 종료) 긴 글일수록 토큰·시간 절약
+import re
+
+_BOUNDARY = re.compile(r"\n[ \t]*\n|\n(?=#)")
+_CLOSING_GAP = 40       # 끝 멘트와 브랜드 사이 최대 글자 수 ("이상으로 오늘 이야기는 BGN밝은눈안과…")
+
+
+def closing_pattern(outro_marker: str, outro_brand: str) -> str:
+    """마무리 인사 정규식: 끝 멘트 뒤 같은 줄 _CLOSING_GAP자 안에 브랜드"""
+    return f"{re.escape(outro_marker)}[^\n]{{0,{_CLOSING_GAP}}}?{re.escape(outro_brand)}"
+
+
+class LengthStop:
+    """조각을 받아 멈출 위치를 알려 주는 분량 제어기 (응답 하나에 하나씩 사용)
+
+    stop = LengthStop(2200, closing=closing_pattern("이상으로", "BGN밝은눈안과"))
+    for delta in stream:
+        cut = stop.feed(delta)
+        if cut is not None:
+            text = text[:cut]; break
+    """
+
+    def __init__(self, target_chars: int, closing: str | None = None, tail_chars: int = 200):
+        self.target_chars = target_chars
+        self.closing = re.compile(closing) if closing else None
+        self.tail_chars = tail_chars      # 목표 분량 앞 tail_chars자부터 나온 마무리 인사만 인정
+        self.reset()
+
+    def reset(self):
+        """새 응답을 받기 전 상태 초기화 (대체 모델로 다시 요청할 때 등)"""
+        self.text = ""
+        self.stopped_at = None
+        self._outro_seen = False
+
+    def feed(self, delta: str):
+        """조각 추가 → 멈출 위치(지금까지 받은 전체 텍스트 기준 글자 수) 또는 None"""
+        scan_from = max(self.target_chars, len(self.text) - 2)   # 조각 사이에 걸친 경계도 찾도록
+        # 마무리 인사는 한 줄 안에서만 매칭 → 조각 사이에 걸쳐도 찾도록 현재 줄 처음부터 다시 봄
+        closing_from = max(self.target_chars - self.tail_chars, self.text.rfind("\n") + 1)
+        self.text += delta
+        if self.stopped_at is not None:
+            return self.stopped_at
+        if self.closing and not self._outro_seen:
+            self._outro_seen = self.closing.search(self.text, closing_from) is not None
+        if self._outro_seen or len(self.text) <= self.target_chars:
+            return None
+        for m in _BOUNDARY.finditer(self.text, scan_from):
+            last_line = self.text[:m.start()].rstrip().rsplit("\n", 1)[-1]
+            if last_line.strip() and not last_line.lstrip().startswith("#"):
+                self.stopped_at = m.start()
+                return self.stopped_at
+        return None
@@ -0,0 +1,84 @@
+# utils/model_router.py
+# 단계별 모델 선택과 대체(fallback), 단계별 지연 시간·비용 집계
+# - config.MODEL_ROUTING["stages"]: 단계 → [기본 모델, 대체 모델, ...]
+# - 속도 제한(429)·타임아웃·연결 오류·서버 오류(5xx)면 다음 모델로 넘어갈 수 있는지 판단
+# - 호출마다 (단계, 모델)별 호출 수·대체 횟수·지연 시간·토큰·추정 비용을 누적
+#
+# NOTE: 분석 루프 스레드에서 호출되므로 streamlit을 import하지 않습니다.
+import threading
+
+import openai
+
+try:
+    from config import MODEL_ROUTING, OPENAI_CONFIG
+except Exception:
+    OPENAI_CONFIG = {"model": "gpt-4o-mini"}
+    MODEL_ROUTING = {
+        "stages": {},
+        "timeouts": {},
+        "prices": {"gpt-4o-mini": {"input": 0.15, "output": 0.60}},
+    }
+
+# APITimeoutError는 APIConnectionError의 하위 클래스
+FALLBACK_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+
+_STATS = {}
+_STATS_LOCK = threading.Lock()
+
+
+def stage_models(stage: str) -> list:
+    """단계의 모델 순서 (중복 제거, 설정이 없으면 OPENAI_CONFIG 모델 하나)"""
+    models = [m for m in MODEL_ROUTING.get("stages", {}).get(stage, []) if m]
+    return list(dict.fromkeys(models)) or [OPENAI_CONFIG["model"]]
+
+
+def primary_model(stage: str) -> str:
+    """토큰 예산 계산 등에 쓰는 단계의 기본 모델"""
+    return stage_models(stage)[0]
+
+
+def stage_timeout(stage: str):
+    return MODEL_ROUTING.get("timeouts", {}).get(stage)
+
+
+def should_fall_back(error: Exception) -> bool:
+    return isinstance(error, FALLBACK_ERRORS)
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0) -> float:
+    """USD 추정 비용 (가격표에 없는 모델은 0). cached_tokens는 prompt_tokens 중 prefix 캐시로 처리된 입력"""
+    price = MODEL_ROUTING.get("prices", {}).get(model)
+    if not price:
+        return 0.0
+    cached_price = price.get("cached_input", price["input"])
+    return ((prompt_tokens - cached_tokens) * price["input"] + cached_tokens * cached_price
+            + completion_tokens * price["output"]) / 1_000_000
+
+
+def record(stage: str, model: str, *, latency: float, prompt_tokens: int = 0, completion_tokens: int = 0,
+           cached_tokens: int = 0, fallback: bool = False, error: str | None = None):
+    """호출 1건 집계. fallback=True는 앞 모델이 실패해 이 모델로 넘어온 호출, error는 실패한 호출"""
+    with _STATS_LOCK:
+        s = _STATS.setdefault((stage, model), {
+            "calls": 0, "errors": 0, "fallbacks": 0, "latency_total": 0.0, "latency_max": 0.0,
+            "prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0,
+        })
+        s["calls"] += 1
+        s["latency_total"] += latency
+        s["latency_max"] = max(s["latency_max"], latency)
+        if error:
+            s["errors"] += 1
+            return
+        if fallback:
+            s["fallbacks"] += 1
+        s["prompt_tokens"] += prompt_tokens
+        s["cached_tokens"] += cached_tokens
+        s["completion_tokens"] += completion_tokens
+        s["cost_usd"] += estimate_cost(model, prompt_tokens, completion_tokens, cached_tokens)
+
+
+def routing_stats() -> list:
+    """(단계, 모델)별 집계 목록 — 평균 지연 시간 포함"""
+    with _STATS_LOCK:
+        return [{"stage": stage, "model": model, **s, "latency_avg": s["latency_total"] / s["calls"] if s["calls"] else 0.0}
+                for (stage, model), s in sorted(_STATS.items())]
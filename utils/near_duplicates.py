@@ -0,0 +1,230 @@
+# utils/near_duplicates.py
+# 유사(거의 같은) 소재 탐지: MinHash + LSH
+# - 제목+내용을 정규화(소문자, 공백·문장부호 제거)한 뒤 글자 n-gram을 shingle로 사용 (한글 형태소 분석 불필요)
+# - 서명은 프로세스와 무관하게 같은 값이 나오도록 crc32 + 고정 시드 해시족으로 계산 → 디스크에 저장 가능
+# - LSH 밴드 버킷으로 후보만 골라 서명 일치율(추정 자카드)로 확인 → 저장 소재 수와 무관하게 조회는 밴드 수만큼의 dict 조회
+# - 발행 이력은 SQLite에 서명만 저장하고, 최초 사용 시 메모리 인덱스로 적재
+#
+# NOTE: 분석 루프 스레드에서도 호출되므로 streamlit을 import하지 않습니다.
+import hashlib
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from array import array
+
+import numpy as np
+
+from utils.cache_store import cache_settings
+
+try:
+    from config import DEDUP_CONFIG
+except Exception:
+    DEDUP_CONFIG = {
+        "enabled": True,
+        "shingle_size": 3,
+        "num_perm": 64,
+        "bands": 16,
+        "threshold": 0.6,
+        "check_published": True,
+    }
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def material_text(item: dict) -> str:
+    return f"{item.get('title', '')} {item.get('content', '')}"
+
+
+def shingles(text: str, size: int = 3) -> set:
+    """정규화한 텍스트의 글자 n-gram 해시 집합 (n-gram보다 짧으면 전체를 하나로)"""
+    norm = _NON_WORD.sub("", (text or "").lower())
+    if len(norm) <= size:
+        return {zlib.crc32(norm.encode("utf-8"))} if norm else set()
+    return {zlib.crc32(norm[i:i + size].encode("utf-8")) for i in range(len(norm) - size + 1)}
+
+
+class MinHasher:
+    """고정 시드 (a·x + b) mod p 해시족으로 MinHash 서명 계산 (shingle × 해시 행렬을 numpy로 한 번에)
+
+    uint64 곱셈은 넘침(wrap-around)을 허용하고 하위 32비트만 사용 — 해시 품질에는 문제없고 결과는 플랫폼과 무관
+    """
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 3, seed: int = 1):
+        rnd = random.Random(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self._a = np.array([rnd.randrange(1, _PRIME) for _ in range(num_perm)], dtype=np.uint64)
+        self._b = np.array([rnd.randrange(0, _PRIME) for _ in range(num_perm)], dtype=np.uint64)
+
+    def signature(self, text: str) -> tuple:
+        hashes = shingles(text, self.shingle_size)
+        if not hashes:
+            return (_MAX_HASH,) * self.num_perm
+        hv = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))[:, None]
+        with np.errstate(over="ignore"):
+            mixed = ((hv * self._a + self._b) % np.uint64(_PRIME)) & np.uint64(_MAX_HASH)
+        return tuple(mixed.min(axis=0).tolist())
+
+
+def similarity(sig_a, sig_b) -> float:
+    """서명 일치율 = 자카드 유사도 추정값"""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a) if sig_a else 0.0
+
+
+class LSHIndex:
+    """밴드 LSH 인덱스. key → 서명, 밴드별 (밴드 번호, 값 묶음) → key 목록"""
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, threshold: float = 0.6):
+        if num_perm % bands:
+            raise ValueError("num_perm은 bands의 배수여야 합니다.")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self._signatures = {}
+        self._buckets = {}
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def _band_keys(self, sig):
+        r = self.rows
+        return [(b, sig[b * r:(b + 1) * r]) for b in range(self.bands)]
+
+    def add(self, key, sig):
+        if key in self._signatures:
+            return
+        self._signatures[key] = sig
+        for band in self._band_keys(sig):
+            self._buckets.setdefault(band, []).append(key)
+
+    def query(self, sig, threshold: float | None = None) -> list:
+        """[(key, 추정 유사도)] 유사도 내림차순"""
+        threshold = self.threshold if threshold is None else threshold
+        candidates = set()
+        for band in self._band_keys(sig):
+            candidates.update(self._buckets.get(band, ()))
+        out = [(key, similarity(sig, self._signatures[key])) for key in candidates]
+        return sorted((m for m in out if m[1] >= threshold), key=lambda m: -m[1])
+
+
+def _hasher() -> MinHasher:
+    return MinHasher(DEDUP_CONFIG.get("num_perm", 64), DEDUP_CONFIG.get("shingle_size", 3))
+
+
+class NearDuplicateFilter:
+    """한 번의 분석 동안 본 소재 인덱스. is_duplicate()는 처음 보는 소재면 등록하고 False"""
+
+    def __init__(self):
+        self.hasher = _hasher()
+        self.index = LSHIndex(self.hasher.num_perm, DEDUP_CONFIG.get("bands", 16), DEDUP_CONFIG.get("threshold", 0.6))
+        self._lock = threading.Lock()
+
+    def is_duplicate(self, item: dict) -> bool:
+        sig = self.hasher.signature(material_text(item))
+        with self._lock:
+            if self.index.query(sig):
+                return True
+            self.index.add(len(self.index), sig)
+            return False
+
+
+def collapse_near_duplicates(items: list) -> tuple:
+    """앞선 소재와 거의 같은 소재를 제거 → (남은 소재, 제거된 소재 수)"""
+    seen = NearDuplicateFilter()
+    kept = [it for it in items if not seen.is_duplicate(it)]
+    return kept, len(items) - len(kept)
+
+
+# ───────────────────────────── 발행 이력 ─────────────────────────────
+class PublishedIndex:
+    """발행한 소재의 서명 저장소 (SQLite) + 메모리 LSH 인덱스"""
+
+    def __init__(self, db_path: str | None):
+        self.hasher = _hasher()
+        self.index = LSHIndex(self.hasher.num_perm, DEDUP_CONFIG.get("bands", 16), DEDUP_CONFIG.get("threshold", 0.6))
+        self._meta = {}
+        self._lock = threading.Lock()
+        self._db = None
+        if db_path:
+            try:
+                os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+                self._db = sqlite3.connect(db_path, timeout=5, check_same_thread=False, isolation_level=None)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS materials ("
+                    " key TEXT PRIMARY KEY, title TEXT NOT NULL, signature BLOB NOT NULL,"
+                    " num_perm INTEGER NOT NULL, published_at REAL NOT NULL)"
+                )
+                self._load()
+            except (sqlite3.Error, OSError):
+                self._db = None
+
+    def _load(self):
+        rows = self._db.execute("SELECT key, title, signature, published_at FROM materials WHERE num_perm = ?",
+                                (self.hasher.num_perm,))
+        for key, title, blob, published_at in rows:
+            sig = array("Q")
+            sig.frombytes(blob)
+            self.index.add(key, tuple(sig))
+            self._meta[key] = {"title": title, "published_at": published_at}
+
+    def add(self, item: dict):
+        """발행한 소재 등록 (같은 제목+내용은 한 번만)"""
+        text = material_text(item)
+        key = hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+        sig = self.hasher.signature(text)
+        now = time.time()
+        with self._lock:
+            self.index.add(key, sig)
+            self._meta.setdefault(key, {"title": str(item.get("title", "")), "published_at": now})
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR IGNORE INTO materials (key, title, signature, num_perm, published_at) VALUES (?, ?, ?, ?, ?)",
+                        (key, str(item.get("title", "")), array("Q", sig).tobytes(), self.hasher.num_perm, now),
+                    )
+                except sqlite3.Error:
+                    pass
+
+    def find(self, item: dict, sig=None) -> list:
+        """발행 소재 중 거의 같은 것 [{"title", "similarity", "published_at"}]"""
+        sig = sig or self.hasher.signature(material_text(item))
+        with self._lock:
+            return [{**self._meta[key], "similarity": round(sim, 2)} for key, sim in self.index.query(sig)]
+
+    def __len__(self):
+        return len(self.index)
+
+
+_PUBLISHED = None
+_PUBLISHED_LOCK = threading.Lock()
+
+
+def get_published_index() -> PublishedIndex:
+    """발행 소재 인덱스 (프로세스 공용, 최초 호출 시 디스크에서 적재)"""
+    global _PUBLISHED
+    with _PUBLISHED_LOCK:
+        if _PUBLISHED is None:
+            cfg = cache_settings()
+            _PUBLISHED = PublishedIndex(os.path.join(cfg["dir"], "published_materials.sqlite3") if cfg["dir"] else None)
+        return _PUBLISHED
+
+
+def flag_published_overlap(items: list) -> int:
+    """발행 소재와 겹치는 소재에 published_overlap(가장 비슷한 발행 소재)을 붙이고 개수 반환"""
+    index = get_published_index()
+    if not len(index):
+        return 0
+    flagged = 0
+    for it in items:
+        matches = index.find(it)
+        if matches:
+            it["published_overlap"] = matches[0]
+            flagged += 1
+    return flagged
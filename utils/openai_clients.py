@@ -0,0 +1,203 @@
+# utils/openai_clients.py
+# 프로세스 공용 OpenAI 클라이언트 레지스트리
+# - API 키당 클라이언트 1개를 만들어 세션/재실행 간 공유 → keep-alive 연결 풀과 TLS 세션 재사용
+# - 연결 풀 크기·타임아웃은 OPENAI_CLIENT_CONFIG에서 설정
+# - warm_up(): 백그라운드에서 가벼운 요청으로 연결을 미리 열어 둠
+# - rotate_api_key(): 세션이 키를 바꿀 때 새 키 클라이언트를 준비하고, 기존 키를 쓰는 세션이 더는 없을 때만
+#   기존 클라이언트를 유예 시간 뒤 닫음(다른 세션·진행 중 요청 보호). 키별 사용 세션은 _KEY_OWNERS로 참조 카운트
+# - AsyncOpenAI 클라이언트는 이벤트 루프에 묶이므로 (루프, 키)마다 1개씩 보관
+import asyncio
+import hashlib
+import threading
+import weakref
+
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+
+from utils.async_runner import get_loop
+
+try:
+    from config import OPENAI_CONFIG, OPENAI_CLIENT_CONFIG
+except Exception:
+    OPENAI_CONFIG = {"api_key": ""}
+    OPENAI_CLIENT_CONFIG = {
+        "max_connections": 20,
+        "max_keepalive_connections": 10,
+        "keepalive_expiry": 60.0,
+        "connect_timeout": 10.0,
+        "read_timeout": 120.0,
+        "max_retries": 2,
+        "max_concurrent_requests": 4,
+        "warm_up": True,
+        "retire_grace_seconds": 300,
+    }
+
+_CLIENTS = {}        # 키 해시 → OpenAI
+_ASYNC_CLIENTS = weakref.WeakKeyDictionary()   # 이벤트 루프 → {키 해시 → AsyncOpenAI}
+_WARMED = set()      # 워밍업을 시작한 키 해시
+_KEY_OWNERS = {}     # 키 해시 → 그 키를 쓰는 세션 id 집합
+_LOCK = threading.Lock()
+
+
+def _key_id(api_key: str) -> str:
+    """레지스트리에는 키 원문 대신 해시를 보관"""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+
+def _http_options() -> dict:
+    cfg = OPENAI_CLIENT_CONFIG
+    return {
+        "limits": httpx.Limits(
+            max_connections=cfg.get("max_connections", 20),
+            max_keepalive_connections=cfg.get("max_keepalive_connections", 10),
+            keepalive_expiry=cfg.get("keepalive_expiry", 60.0),
+        ),
+        "timeout": httpx.Timeout(cfg.get("read_timeout", 120.0), connect=cfg.get("connect_timeout", 10.0)),
+    }
+
+
+def _build_client(api_key: str) -> OpenAI:
+    return OpenAI(api_key=api_key, http_client=DefaultHttpxClient(**_http_options()),
+                  max_retries=OPENAI_CLIENT_CONFIG.get("max_retries", 2))
+
+
+def _build_async_client(api_key: str) -> AsyncOpenAI:
+    return AsyncOpenAI(api_key=api_key, http_client=DefaultAsyncHttpxClient(**_http_options()),
+                       max_retries=OPENAI_CLIENT_CONFIG.get("max_retries", 2))
+
+
+def resolve_api_key(api_key: str | None = None) -> str:
+    """비어 있으면 설정의 기본 키. 둘 다 없으면 ValueError"""
+    api_key = api_key or OPENAI_CONFIG.get("api_key", "")
+    if not api_key:
+        raise ValueError("OpenAI API 키가 설정되지 않았습니다.")
+    return api_key
+
+
+def get_client(api_key: str | None = None) -> OpenAI:
+    """API 키에 해당하는 공용 클라이언트 (없으면 생성). 키가 없으면 설정의 기본 키 사용"""
+    api_key = resolve_api_key(api_key)
+    kid = _key_id(api_key)
+    with _LOCK:
+        client = _CLIENTS.get(kid)
+        if client is None:
+            client = _CLIENTS[kid] = _build_client(api_key)
+        return client
+
+
+def get_async_client(api_key: str | None = None) -> AsyncOpenAI:
+    """현재 이벤트 루프에서 쓸 공용 AsyncOpenAI (루프·키당 1개, 코루틴 안에서 호출)"""
+    api_key = resolve_api_key(api_key)
+    loop = asyncio.get_running_loop()
+    kid = _key_id(api_key)
+    with _LOCK:
+        clients = _ASYNC_CLIENTS.setdefault(loop, {})
+        client = clients.get(kid)
+        if client is None:
+            client = clients[kid] = _build_async_client(api_key)
+        return client
+
+
+def warm_up(api_key: str | None = None):
+    """키당 한 번, 백그라운드 스레드에서 연결을 미리 열어 둠 (실패는 무시)"""
+    if not OPENAI_CLIENT_CONFIG.get("warm_up", True):
+        return
+    try:
+        client = get_client(api_key)
+    except Exception:
+        return
+    kid = _key_id(client.api_key)
+    with _LOCK:
+        if kid in _WARMED:
+            return
+        _WARMED.add(kid)
+
+    def _ping():
+        try:
+            client.with_options(max_retries=0).models.list()
+        except Exception:
+            pass
+
+    async def _ping_async():
+        try:
+            await get_async_client(client.api_key).with_options(max_retries=0).models.list()
+        except Exception:
+            pass
+
+    threading.Thread(target=_ping, name="openai-warm-up", daemon=True).start()
+    # 분석/초안 생성은 공용 이벤트 루프의 AsyncOpenAI를 쓰므로 그쪽 연결도 미리 엶
+    asyncio.run_coroutine_threadsafe(_ping_async(), get_loop())
+
+
+def _close_later(client: OpenAI, async_clients: list):
+    def _close():
+        if client is not None:
+            client.close()
+        for loop, aclient in async_clients:
+            if not loop.is_closed():
+                asyncio.run_coroutine_threadsafe(aclient.close(), loop)
+
+    timer = threading.Timer(float(OPENAI_CLIENT_CONFIG.get("retire_grace_seconds", 300)), _close)
+    timer.daemon = True
+    timer.start()
+
+
+def _retire(kid: str):
+    with _LOCK:
+        client = _CLIENTS.pop(kid, None)
+        _WARMED.discard(kid)
+        async_clients = [(loop, clients.pop(kid)) for loop, clients in list(_ASYNC_CLIENTS.items()) if kid in clients]
+    if client is not None or async_clients:
+        _close_later(client, async_clients)
+
+
+def retire_client(api_key: str):
+    """레지스트리에서 제거. 이미 클라이언트를 받은 호출은 유예 시간 동안 그대로 완료됨"""
+    if not api_key:
+        return
+    _retire(_key_id(api_key))
+
+
+def acquire_key(api_key: str, owner: str) -> OpenAI:
+    """owner(세션)가 api_key를 쓰기 시작함 → 참조 등록 후 클라이언트 준비·워밍업"""
+    client = get_client(api_key)
+    with _LOCK:
+        _KEY_OWNERS.setdefault(_key_id(client.api_key), set()).add(owner)
+    warm_up(client.api_key)
+    return client
+
+
+def release_key(api_key: str | None, owner: str, is_live=None) -> list:
+    """owner가 api_key를 그만 씀. 사용하는 세션이 남지 않은 키의 클라이언트를 은퇴시키고 그 키 해시 목록 반환
+
+    is_live(owner)가 주어지면 모든 키에서 이미 끝난 세션의 참조도 정리 → 끝난 세션만 쓰던 키도 함께 은퇴
+    설정의 기본 키는 은퇴시키지 않음
+    """
+    released = _key_id(api_key) if api_key else None
+    default = _key_id(OPENAI_CONFIG["api_key"]) if OPENAI_CONFIG.get("api_key") else None
+    unused = []
+    with _LOCK:
+        for kid in list(_KEY_OWNERS):
+            if kid != released and is_live is None:
+                continue
+            owners = {o for o in _KEY_OWNERS[kid]
+                      if not (kid == released and o == owner) and (is_live is None or is_live(o))}
+            if owners:
+                _KEY_OWNERS[kid] = owners
+            else:
+                del _KEY_OWNERS[kid]
+                unused.append(kid)
+        if released and released not in unused and released not in _KEY_OWNERS:
+            unused.append(released)   # 참조 등록 없이 만들어진 클라이언트
+    unused = [kid for kid in unused if kid != default]
+    for kid in unused:
+        _retire(kid)
+    return unused
+
+
+def rotate_api_key(old_key: str | None, new_key: str, owner: str, is_live=None) -> OpenAI:
+    """세션의 키 변경: 새 키 클라이언트를 준비(워밍업)한 뒤 기존 키 참조를 놓음 (마지막 사용자일 때만 은퇴)"""
+    client = acquire_key(new_key, owner)
+    if old_key and old_key != new_key:
+        release_key(old_key, owner, is_live)
+    return client
@@ -0,0 +1,232 @@
+# utils/prompts.py
+# 프롬프트 템플릿 레지스트리
+# - 템플릿마다 고정 prefix(역할·규칙·출력 형식, system 메시지)와 가변 tail(화자·소재 등, user 메시지)을 분리
+#   → 같은 템플릿 호출은 앞부분이 글자 단위로 같아 제공자 측 프롬프트 prefix 캐시에 걸림
+# - tail은 여러 호출이 공유하는 값(화자, 목차, 소재)을 앞에, 호출마다 다른 값(이번 섹션 등)을 뒤에 둠
+# - 규칙·형식을 고치면 version을 올림 (캐시 적중 통계가 버전별로 나뉨)
+# - 모든 템플릿은 import 시 한 번 컴파일(필드 목록 추출·검증)
+# - 응답 usage의 cached_tokens를 템플릿별로 집계 → prefix_cache_stats()
+import string
+import threading
+
+
+class PromptTemplate:
+    def __init__(self, name: str, version: int, system: str, prefix: str, tail: str):
+        self.name = name
+        self.version = version
+        self.key = f"{name}@v{version}"
+        self.system = f"{system.strip()}\n\n{prefix.strip()}"
+        self.tail = tail.strip()
+        self.fields = {field for _, field, _, _ in string.Formatter().parse(self.tail) if field}
+        if any(not f.isidentifier() for f in self.fields):
+            raise ValueError(f"{self.key}: tail 필드는 이름만 쓸 수 있습니다 ({sorted(self.fields)})")
+
+    def messages(self, **values) -> list:
+        missing = self.fields - values.keys()
+        if missing:
+            raise KeyError(f"{self.key}: 값이 없는 필드 {sorted(missing)}")
+        return [
+            {"role": "system", "content": self.system},
+            {"role": "user", "content": self.tail.format_map(values)},
+        ]
+
+
+# ───────────────────────────── 템플릿 ─────────────────────────────
+_TEMPLATES = [
+    PromptTemplate(
+        "bgn_materials", 1,
+        system="BGN 콘텐츠 기획자. 반드시 JSON만 출력.",
+        prefix="""
+BGN밝은눈안과(잠실점) 직원 인터뷰 전문 일부가 주어집니다.
+이 텍스트를 기반으로 블로그로 확장 가능한 '소재'를 추출하세요.
+
+[출력 형식(JSON)]
+{
+  "키워드 기반 소재": [
+    {
+      "title": "BGN 직원 1인칭 관점의 구체적이고 따뜻한 제목",
+      "content": "인터뷰에서 실제 언급된 구체 내용(≥120자). 독자 이해를 돕는 공신력 있는 일반 의학 설명 보강 허용(과장/후기/효능단정 금지).",
+      "keywords": ["BGN","관련 키워드", "6~8개"],
+      "timestamp": "인터뷰 구간(있다면)",
+      "usage_point": "2000자 이상 블로그 전개 포인트",
+      "staff_perspective": "검안사/간호사/원무팀/의료진",
+      "target_audience": "예비 환자/기존 환자/일반인",
+      "direct_quote": "직접 인용(있다면)",
+      "source_quote": "인터뷰 본문에서 해당 소재를 뒷받침하는 문장(필수)",
+      "evidence_span": [시작_문자_인덱스, 끝_문자_인덱스],
+      "bgn_brand_fit": "따뜻함/전문성/신뢰 연결",
+      "emotion_tone": "감정 톤"
+    }
+  ]
+}
+
+[중요 지침]
+- 최소 6개 이상, 주제/관점이 서로 다른 소재.
+- 인터뷰 '내용' 중심 + 공신력 있는 일반 의학 설명 보강(새로운 환자/사례 창작 금지).
+- 각 아이템은 반드시 `source_quote`를 포함하고, 그 문장이 `content` 안에 그대로 들어가야 하며,
+  `evidence_span`이 content 내 인덱스와 일치해야 함.
+- 반드시 JSON만 출력.
+""",
+        tail="""
+[인터뷰 내용]
+{content}
+""",
+    ),
+    PromptTemplate(
+        "blog_outline", 2,
+        system="간결한 편집자. JSON만 출력.",
+        prefix="""
+주어진 소재로 블로그 아웃라인을 작성하세요.
+- 병원: BGN밝은눈안과(잠실점)
+- 화자: 아래 '화자' 항목의 인물 (1인칭)
+- 분위기: 따뜻함과 전문성, 과장/권유 금지
+
+요청: H2/H3 헤딩 구조의 JSON만 출력.
+필드: title, h2_sections[{"h2": str, "bullets": [str], "h3": [str], "target_chars": int|null}]
+- target_chars: 섹션별 목표 글자 수. 섹션 비중에 맞게 나누고 합이 '글 최소 분량' 이상이 되도록.
+  따로 정하기 어려운 섹션은 null (남은 분량을 균등 분배)
+""",
+        tail="""
+- 화자: {staff_role} {staff_name}
+- 글 최소 분량: {min_chars}자 이상
+- 스타일: {style}
+- 소재 제목: {title}
+- 핵심 내용: {content}
+- 활용 포인트: {usage_point}
+- 추가 요청: {additional_request}
+""",
+    ),
+    PromptTemplate(
+        "blog_draft", 1,
+        system="따뜻하고 담백한 의료 콘텐츠 작가.",
+        prefix="""
+주어진 JSON 아웃라인과 소재로 블로그 초안을 작성하세요.
+
+규칙:
+- 시작 멘트: "안녕하세요, BGN밝은눈안과(잠실점) [화자 직무] [화자 이름]입니다." (화자는 아래 '화자' 항목)
+- 1인칭 시점 유지, 과장/권유 금지, 자연스러운 구어체 허용
+- 목표 분량: 아래 '목표 분량' 항목
+- H2/H3 구조 유지
+- 인터뷰 실제 언급 내용을 중심 + 공신력 있는 일반 의학 배경설명만 보강(효능 단정/후기 금지)
+""",
+        tail="""
+화자: {staff_role} {staff_name}
+
+소재 요약:
+- 제목: {title}
+- 내용: {content}
+- 키워드: {keywords}
+
+아웃라인 JSON:
+{outline}
+
+목표 분량: 약 {target_chars}자
+""",
+    ),
+    PromptTemplate(
+        "blog_section", 1,
+        system="따뜻하고 담백한 의료 콘텐츠 작가.",
+        prefix="""
+블로그 글의 한 섹션만 작성하세요.
+
+공통 규칙(모든 섹션 동일):
+- 병원: BGN밝은눈안과(잠실점), 화자: 아래 '화자' 항목의 인물 (1인칭 유지)
+- 따뜻하고 담백한 구어체, 과장/권유 금지
+- 인터뷰 실제 언급 내용을 중심 + 공신력 있는 일반 의학 배경설명만 보강(효능 단정/후기 금지)
+- 출력: 이번 섹션의 "## 헤딩"으로 시작하는 마크다운만
+""",
+        # 글 전체가 공유하는 값 → 섹션마다 다른 값 순서 (같은 글의 섹션끼리 tail 앞부분도 공유)
+        tail="""
+화자: {staff_role} {staff_name}
+글 제목: {post_title}
+전체 목차:
+{toc}
+
+소재 요약:
+- 제목: {title}
+- 내용: {content}
+- 키워드: {keywords}
+
+이번 섹션: {number}. {h2}
+- 다룰 내용: {bullets}
+- H3 소제목: {h3}
+- 분량: 약 {chars}자
+- 위치: {position}
+- 헤딩: "## {h2}"
+""",
+    ),
+    PromptTemplate(
+        "section_transitions", 2,
+        system="세심한 카피에디터. JSON만 출력.",
+        prefix="""
+블로그 섹션 사이에 넣을 자연스러운 연결 문장을 경계마다 1문장씩 쓰세요.
+- 화자: 아래 '화자' 항목의 BGN밝은눈안과(잠실점) 직원 1인칭, 담백한 구어체
+- 새 정보 추가 금지, 40자 안팎
+- 출력: {"transitions": [경계 순서대로 연결 문장 문자열]} 형태의 JSON만
+""",
+        tail="""
+화자: {staff_role} {staff_name}
+
+{boundaries}
+
+경계 수: {count}
+""",
+    ),
+    PromptTemplate(
+        "gap_fill", 1,
+        system="세심한 카피에디터.",
+        prefix="""
+주어진 블로그 섹션에 이어서 넣을 새 문단만 작성하세요.
+- 병원: BGN밝은눈안과(잠실점), 화자: 아래 '화자' 항목의 인물 1인칭
+- 섹션 주제 안에서 구체성/경험담을 보강, 기존 문장 반복 금지
+- 금지: 과장된 치료효과 단정, 후기형 홍보, 과도한 이모티콘, 인사말, 헤딩
+- 출력: 새 문단 본문만
+""",
+        tail="""
+화자: {staff_role} {staff_name}
+
+섹션:
+{section}
+
+분량: 약 {chars}자 (1~2문단)
+""",
+    ),
+]
+
+TEMPLATES = {t.name: t for t in _TEMPLATES}
+_BY_SYSTEM = {t.system: t.key for t in _TEMPLATES}
+
+_STATS = {}
+_STATS_LOCK = threading.Lock()
+
+
+def get_template(name: str) -> PromptTemplate:
+    return TEMPLATES[name]
+
+
+def render(name: str, **values) -> list:
+    """템플릿 → chat 메시지 [system(고정 prefix), user(가변 tail)]"""
+    return TEMPLATES[name].messages(**values)
+
+
+def template_key(messages: list):
+    """메시지의 system prefix가 어느 템플릿인지 (레지스트리 밖 메시지면 None)"""
+    system = messages[0].get("content") if messages and messages[0].get("role") == "system" else None
+    return _BY_SYSTEM.get(system)
+
+
+def record_usage(key: str, prompt_tokens: int, cached_tokens: int):
+    with _STATS_LOCK:
+        s = _STATS.setdefault(key, {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0, "cache_hits": 0})
+        s["calls"] += 1
+        s["prompt_tokens"] += prompt_tokens
+        s["cached_tokens"] += cached_tokens
+        if cached_tokens:
+            s["cache_hits"] += 1
+
+
+def prefix_cache_stats() -> dict:
+    """템플릿(버전)별 호출 수, 캐시 적중 호출 수, 입력 토큰 중 캐시된 비율"""
+    with _STATS_LOCK:
+        return {key: {**s, "cached_ratio": s["cached_tokens"] / s["prompt_tokens"] if s["prompt_tokens"] else 0.0}
+                for key, s in sorted(_STATS.items())}
@@ -0,0 +1,138 @@
+# utils/schemas.py
+# LLM 구조화 출력(JSON Schema) 정의와 검증기
+# - 같은 스키마를 API response_format(json_schema, strict)과 로컬 검증에 함께 사용
+# - 검증기는 import 시 한 번만 컴파일
+# - 스키마별 파싱 실패율 집계 (첫 응답 실패 / 재시도 후 복구 / 최종 실패)
+import json
+import threading
+
+from jsonschema import Draft202012Validator
+
+_STRING = {"type": "string"}
+_STRINGS = {"type": "array", "items": _STRING}
+
+MATERIAL_ITEM_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": _STRING,
+        "content": _STRING,
+        "keywords": _STRINGS,
+        "timestamp": _STRING,
+        "usage_point": _STRING,
+        "staff_perspective": _STRING,
+        "target_audience": _STRING,
+        "direct_quote": _STRING,
+        "source_quote": _STRING,
+        "evidence_span": {"type": "array", "items": {"type": "integer"}},
+        "bgn_brand_fit": _STRING,
+        "emotion_tone": _STRING,
+    },
+    "additionalProperties": False,
+}
+MATERIAL_ITEM_SCHEMA["required"] = list(MATERIAL_ITEM_SCHEMA["properties"])
+
+MATERIALS_SCHEMA = {
+    "type": "object",
+    "properties": {"키워드 기반 소재": {"type": "array", "items": MATERIAL_ITEM_SCHEMA}},
+    "required": ["키워드 기반 소재"],
+    "additionalProperties": False,
+}
+
+OUTLINE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": _STRING,
+        "h2_sections": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                # target_chars: 섹션 목표 글자 수 (null이면 남은 분량을 균등 분배) — strict 모드라 required에 포함
+                "properties": {"h2": _STRING, "bullets": _STRINGS, "h3": _STRINGS,
+                               "target_chars": {"type": ["integer", "null"]}},
+                "required": ["h2", "bullets", "h3", "target_chars"],
+                "additionalProperties": False,
+            },
+        },
+    },
+    "required": ["title", "h2_sections"],
+    "additionalProperties": False,
+}
+
+# 섹션 경계별 연결 문장 (strict 모드는 최상위가 object여야 하므로 배열을 한 번 감쌈)
+TRANSITIONS_SCHEMA = {
+    "type": "object",
+    "properties": {"transitions": _STRINGS},
+    "required": ["transitions"],
+    "additionalProperties": False,
+}
+
+SCHEMAS = {"bgn_materials": MATERIALS_SCHEMA, "blog_outline": OUTLINE_SCHEMA, "section_transitions": TRANSITIONS_SCHEMA}
+_VALIDATORS = {}
+for _name, _schema in SCHEMAS.items():
+    Draft202012Validator.check_schema(_schema)
+    _VALIDATORS[_name] = Draft202012Validator(_schema)
+
+_STATS = {name: {"calls": 0, "first_try_failures": 0, "retry_recovered": 0, "failures": 0} for name in SCHEMAS}
+_STATS_LOCK = threading.Lock()
+
+
+class SchemaError(ValueError):
+    pass
+
+
+def response_format(name: str) -> dict:
+    """chat.completions의 response_format (strict json_schema)"""
+    return {"type": "json_schema", "json_schema": {"name": name, "schema": SCHEMAS[name], "strict": True}}
+
+
+def parse(name: str, text: str):
+    """JSON 파싱 + 스키마 검증. 실패 시 원인을 담은 SchemaError"""
+    text = (text or "").strip()
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        # 구조화 출력을 지원하지 않는 모델: 앞뒤 설명문을 걷어내고 한 번 더 시도
+        start, end = text.find("{"), text.rfind("}") + 1
+        try:
+            data = json.loads(text[start:end]) if 0 <= start < end else None
+        except json.JSONDecodeError as e:
+            raise SchemaError(f"JSON 파싱 실패: {e.msg} (위치 {e.pos})") from None
+        if data is None:
+            raise SchemaError("JSON 객체가 없습니다.") from None
+    error = next(iter(sorted(_VALIDATORS[name].iter_errors(data), key=lambda e: list(e.path))), None)
+    if error is not None:
+        path = "/".join(str(p) for p in error.path) or "(루트)"
+        raise SchemaError(f"스키마 불일치 [{path}]: {error.message}")
+    return data
+
+
+def is_valid(name: str, text: str) -> bool:
+    try:
+        parse(name, text)
+        return True
+    except SchemaError:
+        return False
+
+
+def record(name: str, *, first_try_ok: bool, recovered: bool = False):
+    with _STATS_LOCK:
+        s = _STATS[name]
+        s["calls"] += 1
+        if not first_try_ok:
+            s["first_try_failures"] += 1
+            if recovered:
+                s["retry_recovered"] += 1
+            else:
+                s["failures"] += 1
+
+
+def parse_failure_stats() -> dict:
+    """스키마별 호출 수와 첫 응답 실패율·최종 실패율"""
+    with _STATS_LOCK:
+        out = {}
+        for name, s in _STATS.items():
+            calls = s["calls"]
+            out[name] = {**s,
+                         "first_try_failure_rate": s["first_try_failures"] / calls if calls else 0.0,
+                         "failure_rate": s["failures"] / calls if calls else 0.0}
+        return out
@@ -34,6 +34,8 @@ def _ensure_session_defaults():
         st.session_state.blog_content = ""
     if "blog_title" not in st.session_state:
         st.session_state.blog_title = ""
+    if "blog_candidates" not in st.session_state:
+        st.session_state.blog_candidates = []
     if "selected_material" not in st.session_state:
         st.session_state.selected_material = None
     if "uploaded_files" not in st.session_state:
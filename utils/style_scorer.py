@@ -0,0 +1,130 @@
+# utils/style_scorer.py
+# BGN 톤앤매너 채점
+# - config.STYLE_CONFIG의 모든 표현(브랜드/시작·끝 멘트/종결어미/감정/공감)을 정규식 하나로 컴파일
+# - 본문을 한 번만 훑으며 표현별 첫·마지막 위치를 모아 점수와 상세 분석을 함께 계산
+# - 결과는 내용 해시로 메모이즈 → 내용이 그대로인 rerun에서는 해시 계산 비용만 듦
+# - rank(): 초안 후보 여러 개를 분량·스타일 점수로 정렬 (후보 모드)
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+try:
+    from config import STYLE_CONFIG
+except Exception:
+    STYLE_CONFIG = {
+        "brand": "BGN밝은눈안과(잠실점)",
+        "outro_brand": "BGN밝은눈안과",
+        "intro_marker": "입니다.",
+        "outro_marker": "이상으로",
+        "edge_chars": 200,
+        "endings": ["해요", "습니다", "죠", "거든요", "더라고요", "라고요", "네요"],
+        "emotions": [":)", "ㅠㅠ", "...", "웃음이 나왔", "울컥했"],
+        "empathy_words": ["괜찮", "이해", "마음", "공감", "함께"],
+        "memo_items": 256,
+    }
+
+
+class StyleScorer:
+    """표현 목록 → 단일 매처. score()/analyze()는 같은 한 번의 스캔 결과를 공유"""
+
+    def __init__(self, config: dict | None = None):
+        cfg = config or STYLE_CONFIG
+        self.cfg = cfg
+        self.endings = list(dict.fromkeys(cfg["endings"]))
+        self.emotions = list(dict.fromkeys(cfg["emotions"]))
+        self.empathy = list(dict.fromkeys(cfg["empathy_words"]))
+        self.markers = [cfg["brand"], cfg["outro_brand"], cfg["intro_marker"], cfg["outro_marker"]]
+        tokens = sorted(set(self.endings + self.emotions + self.empathy + self.markers), key=len, reverse=True)
+        # 전방탐색으로 모든 위치에서 매칭 → 겹치는 표현도 빠짐없이 ("더라고요" 안의 "라고요" 등)
+        # 같은 위치에서 시작하는 짧은 표현은 가장 긴 매칭의 접두사이므로 미리 펼쳐 둠
+        self._pattern = re.compile("(?=(" + "|".join(re.escape(t) for t in tokens) + "))")
+        self._prefixes = {t: [p for p in tokens if t.startswith(p)] for t in tokens}
+        self._memo = OrderedDict()
+        self._memo_items = cfg.get("memo_items", 256)
+        self._lock = threading.Lock()
+
+    def _scan(self, content: str) -> dict:
+        """표현별 (첫 시작 위치, 마지막 시작 위치)"""
+        seen = {}
+        prefixes = self._prefixes
+        for m in self._pattern.finditer(content):
+            pos = m.start()
+            for t in prefixes[m.group(1)]:
+                first = seen.get(t)
+                seen[t] = (first[0], pos) if first else (pos, pos)
+        return seen
+
+    def _features(self, content: str) -> dict:
+        cfg = self.cfg
+        seen = self._scan(content)
+        edge = cfg.get("edge_chars", 200)
+        intro = seen.get(cfg["intro_marker"])
+        outro_brand = seen.get(cfg["outro_brand"])
+        has_brand = cfg["brand"] in seen
+        ending_variety = sum(1 for e in self.endings if e in seen)
+        has_emotions = any(e in seen for e in self.emotions)
+
+        score = 0.5
+        if has_brand:
+            score += 0.2
+        if ending_variety >= 4:
+            score += 0.2
+        elif ending_variety >= 2:
+            score += 0.1
+        if has_emotions:
+            score += 0.1
+
+        return {
+            "score": min(score, 1.0),
+            "has_brand": has_brand,
+            # 원래 규칙과 같게: 앞 edge_chars 글자 안에 시작 멘트가 통째로, 끝 edge_chars 글자 안에 브랜드가 통째로
+            "has_proper_intro": has_brand and intro is not None and intro[0] + len(cfg["intro_marker"]) <= edge,
+            "has_proper_outro": cfg["outro_marker"] in seen and outro_brand is not None
+                                and outro_brand[1] >= len(content) - edge,
+            "ending_variety": ending_variety,
+            "has_emotions": has_emotions,
+            "has_empathy": any(w in seen for w in self.empathy),
+        }
+
+    def analyze(self, content: str) -> dict:
+        """채점 결과 (내용 해시 기준 메모이즈, 호출자가 수정해도 되도록 사본 반환)"""
+        content = content or ""
+        key = hashlib.sha256(content.encode("utf-8")).digest()
+        with self._lock:
+            hit = self._memo.get(key)
+            if hit is not None:
+                self._memo.move_to_end(key)
+                return dict(hit)
+        result = self._features(content)
+        with self._lock:
+            self._memo[key] = result
+            while len(self._memo) > self._memo_items:
+                self._memo.popitem(last=False)
+        return dict(result)
+
+    def score(self, content: str) -> float:
+        return self.analyze(content)["score"]
+
+    def rank(self, drafts: list, min_chars: int, target_chars: int) -> list:
+        """초안 후보 순위: 최소 분량 충족 → 스타일 점수 → 목표 분량과의 차이 순
+
+        [{"index": 원래 순서, "text", "chars", "score", "meets_length"}] 좋은 순
+        """
+        entries = [{"index": i, **self.candidate(text, min_chars)} for i, text in enumerate(drafts)]
+        return sorted(entries, key=lambda e: (not e["meets_length"], -e["score"], abs(e["chars"] - target_chars)))
+
+    def candidate(self, text: str, min_chars: int) -> dict:
+        chars = len(text or "")
+        return {"text": text, "chars": chars, "score": self.score(text), "meets_length": chars >= min_chars}
+
+
+_DEFAULT = None
+
+
+def get_style_scorer() -> StyleScorer:
+    """config 규칙으로 컴파일된 공용 채점기"""
+    global _DEFAULT
+    if _DEFAULT is None:
+        _DEFAULT = StyleScorer()
+    return _DEFAULT
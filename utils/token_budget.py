@@ -0,0 +1,113 @@
+# utils/token_budget.py
+# 토큰 기준 입력/출력 예산
+# - 모델별 토큰 수 계산: tiktoken(설치·인코딩 사용 가능 시) → 없으면 근사 계산(오프라인)
+# - 입력은 문장 경계에서 잘라 예산에 맞춤 (글자 수 절단 대신)
+# - max_tokens는 모델 컨텍스트 창에서 프롬프트를 뺀 나머지로 결정
+import re
+import threading
+
+try:
+    from config import TOKEN_CONFIG
+except Exception:
+    TOKEN_CONFIG = {
+        "use_tiktoken": True,
+        "models": {"gpt-4o-mini": {"context": 128000, "max_output": 16384}},
+        "default_model": {"context": 128000, "max_output": 4096},
+        "analysis_input_tokens": 12000,
+        "analysis_output_tokens": 4000,
+        "chunk_tokens": 9000,
+        "material_tokens": 5000,
+        "outline_output_tokens": 1200,
+        "safety_margin": 256,
+    }
+
+# 메시지 1개당 역할/구분자 오버헤드, 응답 프라이밍 토큰 (OpenAI chat 포맷 기준 근사)
+_PER_MESSAGE = 4
+_REPLY_PRIMING = 3
+
+_SENTENCE_END = re.compile(r"(?<=[.!?。…])\s+|(?<=[다요죠까])\.?\s+|\n+")
+
+_ENCODERS = {}
+_ENCODERS_LOCK = threading.Lock()
+
+
+def _encoder(model: str):
+    """모델별 tiktoken 인코더 (설치 안 됨/오프라인이면 None, 실패는 한 번만 시도)"""
+    if not TOKEN_CONFIG.get("use_tiktoken", True):
+        return None
+    with _ENCODERS_LOCK:
+        if model in _ENCODERS:
+            return _ENCODERS[model]
+        enc = None
+        try:
+            import tiktoken
+            try:
+                enc = tiktoken.encoding_for_model(model)
+            except KeyError:
+                enc = tiktoken.get_encoding("o200k_base")
+        except Exception:
+            enc = None
+        _ENCODERS[model] = enc
+        return enc
+
+
+def approximate_tokens(text: str) -> int:
+    """오프라인 근사: 한글 음절 ≈ 1토큰, 그 외 ≈ 4글자당 1토큰 (예산 계산에는 다소 보수적)"""
+    hangul = sum(1 for ch in text if "가" <= ch <= "힣")
+    return hangul + (len(text) - hangul + 3) // 4
+
+
+def count_tokens(text: str, model: str | None = None) -> int:
+    text = text or ""
+    enc = _encoder(model or "")
+    if enc is None:
+        return approximate_tokens(text)
+    return len(enc.encode(text, disallowed_special=()))
+
+
+def count_message_tokens(messages: list, model: str | None = None) -> int:
+    return sum(count_tokens(m.get("content") or "", model) + _PER_MESSAGE for m in messages) + _REPLY_PRIMING
+
+
+def model_limits(model: str | None) -> dict:
+    limits = TOKEN_CONFIG.get("models", {}).get(model or "")
+    return limits or TOKEN_CONFIG.get("default_model", {"context": 128000, "max_output": 4096})
+
+
+def trim_to_budget(text: str, max_tokens: int, model: str | None = None) -> str:
+    """max_tokens 안에 들어가도록 문장 경계에서 뒷부분을 잘라냄"""
+    text = text or ""
+    if count_tokens(text, model) <= max_tokens:
+        return text
+    out, used, last = [], 0, 0
+    for m in _SENTENCE_END.finditer(text):
+        piece = text[last:m.end()]
+        cost = count_tokens(piece, model)
+        if used + cost > max_tokens:
+            break
+        out.append(piece)
+        used += cost
+        last = m.end()
+    else:
+        piece = text[last:]
+        if used + count_tokens(piece, model) <= max_tokens:
+            out.append(piece)
+    if not out:
+        # 첫 문장부터 예산 초과 → 글자 단위로라도 채움
+        ratio = len(text) / max(1, count_tokens(text, model))
+        return text[:int(max_tokens * ratio)]
+    return "".join(out).rstrip()
+
+
+def chars_for_tokens(text: str, tokens: int, model: str | None = None) -> int:
+    """해당 텍스트의 글자/토큰 비율로 환산한 tokens 분량의 글자 수"""
+    total = count_tokens(text, model)
+    return max(1, int(tokens * len(text) / total)) if total else tokens
+
+
+def plan_max_tokens(model: str | None, messages: list, desired: int) -> int:
+    """컨텍스트 창 - 프롬프트 - 여유분 안에서 desired를 넘지 않는 max_tokens"""
+    limits = model_limits(model)
+    margin = TOKEN_CONFIG.get("safety_margin", 256)
+    remaining = limits["context"] - count_message_tokens(messages, model) - margin
+    return max(1, min(desired, limits["max_output"], remaining))
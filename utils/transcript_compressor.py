@@ -0,0 +1,152 @@
+# utils/transcript_compressor.py
+# 분석 전 인터뷰 전사본 정규화/압축
+# - 타임스탬프, 군더더기 말(음/어...), 반복 화자 라벨, 빈 줄, 중복 공백 등을 설정에 따라 제거
+# - 압축문 각 글자가 원문 몇 번째 글자에서 왔는지 오프셋 맵을 유지
+#   → 모델이 압축문에서 인용한 source_quote를 원문 구간으로 되돌릴 수 있음
+# - 파일별 절감 토큰 수를 보고
+import re
+
+from utils.token_budget import count_tokens
+
+try:
+    from config import COMPRESSION_CONFIG
+except Exception:
+    COMPRESSION_CONFIG = {
+        "enabled": True,
+        "steps": ["strip_timestamps", "normalize_speakers", "strip_fillers",
+                  "collapse_repeated_lines", "normalize_whitespace"],
+        "fillers": ["음", "으음", "어", "아", "에", "흠", "그니까", "뭐랄까", "뭐지"],
+    }
+
+# 타임스탬프: 대괄호 타임코드는 어디서나, 줄 머리 시:분:초는 바로 뒤에 화자 라벨이 올 때만
+# (본문 "10:30 예약은…"처럼 줄 머리에 온 실제 시각은 보존)
+_TIME = r"(?:(?:오전|오후|AM|PM)\s*)?\d{1,2}:\d{2}(?::\d{2})?(?:[.,]\d+)?"
+_TIMECODE = r"\d{1,2}:\d{2}:\d{2}(?:[.,]\d+)?"
+_SPEAKER = r"[^\s\d:：][^\n:：]{0,15}[:：]"     # "Q:", "인터뷰어:", "참석자 1:" 등
+_TIMESTAMP = re.compile(
+    rf"\[\s*{_TIME}(?:\s*(?:-->|~|-)\s*{_TIME})?\s*\][ \t]*"
+    rf"|(?m:^[ \t]*{_TIMECODE}(?:\s*(?:-->|~|-)\s*{_TIMECODE})?[ \t]+(?={_SPEAKER}))"
+)
+# 줄 머리 화자 라벨: "Q:", "질문 :", "인터뷰어:", "A1." 등 → "Q: " / "A: "로 통일
+_QUESTION_LABEL = re.compile(r"(?m)^[ \t]*(?:Q|질문|인터뷰어|진행자|기자)\s*\d*\s*[:：.)\]]\s*")
+_ANSWER_LABEL = re.compile(r"(?m)^[ \t]*(?:A|답변|답|응답자)\s*\d*\s*[:：.)\]]\s*")
+
+
+class CompressedTranscript:
+    """압축문 + 원문 오프셋 맵"""
+
+    def __init__(self, original: str, text: str, offsets: list):
+        self.original = original
+        self.text = text
+        self.offsets = offsets   # offsets[i] = text[i]의 원문 인덱스
+
+    def original_span(self, start: int, end: int) -> tuple:
+        """압축문 [start, end) → 원문 [s, e)"""
+        if not self.offsets or end <= start:
+            return (0, 0)
+        start = max(0, min(start, len(self.offsets) - 1))
+        end = max(start + 1, min(end, len(self.offsets)))
+        return (self.offsets[start], self.offsets[end - 1] + 1)
+
+    def locate(self, quote: str):
+        """인용문의 원문 구간. 압축문에서 먼저 찾고, 없으면 원문에서 직접 찾음"""
+        quote = (quote or "").strip()
+        if not quote:
+            return None
+        i = self.text.find(quote)
+        if i >= 0:
+            return self.original_span(i, i + len(quote))
+        i = self.original.find(quote)
+        if i >= 0:
+            return (i, i + len(quote))
+        return None
+
+    def stats(self) -> dict:
+        before, after = count_tokens(self.original), count_tokens(self.text)
+        return {
+            "chars_before": len(self.original),
+            "chars_after": len(self.text),
+            "tokens_before": before,
+            "tokens_after": after,
+            "tokens_saved": before - after,
+        }
+
+
+# ───────────────────────────── 오프셋 보존 치환 ─────────────────────────────
+def _sub(pattern, repl, text: str, offsets: list, count: int = 0):
+    """re.sub와 같되 offsets도 함께 갱신 (치환 문자열은 매치 시작 위치로 매핑)"""
+    out, out_offsets, last, n = [], [], 0, 0
+    for m in pattern.finditer(text):
+        r = repl(m) if callable(repl) else repl
+        out.append(text[last:m.start()])
+        out_offsets.extend(offsets[last:m.start()])
+        out.append(r)
+        anchor = offsets[m.start()] if m.start() < len(offsets) else (offsets[-1] + 1 if offsets else 0)
+        out_offsets.extend([anchor] * len(r))
+        last = m.end()
+        n += 1
+        if count and n >= count:
+            break
+    if not n:
+        return text, offsets
+    out.append(text[last:])
+    out_offsets.extend(offsets[last:])
+    return "".join(out), out_offsets
+
+
+# ───────────────────────────── 단계 ─────────────────────────────
+def _strip_timestamps(text, offsets, cfg):
+    return _sub(_TIMESTAMP, "", text, offsets)
+
+
+def _normalize_speakers(text, offsets, cfg):
+    text, offsets = _sub(_QUESTION_LABEL, "Q: ", text, offsets)
+    return _sub(_ANSWER_LABEL, "A: ", text, offsets)
+
+
+def _strip_fillers(text, offsets, cfg):
+    fillers = sorted(cfg.get("fillers", []), key=len, reverse=True)
+    if not fillers:
+        return text, offsets
+    alt = "|".join(re.escape(f) for f in fillers)
+    # 단독 어절로 쓰인 군더더기만 (뒤에 , . … ~ 가 붙어도 함께 제거)
+    pattern = re.compile(rf"(?<![\w])(?:{alt})(?:[,.…~]+|(?=\s))\s*")
+    return _sub(pattern, "", text, offsets)
+
+
+def _collapse_repeated_lines(text, offsets, cfg):
+    """연속으로 반복된 동일 줄(예: 같은 Q: 헤더) 제거"""
+    pattern = re.compile(r"(?m)^([^\n]+)\n(?:[ \t]*\n)*(?=\1$)")
+    return _sub(pattern, "", text, offsets)
+
+
+def _normalize_whitespace(text, offsets, cfg):
+    text, offsets = _sub(re.compile(r"[ \t 　]+"), " ", text, offsets)
+    text, offsets = _sub(re.compile(r" ?\n[ \n]*"), "\n", text, offsets)
+    # 앞뒤 공백 제거
+    lead = len(text) - len(text.lstrip())
+    trail = len(text.rstrip())
+    return text[lead:trail], offsets[lead:trail]
+
+
+STEPS = {
+    "strip_timestamps": _strip_timestamps,
+    "normalize_speakers": _normalize_speakers,
+    "strip_fillers": _strip_fillers,
+    "collapse_repeated_lines": _collapse_repeated_lines,
+    "normalize_whitespace": _normalize_whitespace,
+}
+
+
+def compress_transcript(text: str, steps=None, config: dict | None = None) -> CompressedTranscript:
+    """설정된 단계를 순서대로 적용해 CompressedTranscript 반환"""
+    cfg = config or COMPRESSION_CONFIG
+    steps = cfg.get("steps", []) if steps is None else steps
+    original = text or ""
+    out, offsets = original, list(range(len(original)))
+    for name in steps:
+        step = STEPS.get(name)
+        if step is None:
+            raise ValueError(f"알 수 없는 압축 단계입니다: {name}")
+        out, offsets = step(out, offsets, cfg)
+    return CompressedTranscript(original, out, offsets)
@@ -0,0 +1,113 @@
+# utils/upload_store.py
+# 업로드 파일 디스크 스풀링
+# - 업로드 바이트는 세션별 임시 폴더에 저장하고, 세션에는 가벼운 핸들(StoredUpload)만 보관
+# - 읽을 때는 mmap으로 필요한 구간만 매핑 (전체 바이트를 세션 메모리에 두지 않음)
+# - 세션 종료(세션 상태 해제) 또는 프로세스 종료 시 폴더 삭제, 비정상 종료 잔여물은 주기적으로 정리
+import mmap
+import os
+import shutil
+import tempfile
+import time
+import uuid
+import weakref
+
+_DEFAULTS = {
+    "upload_spool_dir": os.path.join(tempfile.gettempdir(), "bgn_uploads"),
+    "upload_stale_hours": 24,
+}
+
+
+def _settings() -> dict:
+    try:
+        from config import FILE_CONFIG
+    except Exception:
+        FILE_CONFIG = {}
+    return {k: FILE_CONFIG.get(k, v) for k, v in _DEFAULTS.items()}
+
+
+class StoredUpload:
+    """스풀된 업로드 파일 핸들 (UploadedFile처럼 name/size/type/read/seek 제공)"""
+
+    def __init__(self, path: str, name: str, size: int, type: str, file_id: str):
+        self.path = path
+        self.name = name
+        self.size = size
+        self.type = type
+        self.file_id = file_id
+        self._pos = 0
+
+    def read(self, n: int = -1) -> bytes:
+        start = self._pos
+        end = self.size if n is None or n < 0 else min(self.size, start + n)
+        if end <= start:
+            return b""
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            data = mm[start:end]
+        self._pos = end
+        return data
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        base = {0: 0, 1: self._pos, 2: self.size}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def getvalue(self) -> bytes:
+        self.seek(0)
+        data = self.read()
+        self.seek(0)
+        return data
+
+
+class UploadStore:
+    """세션 1개의 스풀 폴더. 세션 상태에서 해제되면 폴더도 함께 삭제됨"""
+
+    def __init__(self, root: str | None = None):
+        cfg = _settings()
+        root = root or cfg["upload_spool_dir"]
+        os.makedirs(root, exist_ok=True)
+        _sweep_stale(root, float(cfg["upload_stale_hours"]) * 3600)
+        self.dir = tempfile.mkdtemp(prefix="session_", dir=root)
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.dir, True)
+
+    def spool(self, uploaded_file, chunk_size: int = 1024 * 1024) -> StoredUpload:
+        """업로드 파일을 디스크로 복사하고 핸들 반환 (바이트는 청크 단위로만 메모리 경유)"""
+        file_id = uuid.uuid4().hex
+        path = os.path.join(self.dir, file_id)
+        if hasattr(uploaded_file, "seek"):
+            uploaded_file.seek(0)
+        size = 0
+        with open(path, "wb") as out:
+            while True:
+                chunk = uploaded_file.read(chunk_size)
+                if not chunk:
+                    break
+                out.write(chunk)
+                size += len(chunk)
+        return StoredUpload(path, uploaded_file.name, size, getattr(uploaded_file, "type", "unknown"), file_id)
+
+    def remove(self, handle: StoredUpload):
+        try:
+            os.remove(handle.path)
+        except OSError:
+            pass
+
+    def cleanup(self):
+        self._finalizer()
+
+
+def _sweep_stale(root: str, max_age: float):
+    """오래된 세션 폴더(비정상 종료 잔여물) 삭제"""
+    now = time.time()
+    try:
+        entries = list(os.scandir(root))
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if entry.is_dir() and entry.name.startswith("session_") and now - entry.stat().st_mtime > max_age:
+                shutil.rmtree(entry.path, ignore_errors=True)
+        except OSError:
+            pass